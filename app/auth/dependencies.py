@@ -1,8 +1,12 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel
 
+import time
+
+from app.auth.revocation import revocation_list
 from app.auth.security import decode_access_token
+from app.auth.token_cache import token_cache, token_digest
+from app.core.metrics import request_timings
 from app.enums.role import Role
 
 # =====================
@@ -13,34 +17,92 @@ security = HTTPBearer()
 # =====================
 # Auth Context
 # =====================
-class AuthContext(BaseModel):
-    user_id: str
-    role: Role
+class AuthContext:
+    """
+    Caller identity. Built once per token and shared through the token
+    cache by every request carrying it, so treat it as read-only.
+    """
+
+    __slots__ = ("user_id", "role", "jti", "issued_at", "expires_at")
+
+    def __init__(
+        self,
+        user_id: str,
+        role: Role,
+        jti: str | None = None,
+        issued_at: float | None = None,
+        expires_at: float | None = None
+    ):
+        self.user_id = user_id
+        self.role = role
+        self.jti = jti
+        self.issued_at = issued_at
+        self.expires_at = expires_at
+
+    def __repr__(self) -> str:
+        return f"AuthContext(user_id={self.user_id!r}, role={self.role.value!r})"
 
 # =====================
 # Generic Resolver
 # =====================
-def _resolve_user(token: str, expected_roles: list[Role]) -> AuthContext:
-    payload = decode_access_token(token)
+ALL_ROLES = frozenset(Role)
+
+
+def verify_token(token: str) -> AuthContext | None:
+    """
+    Token -> AuthContext, from the cache or by full HS256 verification.
+    None for invalid, expired and revoked tokens. Revocation is checked
+    on every call (in memory), cache hit or not.
+    """
+    digest = token_digest(token)
+    auth = token_cache.get(digest)
+
+    if auth is None:
+        payload = decode_access_token(token)
+        try:
+            auth = AuthContext(
+                user_id=payload["sub"],
+                role=Role(payload["role"]),
+                jti=payload.get("jti"),
+                issued_at=payload.get("iat"),
+                expires_at=payload.get("exp")
+            )
+        except (KeyError, ValueError):
+            return None
+
+        if auth.expires_at is not None:
+            token_cache.put(digest, auth, auth.expires_at)
+
+    if revocation_list.is_revoked(auth.jti, auth.user_id, auth.issued_at):
+        return None
+    return auth
+
 
-    if not payload:
+def _resolve_user(
+    token: str,
+    expected_roles: frozenset = ALL_ROLES,
+    forbidden_detail: str = "Access denied"
+) -> AuthContext:
+    started = time.perf_counter()
+    auth = verify_token(token)
+
+    timings = request_timings.get()
+    if timings is not None:
+        timings.auth_seconds += time.perf_counter() - started
+
+    if auth is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token"
         )
 
-    role = Role(payload["role"])
-
-    if role not in expected_roles:
+    if auth.role not in expected_roles:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
+            detail=forbidden_detail
         )
 
-    return AuthContext(
-        user_id=payload["sub"],
-        role=role
-    )
+    return auth
 
 # =====================
 # ANY AUTHENTICATED USER
@@ -48,38 +110,33 @@ def _resolve_user(token: str, expected_roles: list[Role]) -> AuthContext:
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> AuthContext:
-    return _resolve_user(
-        credentials.credentials,
-        expected_roles=[
-            Role.USER,
-            Role.ADMIN,
-            Role.BANK_MANAGER,
-            Role.LOAN_MANAGER
-        ]
-    )
+    return _resolve_user(credentials.credentials)
 
 # =====================
 # ROLE-SPECIFIC
 # =====================
-async def get_current_admin(
-    auth: AuthContext = Depends(get_current_user)
-) -> AuthContext:
-    if auth.role != Role.ADMIN:
-        raise HTTPException(403, "Admin access required")
-    return auth
+def require_roles(*roles: Role, detail: str = "Access denied"):
+    """
+    Dependency admitting only `roles`, checked in the same step that
+    resolves the token (no second dependency layered on
+    get_current_user).
+    """
+    allowed = frozenset(roles)
 
+    async def dependency(
+        credentials: HTTPAuthorizationCredentials = Depends(security)
+    ) -> AuthContext:
+        return _resolve_user(credentials.credentials, allowed, detail)
 
-async def get_current_bank_manager(
-    auth: AuthContext = Depends(get_current_user)
-) -> AuthContext:
-    if auth.role != Role.BANK_MANAGER:
-        raise HTTPException(403, "Bank Manager access required")
-    return auth
+    return dependency
 
 
-async def get_current_loan_manager(
-    auth: AuthContext = Depends(get_current_user)
-) -> AuthContext:
-    if auth.role != Role.LOAN_MANAGER:
-        raise HTTPException(403, "Loan Manager access required")
-    return auth
+get_current_admin = require_roles(Role.ADMIN, detail="Admin access required")
+get_current_bank_manager = require_roles(
+    Role.BANK_MANAGER,
+    detail="Bank Manager access required"
+)
+get_current_loan_manager = require_roles(
+    Role.LOAN_MANAGER,
+    detail="Loan Manager access required"
+)
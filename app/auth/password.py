@@ -1,12 +1,191 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import logging
+import threading
+import time
+
 from passlib.context import CryptContext
 
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+
+logger = logging.getLogger("password_hashing")
+
 pwd_context = CryptContext(
     schemes=["bcrypt"],
     deprecated="auto"
 )
 
+# bcrypt takes ~100-300 ms per call
+HASH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.5, 5.0)
+
+hash_pending = REGISTRY.gauge(
+    "password_hash_pending",
+    "Password hash/verify calls admitted and not finished (queued + running)"
+)
+hash_rejected = REGISTRY.counter(
+    "password_hash_rejected_total",
+    "Password hash/verify calls refused because the queue was full",
+    ("operation",)
+)
+hash_wait = REGISTRY.histogram(
+    "password_hash_queue_wait_seconds",
+    "Time a password hash/verify call waited for a free worker",
+    ("operation",),
+    HASH_BUCKETS
+)
+hash_duration = REGISTRY.histogram(
+    "password_hash_duration_seconds",
+    "bcrypt time of a password hash/verify call",
+    ("operation",),
+    HASH_BUCKETS
+)
+
+
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def _timed(func, *args):
+    # Runs in the worker (thread or process): report bcrypt time separately
+    # so queue wait = total - bcrypt time
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the password executor queue is full; retry later."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Too many concurrent password checks")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt off the event loop on a dedicated, size-limited pool.
+
+    At most `max_pending` calls are admitted (running + queued); beyond
+    that calls fail fast with PasswordHasherBusy instead of queueing for
+    seconds, so a login storm turns into 503s for the excess logins
+    while every other request keeps being served. A process pool
+    sidesteps the GIL for the hashing itself at the cost of pickling
+    each call; threads are fine as bcrypt releases the GIL.
+    """
+
+    def __init__(self, kind: str, workers: int, max_pending: int, retry_after: int):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown password executor: {kind}")
+
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> Executor:
+        # Created on first use: no idle threads / child processes in
+        # scripts and workers that never check a password
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix="bcrypt"
+                    )
+            return self._executor
+
+    def _admit(self, operation: str):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                admitted = False
+            else:
+                self._pending += 1
+                admitted = True
+
+        if not admitted:
+            hash_rejected.inc((operation,))
+            logger.warning(
+                "PASSWORD_HASHER_BUSY",
+                extra={"operation": operation, "max_pending": self.max_pending}
+            )
+            raise PasswordHasherBusy(self.retry_after)
+        hash_pending.inc()
+
+    def _release(self, future=None):
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+        hash_pending.dec()
+
+    async def run(self, operation: str, func, *args):
+        self._admit(operation)
+        try:
+            submitted = time.perf_counter()
+            future = self._get_executor().submit(_timed, func, *args)
+        except BaseException:
+            self._release()
+            raise
+        # The slot is held until the worker is done with the call, not
+        # until this caller stops waiting: a cancelled request (client
+        # gone, timeout) must not free it while bcrypt still runs
+        future.add_done_callback(self._release)
+
+        result, seconds = await asyncio.wrap_future(future)
+        total = time.perf_counter() - submitted
+
+        hash_duration.observe((operation,), seconds)
+        hash_wait.observe((operation,), max(0.0, total - seconds))
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self.run("hash", hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run("verify", verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "executor": self.kind,
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "queued": max(0, self._pending - self.workers),
+                "completed": self.completed,
+                "rejected": self.rejected
+            }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS
+)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
@@ -0,0 +1,182 @@
+"""
+Login throttling.
+
+Every login attempt is checked against two limits before the account
+lookup and the bcrypt verify run: one per client IP, then one per
+account identifier (phone, Aadhaar, manager id, admin username). Over
+either limit the attempt fails with 429 and a Retry-After. A successful
+login resets its account's count, so only failed attempts add up and
+an account owner's own logins never lock them out.
+
+Two stores implement the same `hit()` / `reset()` contract:
+
+* MemoryRateLimitStore: token buckets in this process (single replica,
+  or a per-replica limit)
+* MongoRateLimitStore: sliding-window counters in `login_attempts`,
+  shared by every replica
+
+Identifiers are HMAC'd with a server secret before they are used as
+keys, so no phone or Aadhaar number is kept in memory or written to the
+database, and the short, guessable ones cannot be recovered from a key
+by hashing every candidate.
+"""
+import asyncio
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import hashlib
+import hmac
+import logging
+import math
+import time
+
+from fastapi import Request
+
+from app.auth.security import SECRET_KEY
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.repositories.login_attempt_repository import LoginAttemptRepository
+
+logger = logging.getLogger("auth")
+
+login_rate_limited = REGISTRY.counter(
+    "auth_login_rate_limited_total",
+    "Login attempts refused by the rate limiter",
+    ("scope", "limit")
+)
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__("Too many login attempts")
+        self.retry_after = retry_after
+
+
+class MemoryRateLimitStore:
+    """
+    Token bucket per key: `limit` attempts of burst, refilled evenly over
+    `window_seconds`. At most `max_keys` buckets are kept (least recently
+    used dropped first).
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()    # key -> (tokens, updated_at)
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> int | None:
+        """Consume one attempt; seconds to wait if none is left, else None."""
+        now = time.monotonic()
+        rate = limit / window_seconds
+
+        tokens, updated_at = self._buckets.get(key, (limit, now))
+        tokens = min(limit, tokens + (now - updated_at) * rate)
+
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            return math.ceil((1 - tokens) / rate)
+
+        self._buckets[key] = (tokens - 1, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return None
+
+    async def reset(self, key: str, window_seconds: int):
+        self._buckets.pop(key, None)
+
+
+class MongoRateLimitStore:
+    """
+    Sliding-window estimate over two fixed windows: attempts in the
+    current window plus the previous window's count weighted by how much
+    of it still overlaps the sliding window.
+    """
+
+    def __init__(self, repo: LoginAttemptRepository | None = None):
+        self.repo = repo or LoginAttemptRepository()
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> int | None:
+        now = time.time()
+        window_start = int(now // window_seconds) * window_seconds
+        elapsed = now - window_start
+        expires_at = datetime.utcfromtimestamp(window_start) + timedelta(
+            seconds=2 * window_seconds
+        )
+
+        current, previous = await asyncio.gather(
+            self.repo.increment(key, window_start, expires_at),
+            self.repo.get_count(key, window_start - window_seconds)
+        )
+
+        overlap = 1 - elapsed / window_seconds
+        if previous * overlap + current <= limit:
+            return None
+
+        # Earliest point at which the estimate is back under the limit
+        if current > limit or previous == 0:
+            return max(1, math.ceil(window_seconds - elapsed))
+        wait = (1 - (limit - current) / previous) * window_seconds - elapsed
+        return max(1, math.ceil(wait))
+
+    async def reset(self, key: str, window_seconds: int):
+        """Forget the windows the sliding estimate reads."""
+        window_start = int(time.time() // window_seconds) * window_seconds
+        await self.repo.delete(key, [window_start, window_start - window_seconds])
+
+
+def client_ip(request: Request) -> str:
+    if settings.LOGIN_RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+class LoginRateLimiter:
+
+    def __init__(self, store):
+        self.store = store
+        # Shared by every replica so the mongo store sees the same keys
+        self._secret = (settings.LOGIN_RATE_LIMIT_SECRET or SECRET_KEY).encode()
+        self.window_seconds = settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS
+        self.account_limit = settings.LOGIN_RATE_LIMIT_PER_ACCOUNT
+        self.ip_limit = settings.LOGIN_RATE_LIMIT_PER_IP
+
+    async def check(self, scope: str, identifier: str, request: Request):
+        """
+        Count one attempt by `identifier` (within `scope`, e.g. "user")
+        from the request's client IP. Raises RateLimitExceeded when
+        either limit is used up.
+        """
+        ip = client_ip(request)
+        # IP first: a throttled client cannot spend an account's budget
+        checks = (
+            ("ip", self._key("ip", ip), self.ip_limit),
+            ("account", self._key(scope, identifier), self.account_limit),
+        )
+
+        for limit_name, key, limit in checks:
+            retry_after = await self.store.hit(key, limit, self.window_seconds)
+            if retry_after is not None:
+                login_rate_limited.inc((scope, limit_name))
+                logger.warning(
+                    "LOGIN_RATE_LIMITED",
+                    extra={"scope": scope, "limit": limit_name, "ip": ip}
+                )
+                raise RateLimitExceeded(retry_after)
+
+    async def login_succeeded(self, scope: str, identifier: str):
+        """Clear the account's count after a successful login."""
+        await self.store.reset(self._key(scope, identifier), self.window_seconds)
+
+    def _key(self, kind: str, value: str) -> str:
+        digest = hmac.new(self._secret, value.encode(), hashlib.sha256).hexdigest()
+        return f"{kind}:{digest[:32]}"
+
+
+def build_rate_limit_store(repo: LoginAttemptRepository | None = None):
+    if settings.LOGIN_RATE_LIMIT_STORE == "mongo":
+        return MongoRateLimitStore(repo)
+    if settings.LOGIN_RATE_LIMIT_STORE == "memory":
+        return MemoryRateLimitStore(settings.LOGIN_RATE_LIMIT_MAX_KEYS)
+    raise ValueError(f"Unknown rate limit store: {settings.LOGIN_RATE_LIMIT_STORE}")
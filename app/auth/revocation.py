@@ -0,0 +1,195 @@
+"""
+Access-token revocation, checked on every request without a database
+round-trip.
+
+Revocations live in `revoked_tokens` (see RevokedTokenRepository) and
+are mirrored in memory by every process:
+
+* revoked `jti`s behind a bloom filter: the common "not revoked" answer
+  is a few bit probes; a bloom hit is confirmed against the exact set,
+  so false positives never reject a valid token
+* per-subject `revoked_before` cut-offs in a dict
+
+Revocations made by this process apply immediately; those made by
+other processes arrive with the next incremental refresh
+(REVOCATION_REFRESH_SECONDS).
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+import hashlib
+import logging
+import math
+
+from pymongo.errors import PyMongoError
+
+from app.auth.security import ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+
+logger = logging.getLogger("auth")
+
+revoked_rejections = REGISTRY.counter(
+    "auth_revoked_token_rejections_total",
+    "Requests refused because their token was revoked",
+    ("kind",)
+)
+
+# Writers on other nodes stamp `revoked_at` with their own clock
+REFRESH_OVERLAP = timedelta(seconds=30)
+
+
+def _timestamp(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings (double hashing on BLAKE2b)."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.hashes):
+            yield (first + index * second) % self.size
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class RevocationList:
+
+    def __init__(self, repo: RevokedTokenRepository | None = None):
+        self.repo = repo or RevokedTokenRepository()
+        self.refresh_seconds = settings.REVOCATION_REFRESH_SECONDS
+
+        self._tokens = {}      # jti -> expires_at (timestamp)
+        self._subjects = {}    # subject -> (revoked_before, expires_at)
+        self._bloom = self._new_bloom()
+        self._watermark: datetime | None = None
+
+    @staticmethod
+    def _new_bloom() -> BloomFilter:
+        return BloomFilter(
+            settings.REVOCATION_BLOOM_CAPACITY,
+            settings.REVOCATION_BLOOM_ERROR_RATE
+        )
+
+    # ---------------- check ----------------
+    def is_revoked(self, jti: str | None, subject: str, issued_at: float | None) -> bool:
+        if jti is not None and jti in self._bloom and jti in self._tokens:
+            revoked_rejections.inc(("token",))
+            return True
+
+        entry = self._subjects.get(subject)
+        # Tokens without `iat` predate revocation support: treat as old
+        if entry is not None and (issued_at is None or issued_at < entry[0]):
+            revoked_rejections.inc(("subject",))
+            return True
+
+        return False
+
+    # ---------------- revoke ----------------
+    async def revoke_token(self, jti: str, subject: str, expires_at: datetime):
+        """Revoke one token until its own expiry (e.g. logout)."""
+        await self.repo.revoke_token(jti, subject, datetime.utcnow(), expires_at)
+        self._add_token(jti, _timestamp(expires_at))
+        logger.info("TOKEN_REVOKED", extra={"subject": subject, "jti": jti})
+
+    async def revoke_subject(self, subject: str):
+        """Revoke every token issued to `subject` so far."""
+        now = datetime.utcnow()
+        expires_at = now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        await self.repo.revoke_subject(subject, now, expires_at)
+        self._add_subject(subject, _timestamp(now), _timestamp(expires_at))
+        logger.info("SUBJECT_TOKENS_REVOKED", extra={"subject": subject})
+
+    def _add_token(self, jti: str, expires_at: float):
+        if jti not in self._tokens:
+            self._bloom.add(jti)
+        self._tokens[jti] = expires_at
+
+    def _add_subject(self, subject: str, revoked_before: float, expires_at: float):
+        # `iat` has whole seconds: a token minted later in the same second
+        # as the revocation must still pass, so cut off at that second
+        revoked_before = math.floor(revoked_before)
+        current = self._subjects.get(subject)
+        if current is None or current[0] < revoked_before:
+            self._subjects[subject] = (revoked_before, expires_at)
+
+    def _apply(self, doc: dict):
+        if doc["kind"] == "token":
+            self._add_token(doc["_id"], _timestamp(doc["expires_at"]))
+        else:
+            self._add_subject(
+                doc["subject"],
+                _timestamp(doc["revoked_before"]),
+                _timestamp(doc["expires_at"])
+            )
+
+    # ---------------- sync ----------------
+    async def refresh(self):
+        """Full load on first call, then only entries revoked since."""
+        now = datetime.utcnow()
+        if self._watermark is None:
+            docs = await self.repo.load_active(now)
+        else:
+            docs = await self.repo.changes_since(self._watermark - REFRESH_OVERLAP)
+
+        for doc in docs:
+            self._apply(doc)
+            if self._watermark is None or doc["revoked_at"] > self._watermark:
+                self._watermark = doc["revoked_at"]
+        if self._watermark is None:
+            self._watermark = now
+
+        self._prune(_timestamp(now))
+
+    def _prune(self, now: float):
+        expired = [jti for jti, expires_at in self._tokens.items() if expires_at <= now]
+        for jti in expired:
+            del self._tokens[jti]
+        # Bits cannot be cleared, so rebuild from the live set
+        if expired:
+            self._bloom = self._new_bloom()
+            for jti in self._tokens:
+                self._bloom.add(jti)
+
+        for subject in [
+            subject for subject, (_, expires_at) in self._subjects.items()
+            if expires_at <= now
+        ]:
+            del self._subjects[subject]
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                await self.refresh()
+            except PyMongoError as exc:
+                logger.warning("REVOCATION_REFRESH_FAILED", extra={"error": str(exc)})
+
+    def stats(self) -> dict:
+        return {
+            "revoked_tokens": len(self._tokens),
+            "revoked_subjects": len(self._subjects),
+            "bloom_bits": self._bloom.size,
+            "bloom_hashes": self._bloom.hashes,
+            "watermark": self._watermark
+        }
+
+
+revocation_list = RevocationList()
@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
 from typing import Optional
+import uuid
 
 SECRET_KEY = "CHANGE_THIS_IN_ENV"
 ALGORITHM = "HS256"
@@ -13,14 +14,18 @@ def create_access_token(
     role: str,
     expires_delta: Optional[timedelta] = None
 ) -> str:
-    expire = datetime.utcnow() + (
+    now = datetime.utcnow()
+    expire = now + (
         expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     )
 
     payload = {
         "sub": subject,
         "role": role,
-        "exp": expire
+        "exp": expire,
+        "iat": now,
+        # Unique per token, so one token can be revoked (app.auth.revocation)
+        "jti": uuid.uuid4().hex
     }
 
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
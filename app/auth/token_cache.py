@@ -0,0 +1,74 @@
+from collections import OrderedDict
+import hashlib
+import threading
+import time
+
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+
+token_cache_lookups = REGISTRY.counter(
+    "auth_token_cache_lookups_total",
+    "Verified-token cache lookups by result",
+    ("result",)
+)
+
+
+def token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+class TokenCache:
+    """
+    Bounded LRU of tokens that already passed signature verification.
+
+    Keyed by the SHA-256 of the token, so raw bearer tokens are never
+    kept in memory. An entry is only served until the token's own `exp`;
+    expired entries are dropped on lookup. Only successful verifications
+    are cached: a bad token always takes the full verify path.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: bytes):
+        if not self.capacity:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > time.time():
+                    self._entries.move_to_end(digest)
+                    token_cache_lookups.inc(("hit",))
+                    return value
+                del self._entries[digest]
+
+        token_cache_lookups.inc(("miss",))
+        return None
+
+    def put(self, digest: bytes, value, expires_at: float):
+        if not self.capacity:
+            return
+
+        with self._lock:
+            self._entries[digest] = (value, expires_at)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def discard(self, digest: bytes):
+        with self._lock:
+            self._entries.pop(digest, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = TokenCache(settings.AUTH_TOKEN_CACHE_SIZE)
@@ -1,9 +1,106 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     MONGO_URI: str = "mongodb://localhost:27017"
     MONGO_DB_NAME: str = "loan_management"
 
+    # Motor connection pool (None keeps the driver default). API and
+    # scheduler processes can run with different values via their env.
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 30000
+    # Comma-separated, in preference order, e.g. "zstd,snappy,zlib"
+    # (zstd needs `zstandard`, snappy needs `python-snappy`)
+    MONGO_COMPRESSORS: str = ""
+    MONGO_READ_PREFERENCE: str = "primary"
+    # "majority", a node count such as "1", or "" for the server default
+    MONGO_WRITE_CONCERN: str = ""
+    MONGO_WRITE_CONCERN_JOURNAL: Optional[bool] = None
+
+    # Stale-tolerant reads (dashboards, exports). Balance and decision
+    # paths always read the primary. Max staleness must be >= 90s.
+    MONGO_REPORTING_READ_PREFERENCE: str = "secondaryPreferred"
+    MONGO_REPORTING_MAX_STALENESS_SECONDS: int = 90
+
+    # EMI auto-debit scheduler
+    EMI_BATCH_SIZE: int = 500
+    EMI_PARTITIONS: int = 8
+    EMI_MAX_CONCURRENCY: int = 4
+    # Rows claimed (PROCESSING) by a run that has not settled them for
+    # this long are handed back to the next run
+    EMI_CLAIM_TIMEOUT_SECONDS: int = 900
+
+    # "single" runs the whole due set on every node; "sharded" makes nodes
+    # claim disjoint shards through leases in `emi_run_leases`.
+    EMI_RUN_MODE: str = "single"
+    EMI_SHARD_COUNT: int = 16
+    EMI_LEASE_SECONDS: int = 300
+    NODE_ID: str = ""
+
+    # Credit rule cache (used when no change stream is available)
+    CREDIT_RULE_CACHE_TTL_SECONDS: int = 300
+
+    # Per-deployment repository implementations for the DI container,
+    # e.g. {"user_repo": "app.extras.cached:CachedUserRepository"}
+    REPOSITORY_OVERRIDES: dict[str, str] = {}
+
+    # Bearer token Prometheus sends to scrape GET /metrics; without it
+    # only admins can read the endpoint. METRICS_PUBLIC opens it to
+    # anyone (only behind an internal network).
+    METRICS_SCRAPE_TOKEN: str = ""
+    METRICS_PUBLIC: bool = False
+
+    # Per-request profiling (admin header / armed toggle). Off by
+    # default: disabled means the middleware is not installed at all.
+    PROFILING_ENABLED: bool = False
+    PROFILE_BUFFER_SIZE: int = 20
+    PROFILE_REPORT_LINES: int = 60
+
+    # Verified bearer tokens kept in memory (LRU, honours `exp`); 0 disables
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+
+    # Token revocation: other processes' revocations are picked up
+    # within REFRESH_SECONDS; the bloom filter is sized for CAPACITY
+    # live revoked tokens at ERROR_RATE false positives
+    REVOCATION_REFRESH_SECONDS: int = 10
+    REVOCATION_BLOOM_CAPACITY: int = 100000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+
+    # Refresh tokens: a session ends after REFRESH_TOKEN_EXPIRE_DAYS
+    # without a refresh, and SESSION_MAX_AGE_DAYS after login regardless
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    SESSION_MAX_AGE_DAYS: int = 30
+    # A refresh racing another one with the same token (two tabs, a
+    # retried request) within this many seconds is not treated as reuse
+    REFRESH_REUSE_GRACE_SECONDS: int = 10
+
+    # Login throttling, per account identifier and per client IP, over a
+    # sliding window. "memory" limits per process; "mongo" shares the
+    # counters across replicas (login_attempts collection).
+    LOGIN_RATE_LIMIT_STORE: str = "memory"
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: int = 300
+    LOGIN_RATE_LIMIT_PER_ACCOUNT: int = 5
+    LOGIN_RATE_LIMIT_PER_IP: int = 50
+    LOGIN_RATE_LIMIT_MAX_KEYS: int = 100000
+    # Only behind a proxy that sets X-Forwarded-For itself
+    LOGIN_RATE_LIMIT_TRUST_FORWARDED: bool = False
+    # HMAC key for the hashed identifiers; empty = the JWT signing key
+    LOGIN_RATE_LIMIT_SECRET: str = ""
+
+    # bcrypt runs on its own pool ("thread" or "process"). Calls beyond
+    # MAX_PENDING (running + queued) get a 503 with Retry-After.
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 2
+
+    # Admin exports: documents per cursor batch / per streamed chunk
+    EXPORT_BATCH_SIZE: int = 1000
+
     class Config:
         env_file = ".env"
 
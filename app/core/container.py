@@ -0,0 +1,208 @@
+from importlib import import_module
+
+from fastapi import Depends, Request
+
+from app.auth.rate_limit import LoginRateLimiter, build_rate_limit_store
+from app.auth.revocation import revocation_list
+from app.core.config import settings
+from app.db.mongodb import db
+from app.repositories.account_repository import AccountRepository
+from app.repositories.admin_repository import AdminRepository
+from app.repositories.audit_log_repository import AuditLogRepository
+from app.repositories.emi_lease_repository import EmiLeaseRepository
+from app.repositories.loan_application_repository import LoanApplicationRepository
+from app.repositories.loan_repository import LoanRepository
+from app.repositories.login_attempt_repository import LoginAttemptRepository
+from app.repositories.manager_repository import ManagerRepository
+from app.repositories.repayment_repository import RepaymentRepository
+from app.repositories.rule_configuration_repository import RuleConfigurationRepository
+from app.repositories.session_repository import SessionRepository
+from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.user_repository import UserRepository
+from app.services.account_services import AccountService
+from app.services.admin_auth_service import AdminAuthService
+from app.services.admin_service import AdminService
+from app.services.bank_manager_service import BankManagerService
+from app.services.cibil_service import CIBILService
+from app.services.credit_rule_service import CreditRuleCache, CreditRuleService
+from app.services.export_service import ExportService
+from app.services.loan_application_service import LoanApplicationService
+from app.services.loan_manager_service import LoanManagerService
+from app.services.manager_auth_service import ManagerAuthService
+from app.services.repayment_summary_service import RepaymentSummaryService
+from app.services.session_service import SessionService
+from app.services.user_service import UserService
+
+# Attribute name -> default implementation
+REPOSITORIES = {
+    "account_repo": AccountRepository,
+    "admin_repo": AdminRepository,
+    "audit_repo": AuditLogRepository,
+    "emi_lease_repo": EmiLeaseRepository,
+    "loan_app_repo": LoanApplicationRepository,
+    "loan_repo": LoanRepository,
+    "login_attempt_repo": LoginAttemptRepository,
+    "manager_repo": ManagerRepository,
+    "repayment_repo": RepaymentRepository,
+    "rule_config_repo": RuleConfigurationRepository,
+    "session_repo": SessionRepository,
+    "transaction_repo": TransactionRepository,
+    "user_repo": UserRepository,
+}
+
+
+def _load_class(path: str):
+    """`package.module:ClassName` -> class"""
+    module_name, _, class_name = path.partition(":")
+    if not class_name:
+        raise ValueError(f"Expected 'module:Class', got {path!r}")
+    return getattr(import_module(module_name), class_name)
+
+
+class Container:
+    """
+    Builds every repository and service once per app and wires them
+    together, so all requests share the same instances.
+
+    A repository is replaced, in order of precedence, by an instance
+    passed as a keyword argument (tests, scripts) or by a class named in
+    `settings.REPOSITORY_OVERRIDES` (per deployment, e.g. a caching or
+    instrumented subclass); such classes are built as `cls(database)`.
+    """
+
+    def __init__(self, database=None, **repositories):
+        unknown = set(repositories) - set(REPOSITORIES)
+        if unknown:
+            raise ValueError(f"Unknown repositories: {', '.join(sorted(unknown))}")
+
+        self.database = database if database is not None else db
+
+        for name, default_class in REPOSITORIES.items():
+            if name in repositories:
+                repository = repositories[name]
+            elif name in settings.REPOSITORY_OVERRIDES:
+                repository = _load_class(settings.REPOSITORY_OVERRIDES[name])(self.database)
+            else:
+                repository = default_class(self.database)
+            setattr(self, name, repository)
+
+        # =====================
+        # Shared services
+        # =====================
+        self.cibil_service = CIBILService()
+        self.credit_rule_cache = CreditRuleCache(self.rule_config_repo)
+        self.credit_rule_service = CreditRuleService(self.credit_rule_cache)
+        self.repayment_summary_service = RepaymentSummaryService(
+            self.loan_repo,
+            self.repayment_repo,
+            self.transaction_repo
+        )
+        # Process-wide: the auth dependency checks this same instance
+        self.revocation_list = revocation_list
+
+        # =====================
+        # Auth
+        # =====================
+        self.login_rate_limiter = LoginRateLimiter(
+            build_rate_limit_store(self.login_attempt_repo)
+        )
+        self.session_service = SessionService(
+            self.session_repo,
+            self.revocation_list,
+            user_repo=self.user_repo,
+            manager_repo=self.manager_repo,
+            admin_repo=self.admin_repo
+        )
+        self.admin_auth_service = AdminAuthService(self.admin_repo, self.session_service)
+        self.manager_auth_service = ManagerAuthService(self.manager_repo, self.session_service)
+        self.user_service = UserService(self.user_repo, self.session_service)
+
+        # =====================
+        # Business
+        # =====================
+        self.account_service = AccountService(self.account_repo)
+        self.admin_service = AdminService(
+            manager_repo=self.manager_repo,
+            user_repo=self.user_repo,
+            loan_repo=self.loan_app_repo,
+            audit_repo=self.audit_repo,
+            sessions=self.session_service
+        )
+        self.bank_manager_service = BankManagerService(
+            user_repo=self.user_repo,
+            loan_repo=self.loan_app_repo,
+            audit_repo=self.audit_repo,
+            sessions=self.session_service
+        )
+        self.loan_application_service = LoanApplicationService(
+            repo=self.loan_app_repo,
+            user_repo=self.user_repo,
+            rule_service=self.credit_rule_service
+        )
+        self.loan_manager_service = LoanManagerService(
+            loan_app_repo=self.loan_app_repo,
+            loan_repo=self.loan_repo,
+            repayment_repo=self.repayment_repo,
+            audit_repo=self.audit_repo,
+            user_repo=self.user_repo,
+            cibil_service=self.cibil_service
+        )
+        self.export_service = ExportService(
+            loan_app_repo=self.loan_app_repo,
+            user_repo=self.user_repo,
+            transaction_repo=self.transaction_repo,
+            audit_repo=self.audit_repo
+        )
+
+
+# =====================
+# FastAPI dependencies
+# =====================
+def get_container(request: Request) -> Container:
+    return request.app.state.container
+
+
+def get_account_service(container: Container = Depends(get_container)) -> AccountService:
+    return container.account_service
+
+
+def get_admin_auth_service(container: Container = Depends(get_container)) -> AdminAuthService:
+    return container.admin_auth_service
+
+
+def get_admin_service(container: Container = Depends(get_container)) -> AdminService:
+    return container.admin_service
+
+
+def get_bank_manager_service(container: Container = Depends(get_container)) -> BankManagerService:
+    return container.bank_manager_service
+
+
+def get_export_service(container: Container = Depends(get_container)) -> ExportService:
+    return container.export_service
+
+
+def get_loan_application_service(
+    container: Container = Depends(get_container)
+) -> LoanApplicationService:
+    return container.loan_application_service
+
+
+def get_loan_manager_service(container: Container = Depends(get_container)) -> LoanManagerService:
+    return container.loan_manager_service
+
+
+def get_login_rate_limiter(container: Container = Depends(get_container)) -> LoginRateLimiter:
+    return container.login_rate_limiter
+
+
+def get_manager_auth_service(container: Container = Depends(get_container)) -> ManagerAuthService:
+    return container.manager_auth_service
+
+
+def get_session_service(container: Container = Depends(get_container)) -> SessionService:
+    return container.session_service
+
+
+def get_user_service(container: Container = Depends(get_container)) -> UserService:
+    return container.user_service
@@ -0,0 +1,78 @@
+import time
+
+from app.core.metrics import REGISTRY, RequestTimings, request_timings
+
+request_duration = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "End-to-end request latency by route template",
+    ("method", "route", "status")
+)
+request_mongo_duration = REGISTRY.histogram(
+    "http_request_mongo_seconds",
+    "Time spent in MongoDB commands per request",
+    ("method", "route")
+)
+request_auth_duration = REGISTRY.histogram(
+    "http_request_auth_seconds",
+    "Time spent resolving the bearer token per request",
+    ("method", "route")
+)
+request_app_duration = REGISTRY.histogram(
+    "http_request_app_seconds",
+    "Request time outside MongoDB and auth (handler code and serialization)",
+    ("method", "route")
+)
+request_mongo_commands = REGISTRY.counter(
+    "http_request_mongo_commands_total",
+    "MongoDB commands issued by requests",
+    ("method", "route")
+)
+
+
+class LatencyMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware buffering) that times
+    every HTTP request and splits it into Mongo, auth and the rest.
+
+    Requests are labelled by route template (`/loans/{loan_id}`), never
+    by raw path, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            request_timings.reset(token)
+
+            route = scope.get("route")
+            route_label = getattr(route, "path", None) or "unmatched"
+            labels = (scope["method"], route_label)
+
+            request_duration.observe((*labels, str(status)), elapsed)
+            request_mongo_duration.observe(labels, timings.mongo_seconds)
+            request_auth_duration.observe(labels, timings.auth_seconds)
+            request_app_duration.observe(
+                labels,
+                max(elapsed - timings.mongo_seconds - timings.auth_seconds, 0.0)
+            )
+            if timings.mongo_commands:
+                request_mongo_commands.inc(labels, timings.mongo_commands)
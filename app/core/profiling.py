@@ -0,0 +1,191 @@
+"""
+Opt-in cProfile capture of single requests.
+
+A request is profiled when either
+  * it carries `X-Profile: 1` together with an ADMIN bearer token, or
+  * an admin armed profiling for its path prefix
+    (POST /admin/profiles/arm), for the next `count` matching requests.
+
+Profiles land in a bounded ring buffer served by /admin/profiles.
+With nothing armed and no header the middleware only checks a flag
+and scans the request headers once.
+"""
+from collections import deque
+import cProfile
+from datetime import datetime
+import io
+import itertools
+import logging
+import marshal
+import pstats
+import threading
+import time
+
+from app.auth.dependencies import verify_token
+from app.core.config import settings
+from app.enums.role import Role
+
+logger = logging.getLogger("profiling")
+
+PROFILE_HEADER = b"x-profile"
+
+
+class ProfileStore:
+    def __init__(self, capacity: int):
+        self._profiles = deque(maxlen=capacity)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+        # Armed capture (admin toggle)
+        self.armed = False
+        self._armed_prefix = ""
+        self._armed_remaining = 0
+
+    # ---------------- toggle ----------------
+    def arm(self, path_prefix: str, count: int):
+        with self._lock:
+            self._armed_prefix = path_prefix
+            self._armed_remaining = count
+            self.armed = True
+
+    def disarm(self):
+        with self._lock:
+            self.armed = False
+            self._armed_prefix = ""
+            self._armed_remaining = 0
+
+    def take_armed(self, path: str) -> bool:
+        """Consume one armed capture if `path` matches."""
+        with self._lock:
+            if not self.armed or not path.startswith(self._armed_prefix):
+                return False
+            self._armed_remaining -= 1
+            if self._armed_remaining <= 0:
+                self.armed = False
+            return True
+
+    def armed_state(self) -> dict:
+        with self._lock:
+            return {
+                "armed": self.armed,
+                "path_prefix": self._armed_prefix if self.armed else None,
+                "remaining": self._armed_remaining if self.armed else 0
+            }
+
+    # ---------------- ring buffer ----------------
+    def add(self, profile: dict) -> int:
+        with self._lock:
+            profile["profile_id"] = next(self._ids)
+            self._profiles.append(profile)
+            return profile["profile_id"]
+
+    def list(self) -> list[dict]:
+        with self._lock:
+            return [
+                {key: value for key, value in profile.items() if key not in ("report", "stats")}
+                for profile in reversed(self._profiles)
+            ]
+
+    def get(self, profile_id: int) -> dict | None:
+        with self._lock:
+            for profile in self._profiles:
+                if profile["profile_id"] == profile_id:
+                    return profile
+        return None
+
+
+profile_store = ProfileStore(settings.PROFILE_BUFFER_SIZE)
+
+
+def _is_admin_request(headers: list) -> bool:
+    for name, value in headers:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return False
+            auth = verify_token(token)
+            return auth is not None and auth.role == Role.ADMIN
+    return False
+
+
+def _wants_profile(scope) -> bool:
+    headers = scope["headers"]
+    for name, value in headers:
+        if name == PROFILE_HEADER and value in (b"1", b"true"):
+            return _is_admin_request(headers)
+    return False
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware wrapping selected requests in cProfile.
+
+    cProfile hooks the event-loop thread, so anything else the loop runs
+    while the request is in flight shows up too; only one request is
+    profiled at a time to keep reports readable.
+    """
+
+    def __init__(self, app, store: ProfileStore = profile_store):
+        self.app = app
+        self.store = store
+        self._busy = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = _wants_profile(scope) or (
+            self.store.armed
+            and not self._busy.locked()
+            and self.store.take_armed(scope["path"])
+        )
+        if not profile or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        profiler = cProfile.Profile()
+        started_at = datetime.utcnow()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - started
+            self._busy.release()
+            self._store(scope, profiler, status, started_at, elapsed)
+
+    def _store(self, scope, profiler, status, started_at, elapsed):
+        report = io.StringIO()
+        stats = pstats.Stats(profiler, stream=report)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(settings.PROFILE_REPORT_LINES)
+
+        route = scope.get("route")
+        profile_id = self.store.add({
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": getattr(route, "path", None),
+            "status": status,
+            "started_at": started_at,
+            "duration_ms": round(elapsed * 1000, 3),
+            "report": report.getvalue(),
+            # Raw pstats data, loadable with pstats / snakeviz
+            "stats": marshal.dumps(stats.stats)
+        })
+        logger.info(
+            "REQUEST_PROFILED",
+            extra={
+                "profile_id": profile_id,
+                "path": scope["path"],
+                "duration_ms": round(elapsed * 1000, 3)
+            }
+        )
@@ -0,0 +1,94 @@
+import threading
+
+from pymongo import monitoring
+
+from app.core.metrics import REGISTRY, request_timings
+
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+command_duration = REGISTRY.histogram(
+    "mongo_command_duration_seconds",
+    "MongoDB command latency by collection and command",
+    ("collection", "command"),
+    QUERY_BUCKETS
+)
+command_documents = REGISTRY.counter(
+    "mongo_command_documents_total",
+    "Documents returned (reads) or affected (writes) by collection and command",
+    ("collection", "command")
+)
+command_failures = REGISTRY.counter(
+    "mongo_command_failures_total",
+    "Failed MongoDB commands by collection and command",
+    ("collection", "command")
+)
+
+# Commands whose first value is not the collection name
+_CURSOR_COMMANDS = {"getMore"}
+
+
+def _documents(command_name: str, reply: dict) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        batch = cursor.get("firstBatch", cursor.get("nextBatch"))
+        return len(batch) if batch is not None else 0
+    if command_name == "findAndModify":
+        return 1 if reply.get("value") is not None else 0
+    n = reply.get("n")
+    return n if isinstance(n, int) else 0
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """
+    Per-collection, per-command latency and document counts.
+
+    The collection is only on the started event, so it is remembered
+    until the matching succeeded/failed event. Time is also added to the
+    current request's RequestTimings, when there is one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    @staticmethod
+    def _key(event):
+        return (event.request_id, event.connection_id, event.operation_id)
+
+    def started(self, event):
+        command_name = event.command_name
+        if command_name in _CURSOR_COMMANDS:
+            collection = event.command.get("collection", "")
+        else:
+            collection = event.command.get(command_name, "")
+        if not isinstance(collection, str):
+            collection = ""
+
+        with self._lock:
+            self._pending[self._key(event)] = (collection, command_name)
+
+    def _finish(self, event) -> tuple[str, str]:
+        with self._lock:
+            labels = self._pending.pop(self._key(event), None)
+        labels = labels or ("", event.command_name)
+
+        seconds = event.duration_micros / 1_000_000
+        command_duration.observe(labels, seconds)
+
+        timings = request_timings.get()
+        if timings is not None:
+            timings.add_mongo(seconds)
+        return labels
+
+    def succeeded(self, event):
+        labels = self._finish(event)
+        documents = _documents(event.command_name, event.reply)
+        if documents:
+            command_documents.inc(labels, documents)
+
+    def failed(self, event):
+        labels = self._finish(event)
+        command_failures.inc(labels)
+
+
+command_metrics = CommandMetrics()
@@ -0,0 +1,155 @@
+"""
+Index registry.
+
+Every repository declares its `INDEXES` (pymongo IndexModels) and the
+`QUERY_SHAPES` it issues. Indexes are applied at startup; the same
+registry backs a small CLI:
+
+    python -m app.db.indexes apply    # create missing indexes
+    python -m app.db.indexes advise   # explain() every query shape
+
+`advise` exits non-zero when any shape is planned as a collection scan.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+
+from pymongo.errors import OperationFailure
+
+from app.repositories.account_repository import AccountRepository
+from app.repositories.admin_repository import AdminRepository
+from app.repositories.audit_log_repository import AuditLogRepository
+from app.repositories.emi_lease_repository import EmiLeaseRepository
+from app.repositories.loan_application_repository import LoanApplicationRepository
+from app.repositories.loan_repository import LoanRepository
+from app.repositories.login_attempt_repository import LoginAttemptRepository
+from app.repositories.manager_repository import ManagerRepository
+from app.repositories.repayment_repository import RepaymentRepository
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+from app.repositories.rule_configuration_repository import RuleConfigurationRepository
+from app.repositories.session_repository import SessionRepository
+from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.user_repository import UserRepository
+
+logger = logging.getLogger("mongodb")
+
+# Repositories that declare `INDEXES` and `QUERY_SHAPES`
+INDEXED_REPOSITORIES = [
+    AccountRepository,
+    AdminRepository,
+    AuditLogRepository,
+    EmiLeaseRepository,
+    LoanApplicationRepository,
+    LoanRepository,
+    LoginAttemptRepository,
+    ManagerRepository,
+    RepaymentRepository,
+    RevokedTokenRepository,
+    RuleConfigurationRepository,
+    SessionRepository,
+    TransactionRepository,
+    UserRepository,
+]
+
+
+async def ensure_indexes(database=None) -> dict:
+    """
+    Create every declared index (no-op for indexes that already exist).
+
+    A collection whose index cannot be built (e.g. existing duplicates
+    under a new unique index) is logged and skipped so the others, and
+    the app, still come up. Returns {collection: index names | error}.
+    """
+    results = {}
+    for repository_class in INDEXED_REPOSITORIES:
+        repository = repository_class(database)
+        name = repository.collection.name
+        try:
+            names = await repository.collection.create_indexes(repository_class.INDEXES)
+        except OperationFailure as exc:
+            logger.error(
+                "INDEX_CREATION_FAILED",
+                extra={"collection": name, "error": str(exc)}
+            )
+            results[name] = {"error": str(exc)}
+            continue
+
+        logger.info(
+            "INDEXES_ENSURED",
+            extra={"collection": name, "indexes": names}
+        )
+        results[name] = names
+    return results
+
+
+def _plan_stages(plan) -> list[str]:
+    """Every `stage` in a (possibly nested) winning plan."""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_plan_stages(item))
+    return stages
+
+
+async def advise_indexes(database=None) -> list[dict]:
+    """Explain every declared query shape and flag collection scans."""
+    findings = []
+    for repository_class in INDEXED_REPOSITORIES:
+        collection = repository_class(database).collection
+        for shape in repository_class.QUERY_SHAPES:
+            cursor = collection.find(shape.filter)
+            if shape.sort:
+                cursor = cursor.sort(shape.sort)
+
+            explain = await cursor.explain()
+            stages = _plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+            findings.append({
+                "collection": collection.name,
+                "query": shape.name,
+                "stages": stages,
+                "collection_scan": "COLLSCAN" in stages,
+                "in_memory_sort": "SORT" in stages
+            })
+    return findings
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.db.indexes")
+    parser.add_argument("command", choices=["apply", "advise"])
+    args = parser.parse_args(argv)
+
+    if args.command == "apply":
+        results = asyncio.run(ensure_indexes())
+        failed = 0
+        for collection, names in results.items():
+            if isinstance(names, dict):
+                failed += 1
+                print(f"{collection:<22} FAILED  {names['error']}")
+            else:
+                print(f"{collection:<22} {', '.join(names)}")
+        return 1 if failed else 0
+
+    findings = asyncio.run(advise_indexes())
+    scans = 0
+    for finding in findings:
+        flags = []
+        if finding["collection_scan"]:
+            flags.append("COLLSCAN")
+            scans += 1
+        if finding["in_memory_sort"]:
+            flags.append("IN-MEMORY SORT")
+        print(
+            f"{finding['collection']:<22} {finding['query']:<34} "
+            f"{' > '.join(finding['stages']):<40} {' '.join(flags) or 'ok'}"
+        )
+    return 1 if scans else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,117 @@
+import logging
+
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import OperationFailure
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred
+)
 from app.core.config import settings
+from app.db.command_metrics import command_metrics
+from app.db.pool_metrics import pool_metrics
+
+logger = logging.getLogger("mongodb")
+
+
+def client_options() -> dict:
+    """Driver options from Settings; unset values keep driver defaults."""
+    options = {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "readPreference": settings.MONGO_READ_PREFERENCE
+    }
+    if settings.MONGO_MAX_IDLE_TIME_MS is not None:
+        options["maxIdleTimeMS"] = settings.MONGO_MAX_IDLE_TIME_MS
+    if settings.MONGO_WAIT_QUEUE_TIMEOUT_MS is not None:
+        options["waitQueueTimeoutMS"] = settings.MONGO_WAIT_QUEUE_TIMEOUT_MS
+    if settings.MONGO_COMPRESSORS:
+        options["compressors"] = settings.MONGO_COMPRESSORS
+    if settings.MONGO_WRITE_CONCERN:
+        w = settings.MONGO_WRITE_CONCERN
+        options["w"] = int(w) if w.isdigit() else w
+    if settings.MONGO_WRITE_CONCERN_JOURNAL is not None:
+        options["journal"] = settings.MONGO_WRITE_CONCERN_JOURNAL
+    return options
+
 
-client = AsyncIOMotorClient(settings.MONGO_URI)
+# Repositories bind their collections at import time, so the client
+# object exists from the start; `connect=False` defers all I/O (and the
+# monitor threads) until `connect()` runs in the app lifespan.
+client = AsyncIOMotorClient(
+    settings.MONGO_URI,
+    connect=False,
+    event_listeners=[pool_metrics, command_metrics],
+    **client_options()
+)
 db = client[settings.MONGO_DB_NAME]
+
+_READ_PREFERENCES = {
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest
+}
+
+
+def reporting_read_preference():
+    mode = settings.MONGO_REPORTING_READ_PREFERENCE
+    if mode == "primary":
+        return Primary()
+    if mode not in _READ_PREFERENCES:
+        raise ValueError(f"Unknown read preference: {mode}")
+    return _READ_PREFERENCES[mode](
+        max_staleness=settings.MONGO_REPORTING_MAX_STALENESS_SECONDS
+    )
+
+
+def reporting_collection(collection):
+    """
+    Same pool, different routing: reads that can tolerate replication
+    lag (dashboards, reports, exports) go to secondaries when there are
+    any.
+    """
+    return collection.with_options(read_preference=reporting_read_preference())
+
+
+async def connect():
+    """Open the pool and fail fast if the server is unreachable."""
+    await client.admin.command("ping")
+    logger.info(
+        "MONGO_CONNECTED",
+        extra={
+            "max_pool_size": settings.MONGO_MAX_POOL_SIZE,
+            "min_pool_size": settings.MONGO_MIN_POOL_SIZE,
+            "compressors": settings.MONGO_COMPRESSORS or None,
+            "read_preference": settings.MONGO_READ_PREFERENCE
+        }
+    )
+
+
+def close():
+    client.close()
+    logger.info("MONGO_CLOSED")
+
+
+# Server error code for "transactions need a replica set or mongos"
+_ILLEGAL_OPERATION = 20
+
+
+async def run_in_transaction(callback):
+    """
+    Run `await callback(session)` inside a multi-document transaction
+    (retried on transient errors by the driver). On a standalone mongod,
+    which cannot run transactions, the callback runs once with
+    `session=None`; callers must then clean up after failures themselves.
+    """
+    async with await client.start_session() as session:
+        try:
+            return await session.with_transaction(callback)
+        except OperationFailure as exc:
+            if exc.code != _ILLEGAL_OPERATION:
+                raise
+
+    return await callback(None)
@@ -0,0 +1,113 @@
+import threading
+import time
+
+from pymongo import monitoring
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """
+    Connection pool counters fed by pymongo's CMAP events.
+
+    Check-out wait is the time between a check-out starting and a
+    connection being handed over; pymongo raises both events on the
+    thread running the operation, so the start time is kept per thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pools = {}
+
+    def _pool(self, address) -> dict:
+        key = "%s:%s" % address
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = {
+                "open_connections": 0,
+                "checked_out": 0,
+                "max_checked_out": 0,
+                "checkouts": 0,
+                "checkout_failures": {},
+                "wait_seconds_total": 0.0,
+                "wait_seconds_max": 0.0,
+                "pool_cleared": 0
+            }
+        return pool
+
+    # ---------------- pool ----------------
+    def pool_created(self, event):
+        with self._lock:
+            self._pool(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._pool(event.address)["pool_cleared"] += 1
+
+    def pool_closed(self, event):
+        pass
+
+    # ---------------- connections ----------------
+    def connection_created(self, event):
+        with self._lock:
+            self._pool(event.address)["open_connections"] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self._pool(event.address)["open_connections"] -= 1
+
+    # ---------------- check-out / check-in ----------------
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        waited = self._waited()
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["checkouts"] += 1
+            pool["checked_out"] += 1
+            pool["max_checked_out"] = max(pool["max_checked_out"], pool["checked_out"])
+            pool["wait_seconds_total"] += waited
+            pool["wait_seconds_max"] = max(pool["wait_seconds_max"], waited)
+
+    def connection_check_out_failed(self, event):
+        waited = self._waited()
+        with self._lock:
+            pool = self._pool(event.address)
+            failures = pool["checkout_failures"]
+            failures[event.reason] = failures.get(event.reason, 0) + 1
+            pool["wait_seconds_total"] += waited
+            pool["wait_seconds_max"] = max(pool["wait_seconds_max"], waited)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self._pool(event.address)["checked_out"] -= 1
+
+    def _waited(self) -> float:
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        return time.perf_counter() - started if started is not None else 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            pools = {}
+            for address, pool in self._pools.items():
+                checkouts = pool["checkouts"]
+                pools[address] = {
+                    **pool,
+                    "checkout_failures": dict(pool["checkout_failures"]),
+                    "wait_seconds_total": round(pool["wait_seconds_total"], 6),
+                    "wait_seconds_max": round(pool["wait_seconds_max"], 6),
+                    "wait_ms_avg": round(
+                        pool["wait_seconds_total"] * 1000 / checkouts, 3
+                    ) if checkouts else 0.0
+                }
+        return pools
+
+
+pool_metrics = PoolMetrics()
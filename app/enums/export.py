@@ -0,0 +1,11 @@
+from enum import Enum
+
+class ExportDataset(str, Enum):
+    LOAN_APPLICATIONS = "loan_applications"
+    USERS = "users"
+    TRANSACTIONS = "transactions"
+    AUDIT_LOGS = "audit_logs"
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
@@ -1,7 +1,12 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
 from app.routers.auth_admin import router as auth_admin_router
 from app.routers.auth_manager import router as auth_manager_router
+from app.routers.auth_session import router as auth_session_router
 from app.routers.auth_user import router as auth_user_router
 
 from app.routers.admin import router as admin_router
@@ -9,8 +14,67 @@ from app.routers.bank_manager import router as bank_manager_router
 from app.routers.loan_manager import router as loan_manager_router
 from app.routers.user import router as user_router
 from app.routers.loan_application import router as loan_router
+from app.routers.metrics import router as metrics_router
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from app.scheduler import emi_scheduler, emi_sharding, repayment_reconciler
 from app.scheduler.emi_scheduler import process_due_emis
+from app.scheduler.emi_sharding import run_sharded_emis
+from app.scheduler.repayment_reconciler import reconcile_repayment_counters
+from app.auth.password import PasswordHasherBusy, password_hasher
+from app.auth.rate_limit import RateLimitExceeded
+from app.core.config import settings
+from app.core.container import Container
+from app.core.middleware import LatencyMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.db.indexes import ensure_indexes
+from app.db import mongodb
+
+scheduler = AsyncIOScheduler()
+scheduler.add_job(
+    run_sharded_emis if settings.EMI_RUN_MODE == "sharded" else process_due_emis,
+    "cron",
+    hour=2
+)
+scheduler.add_job(reconcile_repayment_counters, "cron", hour=4)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # =========================
+    # STARTUP
+    # =========================
+    container = app.state.container
+
+    await mongodb.connect()
+    await ensure_indexes(container.database)
+    await container.revocation_list.refresh()
+    app.state.credit_rule_watcher = asyncio.create_task(
+        container.credit_rule_cache.watch()
+    )
+    app.state.revocation_refresher = asyncio.create_task(
+        container.revocation_list.run()
+    )
+    # Scheduled jobs use the same repositories as the routes
+    for job_module in (emi_scheduler, emi_sharding, repayment_reconciler):
+        job_module.bind(container)
+    scheduler.start()
+
+    yield
+
+    # =========================
+    # SHUTDOWN
+    # =========================
+    scheduler.shutdown(wait=False)
+    app.state.credit_rule_watcher.cancel()
+    app.state.revocation_refresher.cancel()
+    await asyncio.gather(
+        app.state.credit_rule_watcher,
+        app.state.revocation_refresher,
+        return_exceptions=True
+    )
+    password_hasher.shutdown()
+    mongodb.close()
+
 
 app = FastAPI(
     title="Loan Management System",
@@ -38,16 +102,45 @@ Each login endpoint returns a **JWT access token** containing the user role.
 ### Role Enforcement
 Access to APIs is enforced using the **role claim inside the JWT**, not by the login endpoint.
 """,
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
-scheduler = AsyncIOScheduler()
-scheduler.add_job(process_due_emis, "cron", hour=2)
-scheduler.start()
+
+# Repositories and services, built once and injected via Depends
+app.state.container = Container()
+
+# Per-route latency split into Mongo / auth / app time, see GET /metrics
+app.add_middleware(LatencyMiddleware)
+
+# Opt-in cProfile capture of single requests, see /admin/profiles
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+
+# Login / registration storms: shed load instead of queueing bcrypt work
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication is busy, please retry shortly"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+@app.exception_handler(RateLimitExceeded)
+async def login_rate_limited(request: Request, exc: RateLimitExceeded):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many login attempts, please retry later"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 # =========================
 # AUTH ROUTERS
 # =========================
 app.include_router(auth_admin_router)
 app.include_router(auth_manager_router)
+app.include_router(auth_session_router)
 app.include_router(auth_user_router)
 
 # =========================
@@ -58,3 +151,4 @@ app.include_router(bank_manager_router)
 app.include_router(loan_manager_router)
 app.include_router(user_router)
 app.include_router(loan_router)
+app.include_router(metrics_router)
@@ -1,8 +1,23 @@
+from datetime import datetime
+from bson import ObjectId
+from pymongo import IndexModel, ReturnDocument
 from app.db.mongodb import db
+from app.repositories.query_shape import QueryShape
 
 class AccountRepository:
-    def __init__(self):
-        self.collection = db.accounts
+    # One account per user; deposits upsert on user_id
+    INDEXES = [
+        IndexModel([("user_id", 1)], unique=True),
+    ]
+
+    QUERY_SHAPES = [
+        QueryShape("get_by_user", {"user_id": ObjectId()}),
+        QueryShape("debit_if_sufficient", {"user_id": ObjectId(), "balance": {"$gte": 1.0}}),
+    ]
+
+    def __init__(self, database=None):
+        database = database if database is not None else db
+        self.collection = database.accounts
 
     async def get_by_user(self, user_id):
         return await self.collection.find_one({"user_id": user_id})
@@ -12,3 +27,52 @@ class AccountRepository:
             {"user_id": user_id},
             {"$inc": {"balance": amount}}
         )
+
+    # Debit references remembered per account (see debit_if_sufficient)
+    RECENT_DEBITS_KEPT = 50
+
+    async def debit_if_sufficient(
+        self,
+        user_id,
+        amount: float,
+        reference=None
+    ) -> float | None:
+        """
+        Atomically debit `amount` if the balance covers it.
+        Returns the post-debit balance, or None when the account is
+        missing or short of funds (nothing is written in that case).
+
+        With a `reference` (e.g. the repayment row id) the debit is
+        applied at most once: the reference is recorded on the account
+        in the same update, and a retry finds it there and returns the
+        current balance without debiting again.
+        """
+        query = {"user_id": user_id, "balance": {"$gte": amount}}
+        update = {
+            "$inc": {"balance": -amount},
+            "$set": {"updated_at": datetime.utcnow()}
+        }
+        if reference is not None:
+            query["recent_debits"] = {"$ne": reference}
+            update["$push"] = {"recent_debits": {
+                "$each": [reference],
+                "$slice": -self.RECENT_DEBITS_KEPT
+            }}
+
+        account = await self.collection.find_one_and_update(
+            query,
+            update,
+            projection={"balance": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if account:
+            return account["balance"]
+        if reference is None:
+            return None
+
+        # Already applied by an earlier, interrupted attempt?
+        account = await self.collection.find_one(
+            {"user_id": user_id, "recent_debits": reference},
+            {"balance": 1}
+        )
+        return account["balance"] if account else None
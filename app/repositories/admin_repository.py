@@ -1,8 +1,28 @@
+from bson import ObjectId
+from pymongo import IndexModel
 from app.db.mongodb import db
+from app.repositories.query_shape import QueryShape
 
 class AdminRepository:
-    def __init__(self):
-        self.collection = db.admins
+    INDEXES = [
+        IndexModel([("username", 1)], unique=True),
+    ]
+
+    QUERY_SHAPES = [
+        QueryShape("find_by_username", {"username": "admin"}),
+    ]
+
+    def __init__(self, database=None):
+        database = database if database is not None else db
+        self.collection = database.admins
 
     async def find_by_username(self, username: str):
         return await self.collection.find_one({"username": username})
+
+    async def find_by_id(self, admin_id: str, projection: dict | None = None):
+        if not ObjectId.is_valid(admin_id):
+            return None
+        return await self.collection.find_one(
+            {"_id": ObjectId(admin_id)},
+            projection
+        )
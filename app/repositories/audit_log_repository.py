@@ -1,9 +1,28 @@
-from app.db.mongodb import db
+from app.db.mongodb import db, reporting_collection
 from datetime import datetime
+from pymongo import IndexModel
+from app.repositories.query_shape import QueryShape
+from app.repositories.streaming import export_sort
 
 class AuditLogRepository:
-    def __init__(self):
-        self.collection = db.audit_logs
+    INDEXES = [
+        IndexModel([("timestamp", 1), ("_id", 1)]),
+        IndexModel([("entity_type", 1), ("entity_id", 1)]),
+    ]
+
+    QUERY_SHAPES = [
+        QueryShape(
+            "export_range",
+            {"timestamp": {"$gte": datetime(2000, 1, 1)}},
+            export_sort("timestamp")
+        ),
+    ]
+
+    def __init__(self, database=None):
+        database = database if database is not None else db
+        self.collection = database.audit_logs
+        # Stale-tolerant reads (exports)
+        self.reporting = reporting_collection(self.collection)
 
     async def create(self, log: dict):
         await self.collection.insert_one(log)
@@ -0,0 +1,179 @@
+from datetime import datetime, timedelta
+from pymongo import IndexModel, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from app.db.mongodb import db
+from app.repositories.query_shape import QueryShape
+
+class EmiLeaseRepository:
+    """
+    One claim document per (run, shard) in `emi_run_leases`, plus one
+    per one-off task (`claim_once`, e.g. a run's shard-key backfill).
+    A lease is claimable while PENDING or when it has expired. Its
+    `attempts` count is the lease generation: a holder only renews,
+    completes or releases the generation it claimed.
+    """
+
+    INDEXES = [
+        IndexModel([("run_id", 1), ("status", 1), ("shard", 1)]),
+    ]
+
+    QUERY_SHAPES = [
+        QueryShape(
+            "claim_next",
+            {
+                "run_id": "2000-01-01",
+                "$or": [
+                    {"status": "PENDING"},
+                    {"status": "CLAIMED", "lease_expires_at": {"$lt": datetime(2000, 1, 1)}}
+                ]
+            },
+            [("shard", 1)]
+        ),
+    ]
+
+    def __init__(self, database=None):
+        database = database if database is not None else db
+        self.collection = database.emi_run_leases
+
+    async def ensure_shards(self, run_id: str, shard_count: int):
+        operations = [
+            UpdateOne(
+                {"_id": f"{run_id}:{shard}"},
+                {
+                    "$setOnInsert": {
+                        "run_id": run_id,
+                        "shard": shard,
+                        "shard_count": shard_count,
+                        "status": "PENDING",
+                        "owner": None,
+                        "lease_expires_at": None,
+                        "attempts": 0,
+                        "created_at": datetime.utcnow()
+                    }
+                },
+                upsert=True
+            )
+            for shard in range(shard_count)
+        ]
+        try:
+            await self.collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as exc:
+            # Concurrent upserts from other nodes race on _id; that's fine.
+            if any(
+                error.get("code") != 11000
+                for error in exc.details.get("writeErrors", [])
+            ):
+                raise
+
+    async def claim_next(self, run_id: str, owner: str, lease_seconds: int):
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            {
+                "run_id": run_id,
+                "$or": [
+                    {"status": "PENDING"},
+                    {"status": "CLAIMED", "lease_expires_at": {"$lt": now}}
+                ]
+            },
+            {
+                "$set": {
+                    "status": "CLAIMED",
+                    "owner": owner,
+                    "claimed_at": now,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds)
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("shard", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def claim_once(self, task_id: str, owner: str, lease_seconds: int):
+        """
+        Claim a one-off task shared by all nodes. None once it is DONE
+        or while another node holds an unexpired lease on it.
+        """
+        now = datetime.utcnow()
+        try:
+            await self.collection.update_one(
+                {"_id": task_id},
+                {
+                    "$setOnInsert": {
+                        "status": "PENDING",
+                        "owner": None,
+                        "lease_expires_at": None,
+                        "attempts": 0,
+                        "created_at": now
+                    }
+                },
+                upsert=True
+            )
+        except DuplicateKeyError:
+            pass    # another node created it first
+
+        return await self.collection.find_one_and_update(
+            {
+                "_id": task_id,
+                "$or": [
+                    {"status": "PENDING"},
+                    {"status": "CLAIMED", "lease_expires_at": {"$lt": now}}
+                ]
+            },
+            {
+                "$set": {
+                    "status": "CLAIMED",
+                    "owner": owner,
+                    "claimed_at": now,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds)
+                },
+                "$inc": {"attempts": 1}
+            },
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def is_done(self, task_id: str) -> bool:
+        task = await self.collection.find_one({"_id": task_id}, {"status": 1})
+        return task is not None and task["status"] == "DONE"
+
+    async def renew(
+        self,
+        lease_id: str,
+        owner: str,
+        lease_seconds: int,
+        generation: int
+    ) -> bool:
+        result = await self.collection.update_one(
+            {"_id": lease_id, "owner": owner, "status": "CLAIMED", "attempts": generation},
+            {
+                "$set": {
+                    "lease_expires_at": datetime.utcnow()
+                    + timedelta(seconds=lease_seconds)
+                }
+            }
+        )
+        return result.matched_count == 1
+
+    async def complete(
+        self,
+        lease_id: str,
+        owner: str,
+        generation: int,
+        report: dict
+    ) -> bool:
+        result = await self.collection.update_one(
+            {"_id": lease_id, "owner": owner, "status": "CLAIMED", "attempts": generation},
+            {
+                "$set": {
+                    "status": "DONE",
+                    "completed_at": datetime.utcnow(),
+                    "report": report
+                }
+            }
+        )
+        return result.matched_count == 1
+
+    async def release(self, lease_id: str, owner: str, generation: int):
+        await self.collection.update_one(
+            {"_id": lease_id, "owner": owner, "status": "CLAIMED", "attempts": generation},
+            {"$set": {"status": "PENDING", "owner": None, "lease_expires_at": None}}
+        )
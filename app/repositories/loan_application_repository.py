@@ -1,13 +1,52 @@
 from datetime import datetime
-from app.db.mongodb import db
+from app.db.mongodb import db, reporting_collection
 from app.models.loan_application import LoanApplication
 from bson import ObjectId
+from pymongo import IndexModel
 from app.enums.loan import LoanApplicationStatus
+from app.repositories.pagination import paginate, DEFAULT_PAGE_SIZE
+from app.repositories.query_shape import QueryShape
+from app.repositories.streaming import export_sort
 
 
 class LoanApplicationRepository:
-    def __init__(self):
-        self.collection = db.loan_applications
+    # Newest first (ObjectId order) under each dashboard filter
+    LIST_SORT = [("_id", -1)]
+
+    INDEXES = [
+        IndexModel(
+            [("idempotency_key", 1)],
+            unique=True,
+            partialFilterExpression={"idempotency_key": {"$type": "string"}}
+        ),
+        IndexModel([("system_decision", 1), ("_id", -1)]),
+        IndexModel([("status", 1), ("_id", -1)]),
+        IndexModel([("escalated", 1), ("_id", -1)]),
+        IndexModel([("user_id", 1), ("status", 1)]),
+        IndexModel([("applied_at", 1), ("_id", 1)]),
+    ]
+
+    QUERY_SHAPES = [
+        QueryShape("find_by_idempotency_key", {"idempotency_key": "key"}),
+        QueryShape("count_active_loans", {
+            "user_id": ObjectId(),
+            "status": {"$in": ["APPROVED", "PENDING"]}
+        }),
+        QueryShape("list_by_decision", {"system_decision": "MANUAL_REVIEW"}, LIST_SORT),
+        QueryShape("list_by_status", {"status": "ESCALATED"}, LIST_SORT),
+        QueryShape("list_escalated", {"escalated": True}, LIST_SORT),
+        QueryShape(
+            "export_range",
+            {"applied_at": {"$gte": datetime(2000, 1, 1)}},
+            export_sort("applied_at")
+        ),
+    ]
+
+    def __init__(self, database=None):
+        database = database if database is not None else db
+        self.collection = database.loan_applications
+        # Stale-tolerant reads (dashboards, exports); decisions use the primary
+        self.reporting = reporting_collection(self.collection)
 
     async def find_by_idempotency_key(self,key: str):
         return await self.collection.find_one({"idempotency_key": key})
@@ -16,11 +55,12 @@ class LoanApplicationRepository:
         result = await self.collection.insert_one(data)
         return result.inserted_id
     
-    async def find_by_id(self, loan_id: str):
+    async def find_by_id(self, loan_id: str, projection: dict | None = None):
         if not ObjectId.is_valid(loan_id):
             return None
         return await self.collection.find_one(
-            {"_id": ObjectId(loan_id)}
+            {"_id": ObjectId(loan_id)},
+            projection
         )
     async def update_decision(
         self,
@@ -57,8 +97,35 @@ class LoanApplicationRepository:
             "escalated": True
         }).sort("applied_at", -1)
         return cursor
-    async def update_by_id(self, loan_id: str, update_data: dict):
+    async def update_by_id(
+        self,
+        loan_id: str,
+        update_data: dict,
+        session=None,
+        expected_status=None
+    ):
+        """`expected_status` makes the update a compare-and-set on status."""
+        query = {"_id": ObjectId(loan_id)}
+        if expected_status is not None:
+            query["status"] = expected_status
         return await self.collection.update_one(
-            {"_id": ObjectId(loan_id)},
-            {"$set": update_data}
+            query,
+            {"$set": update_data},
+            session=session
+        )
+
+    async def list_page(
+        self,
+        query: dict,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        projection: dict | None = None
+    ):
+        return await paginate(
+            self.reporting,
+            query,
+            self.LIST_SORT,
+            limit=limit,
+            cursor=cursor,
+            projection=projection
         )
@@ -1,9 +1,76 @@
+from bson import ObjectId
+from pymongo import IndexModel
 from app.db.mongodb import db
+from app.repositories.query_shape import QueryShape
+
+REPAYMENT_COUNTERS = ("total_emis", "paid_emis", "missed_emis", "late_payments")
+
+# Non-empty while a counter update may be half-applied (markers of the
+# writers in progress); readers then count rows instead
+COUNTERS_DIRTY = "counters_dirty"
 
 class LoanRepository:
-    def __init__(self):
-        self.collection = db.loans
+    INDEXES = [
+        IndexModel([("user_id", 1)]),
+    ]
+
+    QUERY_SHAPES = [
+        QueryShape("get_repayment_counters", {"_id": ObjectId()}),
+        QueryShape("get_repayment_counters_for_users", {"user_id": {"$in": [ObjectId()]}}),
+    ]
 
-    async def create(self, loan_doc: dict):
-        result = await self.collection.insert_one(loan_doc)
+    def __init__(self, database=None):
+        database = database if database is not None else db
+        self.collection = database.loans
+
+    async def create(self, loan_doc: dict, session=None):
+        result = await self.collection.insert_one(loan_doc, session=session)
         return result.inserted_id
+
+    async def delete_by_id(self, loan_id):
+        await self.collection.delete_one({"_id": loan_id})
+
+    async def get_repayment_counters(self, loan_id):
+        return await self.collection.find_one(
+            {"_id": loan_id},
+            {field: 1 for field in (*REPAYMENT_COUNTERS, COUNTERS_DIRTY)}
+        )
+
+    async def get_outstanding_principal(self, loan_id) -> float | None:
+        loan = await self.collection.find_one(
+            {"_id": loan_id},
+            {"outstanding_principal": 1}
+        )
+        return loan.get("outstanding_principal") if loan else None
+
+    async def get_repayment_counters_for_users(self, user_ids: list) -> list[dict]:
+        cursor = self.collection.find(
+            {"user_id": {"$in": user_ids}},
+            {"user_id": 1, **{field: 1 for field in (*REPAYMENT_COUNTERS, COUNTERS_DIRTY)}}
+        )
+        return await cursor.to_list(length=None)
+
+    async def iter_repayment_counters(self, batch_size: int = 500):
+        return self.collection.find(
+            {},
+            {field: 1 for field in (*REPAYMENT_COUNTERS, COUNTERS_DIRTY)}
+        ).sort("_id", 1).batch_size(batch_size)
+
+    async def mark_counters_dirty(self, loan_ids: list, marker: str):
+        if loan_ids:
+            await self.collection.update_many(
+                {"_id": {"$in": loan_ids}},
+                {"$addToSet": {COUNTERS_DIRTY: marker}}
+            )
+
+    async def clear_counters_dirty(self, loan_ids: list, markers: list):
+        if loan_ids:
+            await self.collection.update_many(
+                {"_id": {"$in": loan_ids}},
+                {"$pull": {COUNTERS_DIRTY: {"$in": markers}}}
+            )
+
+    async def bulk_write(self, operations: list, session=None):
+        if not operations:
+            return None
+        return await self.collection.bulk_write(operations, ordered=False, session=session)
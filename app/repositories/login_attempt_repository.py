@@ -0,0 +1,47 @@
+from datetime import datetime
+from pymongo import IndexModel, ReturnDocument
+from app.db.mongodb import db
+from app.repositories.query_shape import QueryShape
+
+class LoginAttemptRepository:
+    """
+    Login attempt counters shared by all replicas, one document per
+    (rate-limit key, fixed window). Expired windows are dropped by TTL.
+    """
+
+    INDEXES = [
+        IndexModel([("expires_at", 1)], expireAfterSeconds=0),
+    ]
+
+    QUERY_SHAPES = [
+        QueryShape("get_count", {"_id": "ip:0123456789abcdef:1700000000"}),
+    ]
+
+    def __init__(self, database=None):
+        database = database if database is not None else db
+        self.collection = database.login_attempts
+
+    async def increment(self, key: str, window_start: int, expires_at: datetime) -> int:
+        doc = await self.collection.find_one_and_update(
+            {"_id": f"{key}:{window_start}"},
+            {
+                "$inc": {"count": 1},
+                "$setOnInsert": {"expires_at": expires_at}
+            },
+            upsert=True,
+            projection={"count": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        return doc["count"]
+
+    async def get_count(self, key: str, window_start: int) -> int:
+        doc = await self.collection.find_one(
+            {"_id": f"{key}:{window_start}"},
+            {"count": 1}
+        )
+        return doc["count"] if doc else 0
+
+    async def delete(self, key: str, window_starts: list[int]):
+        await self.collection.delete_many(
+            {"_id": {"$in": [f"{key}:{start}" for start in window_starts]}}
+        )
@@ -1,11 +1,52 @@
-from app.db.mongodb import db
+from bson import ObjectId
+from pymongo import IndexModel
+from app.db.mongodb import db, reporting_collection
+from app.repositories.pagination import paginate, DEFAULT_PAGE_SIZE
+from app.repositories.query_shape import QueryShape
 
 class ManagerRepository:
-    def __init__(self):
-        self.collection = db.managers
+    LIST_SORT = [("_id", -1)]
+
+    INDEXES = [
+        IndexModel([("manager_id", 1)], unique=True),
+    ]
+
+    QUERY_SHAPES = [
+        QueryShape("find_by_manager_id", {"manager_id": "MGR001"}),
+        QueryShape("list_page", {}, LIST_SORT),
+    ]
+
+    def __init__(self, database=None):
+        database = database if database is not None else db
+        self.collection = database.managers
+        # Stale-tolerant reads (dashboards); logins use the primary
+        self.reporting = reporting_collection(self.collection)
 
     async def find_by_manager_id(self, manager_id: str):
         return await self.collection.find_one({"manager_id": manager_id})
 
+    async def find_by_id(self, manager_id: str, projection: dict | None = None):
+        if not ObjectId.is_valid(manager_id):
+            return None
+        return await self.collection.find_one(
+            {"_id": ObjectId(manager_id)},
+            projection
+        )
+
     async def create(self, manager_data: dict):
         await self.collection.insert_one(manager_data)
+
+    async def list_page(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        projection: dict | None = None
+    ):
+        return await paginate(
+            self.reporting,
+            {},
+            self.LIST_SORT,
+            limit=limit,
+            cursor=cursor,
+            projection=projection
+        )
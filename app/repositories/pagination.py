@@ -0,0 +1,81 @@
+import base64
+import binascii
+
+from bson import json_util
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+_OPERATORS = {1: "$gt", -1: "$lt"}
+
+
+def encode_cursor(values: list) -> str:
+    raw = json_util.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        values = json_util.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _after(sort: list[tuple[str, int]], values: list) -> dict:
+    """
+    Keyset condition for "strictly after `values`" in `sort` order,
+    e.g. (a < x) OR (a == x AND _id < y) for [("a", -1), ("_id", -1)].
+    """
+    clauses = []
+    for position, (field, direction) in enumerate(sort):
+        clause = {
+            prefix_field: values[index]
+            for index, (prefix_field, _) in enumerate(sort[:position])
+        }
+        clause[field] = {_OPERATORS[direction]: values[position]}
+        clauses.append(clause)
+
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+async def paginate(
+    collection,
+    query: dict,
+    sort: list[tuple[str, int]],
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    projection: dict | None = None
+) -> tuple[list[dict], str | None]:
+    """
+    Keyset (cursor) pagination shared by every list endpoint.
+
+    `sort` must end with `_id` so the order is total. Returns the page
+    and an opaque cursor for the next one (None on the last page).
+    Raises ValueError for a malformed cursor.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    # The next cursor is built from the sort keys, so always fetch them
+    if projection:
+        projection = {**projection, **{field: 1 for field, _ in sort}}
+
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(sort):
+            raise ValueError("Invalid cursor")
+        query = {"$and": [query, _after(sort, values)]} if query else _after(sort, values)
+
+    docs = await collection.find(query, projection).sort(sort).limit(limit + 1).to_list(
+        length=limit + 1
+    )
+
+    if len(docs) <= limit:
+        return docs, None
+
+    docs = docs[:limit]
+    last = docs[-1]
+    return docs, encode_cursor([last.get(field) for field, _ in sort])
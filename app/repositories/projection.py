@@ -0,0 +1,6 @@
+def fields(*names: str) -> dict:
+    """
+    Mongo inclusion projection for the given field names.
+    `_id` is always returned by the server unless excluded explicitly.
+    """
+    return {name: 1 for name in names}
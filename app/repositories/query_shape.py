@@ -0,0 +1,12 @@
+from typing import NamedTuple
+
+
+class QueryShape(NamedTuple):
+    """
+    A representative query a repository issues, for the index advisor.
+    Values only need the right type; the planner ignores the rest.
+    """
+
+    name: str
+    filter: dict
+    sort: list[tuple[str, int]] | None = None
@@ -1,11 +1,216 @@
+from collections import defaultdict
+from datetime import datetime
+from bson import ObjectId
+from pymongo import IndexModel, UpdateOne
 from app.db.mongodb import db
+from app.repositories.query_shape import QueryShape
+from app.utils.sharding import shard_key
+
+_DUE = {
+    "due_date": {"$lte": datetime(2000, 1, 1)},
+    "status": {"$in": ["PENDING", "FAILED"]}
+}
+
+# Set while a scheduler run owns a row (status PROCESSING). Sharded runs
+# also stamp their lease and its generation (fencing token).
+CLAIM_FIELDS = (
+    "claim_id", "claimed_at", "claimed_from", "claim_lease", "claim_generation"
+)
 
 class RepaymentRepository:
-    def __init__(self):
-        self.collection = db.loan_repayments
+    INDEXES = [
+        # Due-EMI scan: status (equality), _id (sort), due_date (range)
+        IndexModel([("status", 1), ("_id", 1), ("due_date", 1)]),
+        # Sharded runs add `shard_key $in` to the same scan
+        IndexModel([("shard_key", 1), ("status", 1), ("_id", 1), ("due_date", 1)]),
+        IndexModel([("loan_id", 1), ("emi_number", 1)], unique=True),
+    ]
+
+    QUERY_SHAPES = [
+        QueryShape("get_due_emis_page", _DUE, [("_id", 1)]),
+        QueryShape("get_due_emis_page_sharded", {**_DUE, "shard_key": {"$in": [1, 17]}}, [("_id", 1)]),
+        QueryShape("release_stale_claims", {
+            "status": "PROCESSING",
+            "claimed_from": "PENDING",
+            "$or": [
+                {"claimed_at": {"$lt": datetime(2000, 1, 1)}},
+                {"claim_lease": "2000-01-01:0", "claim_generation": {"$lt": 2}}
+            ]
+        }),
+        QueryShape("backfill_shard_keys", {
+            "status": {"$in": ["PENDING", "FAILED"]},
+            "shard_key": {"$exists": False}
+        }),
+        QueryShape("count_by_status", {"loan_id": {"$in": [ObjectId()]}}),
+        QueryShape("delete_by_loan", {"loan_id": ObjectId()}),
+    ]
+
+    def __init__(self, database=None):
+        database = database if database is not None else db
+        self.collection = database.loan_repayments
 
     async def get_due_emis(self, today):
         return self.collection.find({
             "due_date": {"$lte": today},
             "status": {"$in": ["PENDING", "FAILED"]}
         })
+
+    async def create_many(
+        self,
+        rows: list[dict],
+        session=None,
+        chunk_size: int = 1000
+    ):
+        for offset in range(0, len(rows), chunk_size):
+            await self.collection.insert_many(
+                rows[offset:offset + chunk_size],
+                ordered=True,
+                session=session
+            )
+
+    async def delete_by_loan(self, loan_id):
+        await self.collection.delete_many({"loan_id": loan_id})
+
+    async def get_due_emis_page(
+        self,
+        today,
+        after_id=None,
+        limit: int = 500,
+        extra_filter: dict | None = None
+    ):
+        query = {
+            "due_date": {"$lte": today},
+            "status": {"$in": ["PENDING", "FAILED"]}
+        }
+        if extra_filter:
+            query.update(extra_filter)
+        if after_id is not None:
+            query["_id"] = {"$gt": after_id}
+
+        cursor = self.collection.find(query).sort("_id", 1).limit(limit)
+        return await cursor.to_list(length=limit)
+
+    async def claim(self, rows: list[dict], claim: dict) -> list[dict]:
+        """
+        Move the given due rows to PROCESSING under `claim` (claim_id,
+        claimed_at), but only those still in the status they were read
+        with. Returns the rows this call actually claimed, so two runs
+        can never both work the same row.
+        """
+        ids_by_status = defaultdict(list)
+        for row in rows:
+            ids_by_status[row["status"]].append(row["_id"])
+
+        for status, ids in ids_by_status.items():
+            await self.collection.update_many(
+                {"_id": {"$in": ids}, "status": status},
+                {"$set": {"status": "PROCESSING", "claimed_from": status, **claim}}
+            )
+
+        cursor = self.collection.find({
+            "_id": {"$in": [row["_id"] for row in rows]},
+            "claim_id": claim["claim_id"]
+        })
+        return await cursor.to_list(length=None)
+
+    async def release_stale_claims(
+        self,
+        stale_before: datetime,
+        extra_filter: dict | None = None,
+        fence: dict | None = None
+    ) -> int:
+        """
+        Hand rows claimed by a run that never finished them back to the
+        status they were claimed from, so the next due scan picks them
+        up again. Debits carry the row id as reference, so one that went
+        through before the run died is not repeated.
+
+        With a `fence` (claim_lease, claim_generation), rows held under
+        an older generation of the same lease are released at once: their
+        holder lost the lease, and its status writes will no longer match.
+        """
+        stale = [{"claimed_at": {"$lt": stale_before}}]
+        if fence:
+            stale.append({
+                "claim_lease": fence["claim_lease"],
+                "claim_generation": {"$lt": fence["claim_generation"]}
+            })
+
+        released = 0
+        for status in ("PENDING", "FAILED"):
+            query = {
+                "status": "PROCESSING",
+                "claimed_from": status,
+                "$or": stale
+            }
+            if extra_filter:
+                query.update(extra_filter)
+            result = await self.collection.update_many(
+                query,
+                {
+                    "$set": {"status": status},
+                    "$unset": dict.fromkeys(CLAIM_FIELDS, "")
+                }
+            )
+            released += result.modified_count
+        return released
+
+    async def has_missing_shard_keys(self) -> bool:
+        row = await self.collection.find_one(
+            {
+                "status": {"$in": ["PENDING", "FAILED"]},
+                "shard_key": {"$exists": False}
+            },
+            {"_id": 1}
+        )
+        return row is not None
+
+    async def backfill_shard_keys(self, batch_size: int = 1000) -> int:
+        """Stamp `shard_key` on unpaid rows created before sharding existed."""
+        cursor = self.collection.find(
+            {
+                "status": {"$in": ["PENDING", "FAILED"]},
+                "shard_key": {"$exists": False}
+            },
+            {"user_id": 1}
+        ).batch_size(batch_size)
+
+        updated = 0
+        operations = []
+        async for row in cursor:
+            operations.append(UpdateOne(
+                {"_id": row["_id"]},
+                {"$set": {"shard_key": shard_key(row["user_id"])}}
+            ))
+            if len(operations) >= batch_size:
+                await self.bulk_write(operations)
+                updated += len(operations)
+                operations = []
+
+        if operations:
+            await self.bulk_write(operations)
+            updated += len(operations)
+
+        return updated
+
+    async def count_by_status(self, loan_ids: list) -> dict:
+        pipeline = [
+            {"$match": {"loan_id": {"$in": loan_ids}}},
+            {"$group": {
+                "_id": "$loan_id",
+                "total_emis": {"$sum": 1},
+                "paid_emis": {
+                    "$sum": {"$cond": [{"$eq": ["$status", "PAID"]}, 1, 0]}
+                },
+                "missed_emis": {
+                    "$sum": {"$cond": [{"$eq": ["$status", "FAILED"]}, 1, 0]}
+                }
+            }}
+        ]
+        cursor = self.collection.aggregate(pipeline)
+        return {row["_id"]: row async for row in cursor}
+
+    async def bulk_write(self, operations: list, session=None):
+        if not operations:
+            return None
+        return await self.collection.bulk_write(operations, ordered=False, session=session)
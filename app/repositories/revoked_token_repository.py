@@ -0,0 +1,81 @@
+from datetime import datetime
+from pymongo import IndexModel
+from app.db.mongodb import db
+from app.repositories.query_shape import QueryShape
+
+class RevokedTokenRepository:
+    """
+    Revoked access tokens in `revoked_tokens`, two kinds of document:
+
+    * {"_id": jti, "kind": "token"}: one token (logout)
+    * {"_id": "subject:<id>", "kind": "subject", "revoked_before"}:
+      every token of a subject issued up to `revoked_before` (disabled
+      manager, deleted user)
+
+    Entries are only needed while a matching token can still be valid,
+    so a TTL index drops them at `expires_at`.
+    """
+
+    INDEXES = [
+        IndexModel([("expires_at", 1)], expireAfterSeconds=0),
+        IndexModel([("revoked_at", 1)]),
+    ]
+
+    QUERY_SHAPES = [
+        QueryShape("changes_since", {"revoked_at": {"$gte": datetime(2000, 1, 1)}}),
+        QueryShape("load_active", {"expires_at": {"$gt": datetime(2000, 1, 1)}}),
+    ]
+
+    def __init__(self, database=None):
+        database = database if database is not None else db
+        self.collection = database.revoked_tokens
+
+    async def revoke_token(
+        self,
+        jti: str,
+        subject: str,
+        revoked_at: datetime,
+        expires_at: datetime
+    ):
+        await self.collection.update_one(
+            {"_id": jti},
+            {
+                "$setOnInsert": {
+                    "kind": "token",
+                    "subject": subject,
+                    "revoked_at": revoked_at,
+                    "expires_at": expires_at
+                }
+            },
+            upsert=True
+        )
+
+    async def revoke_subject(
+        self,
+        subject: str,
+        revoked_at: datetime,
+        expires_at: datetime
+    ):
+        await self.collection.update_one(
+            {"_id": f"subject:{subject}"},
+            {
+                "$set": {
+                    "kind": "subject",
+                    "subject": subject,
+                    "revoked_before": revoked_at,
+                    "revoked_at": revoked_at,
+                    "expires_at": expires_at
+                }
+            },
+            upsert=True
+        )
+
+    async def load_active(self, now: datetime) -> list[dict]:
+        return await self.collection.find(
+            {"expires_at": {"$gt": now}}
+        ).to_list(length=None)
+
+    async def changes_since(self, since: datetime) -> list[dict]:
+        return await self.collection.find(
+            {"revoked_at": {"$gte": since}}
+        ).to_list(length=None)
@@ -1,8 +1,23 @@
+from pymongo import IndexModel
 from app.db.mongodb import db
+from app.repositories.query_shape import QueryShape
 
 class RuleConfigurationRepository:
-    def __init__(self):
-        self.collection = db.rule_configurations
+    INDEXES = [
+        IndexModel([("rule_type", 1), ("active", 1), ("min_score", -1)]),
+    ]
+
+    QUERY_SHAPES = [
+        QueryShape(
+            "get_active_cibil_rules",
+            {"rule_type": "CIBIL_SCORE", "active": True},
+            [("min_score", -1)]
+        ),
+    ]
+
+    def __init__(self, database=None):
+        database = database if database is not None else db
+        self.collection = database.rule_configurations
 
     async def get_active_cibil_rules(self):
         cursor = self.collection.find(
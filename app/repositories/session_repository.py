@@ -0,0 +1,123 @@
+from datetime import datetime
+from bson import ObjectId
+from pymongo import IndexModel, ReturnDocument
+from app.db.mongodb import db
+from app.repositories.query_shape import QueryShape
+
+class SessionRepository:
+    """
+    Login sessions in `sessions`, one document per login:
+
+    * `token_hash`: SHA-256 of the current refresh token (the token
+      itself is never stored)
+    * `previous_hashes`: the last rotated-out hashes, so a replayed old
+      token can be recognised and the session ended
+    * `approval_required`: the login only admitted approved users
+      (Aadhaar login), so refresh requires it too
+    * `rotated_at`: time of the last rotation, for the grace window in
+      which a concurrent refresh with the newest previous token is not
+      treated as reuse; `successor_sealed` is the current token sealed
+      under that previous one, handed to such a refresh
+    * `expires_at`: idle expiry, pushed forward on every rotation;
+      `max_expires_at` caps the session's total lifetime. Sessions are
+      dropped by TTL once idle-expired
+    """
+
+    # Rotated-out hashes kept per session for reuse detection
+    PREVIOUS_HASHES_KEPT = 20
+
+    INDEXES = [
+        IndexModel([("token_hash", 1)], unique=True),
+        IndexModel([("previous_hashes", 1)]),
+        IndexModel([("subject", 1)]),
+        IndexModel([("expires_at", 1)], expireAfterSeconds=0),
+    ]
+
+    QUERY_SHAPES = [
+        QueryShape("rotate", {
+            "token_hash": "0" * 64,
+            "revoked_at": None,
+            "expires_at": {"$gt": datetime(2000, 1, 1)},
+            "max_expires_at": {"$gt": datetime(2000, 1, 1)}
+        }),
+        QueryShape("find_by_previous_hash", {"previous_hashes": "0" * 64}),
+        QueryShape("revoke_subject", {"subject": "0" * 24, "revoked_at": None}),
+    ]
+
+    def __init__(self, database=None):
+        database = database if database is not None else db
+        self.collection = database.sessions
+
+    async def create(self, session: dict) -> str:
+        result = await self.collection.insert_one(session)
+        return str(result.inserted_id)
+
+    async def rotate(
+        self,
+        token_hash: str,
+        new_hash: str,
+        successor_sealed: bytes,
+        now: datetime,
+        expires_at: datetime
+    ) -> dict | None:
+        """
+        Swap a live session's current hash for `new_hash`. Atomic, so of
+        two concurrent refreshes with the same token only one succeeds.
+        """
+        return await self.collection.find_one_and_update(
+            {
+                "token_hash": token_hash,
+                "revoked_at": None,
+                "expires_at": {"$gt": now},
+                "max_expires_at": {"$gt": now}
+            },
+            {
+                "$set": {
+                    "token_hash": new_hash,
+                    "successor_sealed": successor_sealed,
+                    "last_used_at": now,
+                    "rotated_at": now,
+                    "expires_at": expires_at
+                },
+                "$push": {"previous_hashes": {
+                    "$each": [token_hash],
+                    "$slice": -self.PREVIOUS_HASHES_KEPT
+                }}
+            },
+            projection={"subject": 1, "role": 1, "approval_required": 1},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def find_by_previous_hash(self, token_hash: str) -> dict | None:
+        return await self.collection.find_one(
+            {"previous_hashes": token_hash},
+            {
+                "subject": 1,
+                "role": 1,
+                "approval_required": 1,
+                "token_hash": 1,
+                "successor_sealed": 1,
+                "rotated_at": 1,
+                "revoked_at": 1
+            }
+        )
+
+    async def revoke(self, session_id, now: datetime, reason: str):
+        await self.collection.update_one(
+            {"_id": ObjectId(session_id), "revoked_at": None},
+            {"$set": {"revoked_at": now, "revoked_reason": reason}}
+        )
+
+    async def revoke_by_token_hash(self, token_hash: str, now: datetime) -> dict | None:
+        return await self.collection.find_one_and_update(
+            {"token_hash": token_hash, "revoked_at": None},
+            {"$set": {"revoked_at": now, "revoked_reason": "logout"}},
+            projection={"subject": 1}
+        )
+
+    async def revoke_subject(self, subject: str, now: datetime, reason: str) -> int:
+        result = await self.collection.update_many(
+            {"subject": subject, "revoked_at": None},
+            {"$set": {"revoked_at": now, "revoked_reason": reason}}
+        )
+        return result.modified_count
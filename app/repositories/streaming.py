@@ -0,0 +1,74 @@
+import logging
+
+from pymongo.errors import AutoReconnect, CursorNotFound
+
+logger = logging.getLogger("exports")
+
+# Cursor losses an export recovers from by re-opening after the last
+# document it yielded (failover, idle cursor reaped on the secondary)
+RESUMABLE_ERRORS = (AutoReconnect, CursorNotFound)
+RESUME_ATTEMPTS = 3
+
+
+def export_sort(date_field: str) -> list[tuple[str, int]]:
+    """Range-filter field first, `_id` to order documents with equal dates."""
+    return [(date_field, 1), ("_id", 1)]
+
+
+def _after(date_field: str, last: dict) -> dict:
+    """Documents strictly after `last` in export_sort order."""
+    value = last.get(date_field)
+    if value is None:
+        # Missing/null dates sort first; every set date comes after them
+        return {"$or": [
+            {date_field: {"$ne": None}},
+            {date_field: None, "_id": {"$gt": last["_id"]}}
+        ]}
+    return {"$or": [
+        {date_field: {"$gt": value}},
+        {date_field: value, "_id": {"$gt": last["_id"]}}
+    ]}
+
+
+async def stream(
+    collection,
+    query: dict,
+    date_field: str,
+    projection: dict | None = None,
+    batch_size: int = 1000
+):
+    """
+    Every match in (`date_field`, `_id`) order, fetched `batch_size`
+    documents per round trip. The sort follows the date range filter, so
+    the (date_field, _id) index serves both and the server never sorts
+    in memory. If the cursor is lost midway, the export resumes after
+    the last (date, _id) it yielded instead of failing or starting over.
+    """
+    sort = export_sort(date_field)
+    if projection is not None:
+        # The resume point needs the date even if it is not a column
+        projection = {**projection, date_field: 1}
+
+    last = None
+    failures = 0
+    while True:
+        resume_query = query if last is None else {"$and": [query, _after(date_field, last)]}
+        cursor = collection.find(resume_query, projection).sort(sort).batch_size(batch_size)
+        try:
+            async for doc in cursor:
+                last = doc
+                failures = 0
+                yield doc
+            return
+        except RESUMABLE_ERRORS as exc:
+            failures += 1
+            if failures > RESUME_ATTEMPTS:
+                raise
+            logger.warning(
+                "EXPORT_CURSOR_RESUMED",
+                extra={
+                    "collection": collection.name,
+                    "attempt": failures,
+                    "error": str(exc)
+                }
+            )
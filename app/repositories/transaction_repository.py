@@ -1,8 +1,69 @@
-from app.db.mongodb import db
+from datetime import datetime
+from bson import ObjectId
+from pymongo import IndexModel
+from pymongo.errors import BulkWriteError
+from app.db.mongodb import db, reporting_collection
+from app.repositories.query_shape import QueryShape
+from app.repositories.streaming import export_sort
 
 class TransactionRepository:
-    def __init__(self):
-        self.collection = db.loan_transactions
+    INDEXES = [
+        IndexModel([("transaction_id", 1)], unique=True),
+        IndexModel([("loan_id", 1), ("transaction_type", 1), ("status", 1)]),
+        IndexModel([("created_at", 1), ("_id", 1)]),
+    ]
+
+    QUERY_SHAPES = [
+        QueryShape("count_paid_penalties", {
+            "loan_id": {"$in": [ObjectId()]},
+            "transaction_type": "PENALTY",
+            "status": "PAID"
+        }),
+        QueryShape(
+            "export_range",
+            {"created_at": {"$gte": datetime(2000, 1, 1)}},
+            export_sort("created_at")
+        ),
+    ]
+
+    def __init__(self, database=None):
+        database = database if database is not None else db
+        self.collection = database.loan_transactions
+        # Stale-tolerant reads (exports)
+        self.reporting = reporting_collection(self.collection)
 
     async def create(self, txn: dict):
         await self.collection.insert_one(txn)
+
+    async def create_many(
+        self,
+        txns: list[dict],
+        session=None,
+        skip_existing: bool = False
+    ):
+        """
+        With `skip_existing`, rows whose `transaction_id` is already
+        stored are left alone (retries with deterministic ids).
+        """
+        if not txns:
+            return
+        try:
+            await self.collection.insert_many(txns, ordered=False, session=session)
+        except BulkWriteError as exc:
+            if not skip_existing or any(
+                error.get("code") != 11000
+                for error in exc.details.get("writeErrors", [])
+            ):
+                raise
+
+    async def count_paid_penalties(self, loan_ids: list) -> dict:
+        pipeline = [
+            {"$match": {
+                "loan_id": {"$in": loan_ids},
+                "transaction_type": "PENALTY",
+                "status": "PAID"
+            }},
+            {"$group": {"_id": "$loan_id", "late_payments": {"$sum": 1}}}
+        ]
+        cursor = self.collection.aggregate(pipeline)
+        return {row["_id"]: row["late_payments"] async for row in cursor}
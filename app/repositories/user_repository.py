@@ -1,11 +1,47 @@
 from datetime import datetime
 from typing import Optional
-from app.db.mongodb import db
+from app.db.mongodb import db, reporting_collection
 from bson import ObjectId
+from pymongo import IndexModel
+from app.repositories.pagination import paginate, DEFAULT_PAGE_SIZE
+from app.repositories.query_shape import QueryShape
+from app.repositories.streaming import export_sort
 
 class UserRepository:
-    def __init__(self):
-        self.collection = db.users
+    LIST_SORT = [("created_at", -1), ("_id", -1)]
+
+    INDEXES = [
+        IndexModel([("phone", 1)], unique=True),
+        # Only set once KYC is submitted
+        IndexModel(
+            [("aadhaar", 1)],
+            unique=True,
+            partialFilterExpression={"aadhaar": {"$type": "string"}}
+        ),
+        IndexModel([("created_at", -1), ("_id", -1)]),
+        IndexModel([("approval_status", 1), ("created_at", -1), ("_id", -1)]),
+        IndexModel([("kyc_status", 1), ("created_at", -1), ("_id", -1)]),
+    ]
+
+    QUERY_SHAPES = [
+        QueryShape("find_by_phone", {"phone": "9999999999"}),
+        QueryShape("login_with_aadhaar", {"aadhaar": "123412341234"}),
+        QueryShape("list_page", {}, LIST_SORT),
+        QueryShape("list_page_by_approval", {"approval_status": "PENDING"}, LIST_SORT),
+        QueryShape("list_page_by_kyc", {"kyc_status": "PENDING"}, LIST_SORT),
+        # Served backwards by the (created_at, _id) list index
+        QueryShape(
+            "export_range",
+            {"created_at": {"$gte": datetime(2000, 1, 1)}},
+            export_sort("created_at")
+        ),
+    ]
+
+    def __init__(self, database=None):
+        database = database if database is not None else db
+        self.collection = database.users
+        # Stale-tolerant reads (dashboards, exports, batch re-scoring)
+        self.reporting = reporting_collection(self.collection)
 
     async def find_by_phone(self, phone: str):
         return await self.collection.find_one({"phone": phone})
@@ -14,11 +50,12 @@ class UserRepository:
         result = await self.collection.insert_one(user_data)
         return result.inserted_id
 
-    async def find_by_id(self, user_id: str):
+    async def find_by_id(self, user_id: str, projection: dict | None = None):
         if not ObjectId.is_valid(user_id):
             return None
         return await self.collection.find_one(
-            {"_id": ObjectId(user_id)}
+            {"_id": ObjectId(user_id)},
+            projection
         )
     
     async def update_kyc(self, user_id: str, update_data: dict):
@@ -58,6 +95,29 @@ class UserRepository:
 
         cursor = self.collection.find(query).sort("created_at", -1)
         return cursor
+
+    async def list_page(
+        self,
+        approval_status: Optional[str] = None,
+        kyc_status: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        projection: dict | None = None
+    ):
+        query = {}
+        if approval_status:
+            query["approval_status"] = approval_status
+        if kyc_status:
+            query["kyc_status"] = kyc_status
+
+        return await paginate(
+            self.reporting,
+            query,
+            self.LIST_SORT,
+            limit=limit,
+            cursor=cursor,
+            projection=projection
+        )
     
     async def soft_delete_user(self, user_id: str, deleted_by: str):
         return await self.collection.update_one(
@@ -72,5 +132,10 @@ class UserRepository:
             }
         )
 
+    async def iter_ids(self, batch_size: int = 1000):
+        return self.reporting.find({}, {"_id": 1}).batch_size(batch_size)
 
-    
\ No newline at end of file
+    async def bulk_write(self, operations: list):
+        if not operations:
+            return None
+        return await self.collection.bulk_write(operations, ordered=False)
@@ -1,14 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
+from datetime import datetime
+from typing import Optional
 from app.auth.dependencies import get_current_user, AuthContext
 from app.enums.role import Role
 from app.services.admin_service import AdminService
 from app.schemas.admin_manager import CreateManagerRequest
 from app.schemas.admin_loan_escalation import AdminLoanDecisionRequest
+from app.schemas.admin_profile import ProfileArmRequest
+from app.core.profiling import profile_store
+from app.core.config import settings
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from app.scheduler.cibil_rescore import rescore_portfolio
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.enums.export import ExportDataset, ExportFormat
+from app.services.export_service import ExportService, MEDIA_TYPES
+from app.core.container import Container, get_admin_service, get_container, get_export_service
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
-service = AdminService()
 
 # ========================
 # ADMIN SELF
@@ -24,26 +33,39 @@ async def admin_me(auth: AuthContext = Depends(get_current_user)):
 # MANAGER MANAGEMENT
 # ========================
 @router.get("/managers")
-async def list_managers(auth: AuthContext = Depends(get_current_user)):
+async def list_managers(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    auth: AuthContext = Depends(get_current_user),
+    service: AdminService = Depends(get_admin_service)
+):
     if auth.role != Role.ADMIN:
         raise HTTPException(403)
-    return await service.list_managers()
+    try:
+        return await service.list_managers(limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
 
 @router.post("/managers")
 async def create_manager(
     payload: CreateManagerRequest,
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: AdminService = Depends(get_admin_service)
 ):
     if auth.role != Role.ADMIN:
         raise HTTPException(403)
-    await service.create_manager(payload)
+    try:
+        await service.create_manager(payload)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
     return {"message": "Manager created"}
 
 @router.put("/managers/{manager_id}")
 async def update_manager(
     manager_id: str,
     payload: dict,
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: AdminService = Depends(get_admin_service)
 ):
     if auth.role != Role.ADMIN:
         raise HTTPException(403)
@@ -53,7 +75,8 @@ async def update_manager(
 @router.patch("/managers/{manager_id}/disable")
 async def disable_manager(
     manager_id: str,
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: AdminService = Depends(get_admin_service)
 ):
     if auth.role != Role.ADMIN:
         raise HTTPException(403)
@@ -63,7 +86,8 @@ async def disable_manager(
 @router.delete("/managers/{manager_id}")
 async def delete_manager(
     manager_id: str,
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: AdminService = Depends(get_admin_service)
 ):
     if auth.role != Role.ADMIN:
         raise HTTPException(403)
@@ -74,15 +98,24 @@ async def delete_manager(
 # USER OVERSIGHT
 # ========================
 @router.get("/users")
-async def list_users(auth: AuthContext = Depends(get_current_user)):
+async def list_users(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    auth: AuthContext = Depends(get_current_user),
+    service: AdminService = Depends(get_admin_service)
+):
     if auth.role != Role.ADMIN:
         raise HTTPException(403)
-    return await service.list_users()
+    try:
+        return await service.list_users(limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
 
 @router.post("/users/{user_id}/delete-request")
 async def request_user_deletion(
     user_id: str,
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: AdminService = Depends(get_admin_service)
 ):
     if auth.role != Role.ADMIN:
         raise HTTPException(403)
@@ -93,19 +126,33 @@ async def request_user_deletion(
 # LOAN OVERSIGHT
 # ========================
 @router.get("/loans")
-async def list_loans(auth: AuthContext = Depends(get_current_user)):
+async def list_loans(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    auth: AuthContext = Depends(get_current_user),
+    service: AdminService = Depends(get_admin_service)
+):
     if auth.role != Role.ADMIN:
         raise HTTPException(403)
-    return await service.list_all_loans()
+    try:
+        return await service.list_all_loans(limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
 
 @router.get("/loans/escalated")
 async def get_escalated_loans(
-    auth: AuthContext = Depends(get_current_user)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    auth: AuthContext = Depends(get_current_user),
+    service: AdminService = Depends(get_admin_service)
 ):
     if auth.role != Role.ADMIN:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    loans = await service.list_escalated_loans()
+    try:
+        loans = await service.list_escalated_loans(limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
 
     # 🔐 Force JSON-safe encoding
     return JSONResponse(
@@ -134,7 +181,8 @@ async def get_escalated_loans(
 async def decide_escalated_loan(
     loan_id: str,
     payload: AdminLoanDecisionRequest,
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: AdminService = Depends(get_admin_service)
 ):
     if auth.role != Role.ADMIN:
         raise HTTPException(403)
@@ -150,3 +198,111 @@ async def decide_escalated_loan(
         raise HTTPException(400, detail=str(e))
 
     return {"message": "Admin decision applied"}
+
+
+# ========================
+# CREDIT SCORING
+# ========================
+@router.post("/cibil/rescore", status_code=202)
+async def rescore_cibil_portfolio(
+    background_tasks: BackgroundTasks,
+    auth: AuthContext = Depends(get_current_user),
+    container: Container = Depends(get_container)
+):
+    if auth.role != Role.ADMIN:
+        raise HTTPException(403)
+
+    background_tasks.add_task(
+        rescore_portfolio,
+        users=container.user_repo,
+        summaries=container.repayment_summary_service
+    )
+    return {"message": "Portfolio re-score started"}
+
+
+# ========================
+# EXPORTS
+# ========================
+@router.get("/exports/{dataset}")
+async def export_dataset(
+    dataset: ExportDataset,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    auth: AuthContext = Depends(get_current_user),
+    export_service: ExportService = Depends(get_export_service)
+):
+    if auth.role != Role.ADMIN:
+        raise HTTPException(403)
+
+    try:
+        chunks = export_service.export(dataset, export_format, start, end)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
+
+    filename = f"{dataset.value}.{export_format.value}"
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+# ========================
+# REQUEST PROFILING
+# ========================
+@router.get("/profiles")
+async def list_profiles(auth: AuthContext = Depends(get_current_user)):
+    if auth.role != Role.ADMIN:
+        raise HTTPException(403)
+
+    return {
+        **profile_store.armed_state(),
+        "profiles": jsonable_encoder(profile_store.list())
+    }
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(
+    profile_id: int,
+    raw: bool = Query(False, description="Download raw pstats data"),
+    auth: AuthContext = Depends(get_current_user)
+):
+    if auth.role != Role.ADMIN:
+        raise HTTPException(403)
+
+    profile = profile_store.get(profile_id)
+    if not profile:
+        raise HTTPException(404, detail="Profile not found")
+
+    if raw:
+        return Response(
+            profile["stats"],
+            media_type="application/octet-stream",
+            headers={
+                "Content-Disposition": f'attachment; filename="profile-{profile_id}.prof"'
+            }
+        )
+    return PlainTextResponse(profile["report"])
+
+@router.post("/profiles/arm")
+async def arm_profiling(
+    payload: ProfileArmRequest,
+    auth: AuthContext = Depends(get_current_user)
+):
+    if auth.role != Role.ADMIN:
+        raise HTTPException(403)
+
+    # Without the middleware an armed capture would never fire
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(409, detail="Profiling is disabled (PROFILING_ENABLED)")
+
+    profile_store.arm(payload.path_prefix, payload.count)
+    return profile_store.armed_state()
+
+@router.delete("/profiles/arm")
+async def disarm_profiling(auth: AuthContext = Depends(get_current_user)):
+    if auth.role != Role.ADMIN:
+        raise HTTPException(403)
+
+    profile_store.disarm()
+    return profile_store.armed_state()
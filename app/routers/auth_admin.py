@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from app.services.admin_auth_service import AdminAuthService
+from app.auth.rate_limit import LoginRateLimiter
+from app.core.container import get_admin_auth_service, get_login_rate_limiter
 
 router = APIRouter(
     prefix="/auth/admin",
     tags=["Auth - Admin"]
 )
 
-service = AdminAuthService()
 
 @router.post(
     "/login",
@@ -17,6 +18,7 @@ Authenticate an **Admin** using username and password.
 
 - Returns a JWT access token
 - Token contains role = `ADMIN`
+- Also returns a refresh token for `POST /auth/refresh`
 - Use this token in Swagger **Authorize 🔐**
 
 Example:
@@ -25,10 +27,15 @@ Example:
 """
 )
 async def admin_login(
-    form_data: OAuth2PasswordRequestForm = Depends()
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    service: AdminAuthService = Depends(get_admin_auth_service),
+    rate_limiter: LoginRateLimiter = Depends(get_login_rate_limiter)
 ):
+    await rate_limiter.check("admin", form_data.username, request)
+
     try:
-        token = await service.login_admin(
+        access_token, refresh_token = await service.login_admin(
             username=form_data.username,
             password=form_data.password
         )
@@ -38,7 +45,10 @@ async def admin_login(
             detail=str(e)
         )
 
+    await rate_limiter.login_succeeded("admin", form_data.username)
+
     return {
-        "access_token": token,
+        "access_token": access_token,
+        "refresh_token": refresh_token,
         "token_type": "bearer"
     }
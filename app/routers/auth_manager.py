@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from app.services.manager_auth_service import ManagerAuthService
+from app.auth.rate_limit import LoginRateLimiter
+from app.core.container import get_login_rate_limiter, get_manager_auth_service
 
 router = APIRouter(
     prefix="/auth/manager",
     tags=["Auth - Manager"]
 )
 
-service = ManagerAuthService()
 
 @router.post(
     "/login",
@@ -22,14 +23,21 @@ This endpoint is used by:
 Returns a JWT access token containing:
 - role = `BANK_MANAGER` or `LOAN_MANAGER`
 
+and a refresh token for `POST /auth/refresh`.
+
 Use this token in Swagger **Authorize 🔐** to access manager-protected APIs.
 """
 )
 async def manager_login(
-    form_data: OAuth2PasswordRequestForm = Depends()
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    service: ManagerAuthService = Depends(get_manager_auth_service),
+    rate_limiter: LoginRateLimiter = Depends(get_login_rate_limiter)
 ):
+    await rate_limiter.check("manager", form_data.username, request)
+
     try:
-        token = await service.login_manager(
+        access_token, refresh_token = await service.login_manager(
             manager_id=form_data.username,
             password=form_data.password
         )
@@ -39,7 +47,10 @@ async def manager_login(
             detail=str(e)
         )
 
+    await rate_limiter.login_succeeded("manager", form_data.username)
+
     return {
-        "access_token": token,
+        "access_token": access_token,
+        "refresh_token": refresh_token,
         "token_type": "bearer"
     }
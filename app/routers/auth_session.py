@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.auth.dependencies import verify_token
+from app.core.container import get_session_service
+from app.schemas.auth_user import RefreshTokenRequest, TokenResponse
+from app.services.session_service import SessionService
+
+router = APIRouter(
+    prefix="/auth",
+    tags=["Auth - Session"]
+)
+
+# Logout must still work once the access token has expired
+optional_bearer = HTTPBearer(auto_error=False)
+
+
+@router.post(
+    "/refresh",
+    response_model=TokenResponse,
+    summary="Refresh Access Token",
+    description="""
+Exchange a **refresh token** (returned by any login) for a new access
+token and a new refresh token, without the password.
+
+- The refresh token sent is used up; keep the new one
+- Sending it again within a few seconds (a retry, a second tab) returns
+  the same new refresh token
+- Re-using an old refresh token after that ends the whole session
+"""
+)
+async def refresh_token(
+    payload: RefreshTokenRequest,
+    service: SessionService = Depends(get_session_service)
+):
+    try:
+        access_token, refresh_token = await service.refresh(payload.refresh_token)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e)
+        )
+
+    return TokenResponse(access_token=access_token, refresh_token=refresh_token)
+
+
+@router.post(
+    "/logout",
+    summary="Logout",
+    description="""
+End the session behind the refresh token. If a valid access token is
+sent as well, it is revoked immediately.
+"""
+)
+async def logout(
+    payload: RefreshTokenRequest,
+    credentials: HTTPAuthorizationCredentials | None = Depends(optional_bearer),
+    service: SessionService = Depends(get_session_service)
+):
+    auth = verify_token(credentials.credentials) if credentials else None
+    await service.logout(payload.refresh_token, auth)
+    return {"message": "Logged out"}
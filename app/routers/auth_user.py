@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app.schemas.auth_user import (
@@ -7,6 +7,8 @@ from app.schemas.auth_user import (
     TokenResponse
 )
 from app.services.user_service import UserService
+from app.auth.rate_limit import LoginRateLimiter
+from app.core.container import get_login_rate_limiter, get_user_service
 from app.schemas.auth_user import UserLoginRequest
 
 router = APIRouter(
@@ -14,7 +16,6 @@ router = APIRouter(
     tags=["Auth - User"]
 )
 
-service = UserService()
 
 # =========================
 # USER REGISTRATION
@@ -32,7 +33,10 @@ Register a **new user** using phone number and password.
 - Bank Manager approval is required before loan access
 """
 )
-async def register_user(payload: UserRegisterRequest):
+async def register_user(
+    payload: UserRegisterRequest,
+    service: UserService = Depends(get_user_service)
+):
     try:
         user_id = await service.register_user(payload)
     except ValueError as e:
@@ -59,14 +63,22 @@ Authenticate an **end user** using phone number and password.
 Returns a JWT access token containing:
 - role = `USER`
 
+and a refresh token for `POST /auth/refresh`.
+
 Use this token in Swagger **Authorize 🔐** to access user-protected APIs.
 """
 )
 async def login_user(
-    form_data: OAuth2PasswordRequestForm = Depends()
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    service: UserService = Depends(get_user_service),
+    rate_limiter: LoginRateLimiter = Depends(get_login_rate_limiter)
 ):
+    # Before the lookup and bcrypt: throttled attempts cost nothing
+    await rate_limiter.check("user", form_data.username, request)
+
     try:
-        token = await service.login_user(
+        access_token, refresh_token = await service.login_user(
             phone=form_data.username,
             password=form_data.password
         )
@@ -76,15 +88,24 @@ async def login_user(
             detail=str(e)
         )
 
-    return TokenResponse(access_token=token)
+    await rate_limiter.login_succeeded("user", form_data.username)
+
+    return TokenResponse(access_token=access_token, refresh_token=refresh_token)
 
 
 from app.schemas.auth_user import UserLoginRequest
 
 @router.post("/login-aadhaar", response_model=TokenResponse)
-async def login_with_aadhaar(payload: UserLoginRequest):
+async def login_with_aadhaar(
+    request: Request,
+    payload: UserLoginRequest,
+    service: UserService = Depends(get_user_service),
+    rate_limiter: LoginRateLimiter = Depends(get_login_rate_limiter)
+):
+    await rate_limiter.check("aadhaar", payload.aadhaar, request)
+
     try:
-        token = await service.login_user_with_aadhaar(
+        access_token, refresh_token = await service.login_user_with_aadhaar(
             aadhaar=payload.aadhaar,
             password=payload.password,
             digi_pin=payload.digi_pin
@@ -92,4 +113,6 @@ async def login_with_aadhaar(payload: UserLoginRequest):
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e))
 
-    return TokenResponse(access_token=token)
+    await rate_limiter.login_succeeded("aadhaar", payload.aadhaar)
+
+    return TokenResponse(access_token=access_token, refresh_token=refresh_token)
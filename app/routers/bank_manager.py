@@ -6,32 +6,42 @@ from app.schemas.user_delete import UserDeleteRequest
 from app.services.bank_manager_service import BankManagerService
 from typing import Optional
 from app.schemas.user_delete import UserDeleteDecisionRequest
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.container import get_bank_manager_service
 
 router = APIRouter(
     prefix="/manager/bank",
     tags=["Bank Manager"]
 )
 
-service = BankManagerService()
 
 @router.get("/users")
 async def list_users(
     approval_status: Optional[str] = Query(None),
     kyc_status: Optional[str] = Query(None),
-    auth: AuthContext = Depends(get_current_user)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    auth: AuthContext = Depends(get_current_user),
+    service: BankManagerService = Depends(get_bank_manager_service)
 ):
     if auth.role != Role.BANK_MANAGER:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    return await service.list_users(
-        approval_status=approval_status,
-        kyc_status=kyc_status
-    )
+    try:
+        return await service.list_users(
+            approval_status=approval_status,
+            kyc_status=kyc_status,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/users/{user_id}/kyc")
 async def review_user_kyc(
     user_id: str,
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: BankManagerService = Depends(get_bank_manager_service)
 ):
     if auth.role != Role.BANK_MANAGER:
         raise HTTPException(status_code=403, detail="Access denied")
@@ -45,7 +55,8 @@ async def review_user_kyc(
 async def decide_user(
     user_id: str,
     payload: UserApprovalDecisionRequest,
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: BankManagerService = Depends(get_bank_manager_service)
 ):
     if auth.role != Role.BANK_MANAGER:
         raise HTTPException(status_code=403, detail="Access denied")
@@ -68,7 +79,8 @@ async def decide_user(
 @router.get("/users/{user_id}")
 async def get_user_details(
     user_id: str,
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: BankManagerService = Depends(get_bank_manager_service)
 ):
     if auth.role != Role.BANK_MANAGER:
         raise HTTPException(status_code=403, detail="Access denied")
@@ -82,7 +94,8 @@ async def get_user_details(
 async def delete_user(
     user_id: str,
     payload: UserDeleteRequest,
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: BankManagerService = Depends(get_bank_manager_service)
 ):
     if auth.role != Role.BANK_MANAGER:
         raise HTTPException(status_code=403, detail="Access denied")
@@ -103,7 +116,8 @@ async def delete_user(
 async def handle_user_deletion_escalation(
     user_id: str,
     payload: UserDeleteDecisionRequest,
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: BankManagerService = Depends(get_bank_manager_service)
 ):
     if auth.role != Role.BANK_MANAGER:
         raise HTTPException(status_code=403, detail="Access denied")
@@ -9,16 +9,17 @@ from app.schemas.loan_decision_query import LoanDecisionResponse
 from app.services.loan_application_service import LoanApplicationService
 from app.auth.dependencies import get_current_user, AuthContext
 from app.enums.role import Role
+from app.core.container import get_loan_application_service
 
 router = APIRouter(prefix="/loans", tags=["Loans"])
-service = LoanApplicationService()
 
 
 @router.post("", response_model=LoanApplicationResponse, status_code=201)
 async def apply_loan(
     payload: LoanApplicationCreateRequest,
     idempotency_key: str = Header(..., alias="Idempotency-Key"),
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: LoanApplicationService = Depends(get_loan_application_service)
 ):
     if auth.role != Role.USER:
         raise HTTPException(status_code=403)
@@ -52,7 +53,8 @@ async def apply_loan(
 @router.get("/{loan_id}")
 async def get_loan(
     loan_id: str,
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: LoanApplicationService = Depends(get_loan_application_service)
 ):
     if auth.role != Role.USER:
         raise HTTPException(status_code=403)
@@ -67,7 +69,8 @@ async def get_loan(
 )
 async def get_loan_decision(
     loan_id: str,
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: LoanApplicationService = Depends(get_loan_application_service)
 ):
     if auth.role == Role.BANK_MANAGER:
         raise HTTPException(status_code=403, detail="Access denied")
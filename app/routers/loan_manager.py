@@ -1,33 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import Optional
 from app.auth.dependencies import get_current_user, AuthContext
 from app.enums.role import Role
 from app.schemas.loan_decision import LoanDecisionRequest,LoanFinalizeRequest,LoanEscalationRequest
 from app.services.loan_manager_service import LoanManagerService
 from app.enums.loan import SystemDecision
 from app.schemas.loan_decision import LoanAutoDecisionRequest
+from app.repositories.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.container import get_loan_manager_service
 
 router = APIRouter(
     prefix="/manager/loan",
     tags=["Loan Manager"]
 )
 
-service = LoanManagerService()
 
 @router.get("/applications")
 async def view_loans(
     system_decision: SystemDecision | None = None,
-    auth: AuthContext = Depends(get_current_user)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    auth: AuthContext = Depends(get_current_user),
+    service: LoanManagerService = Depends(get_loan_manager_service)
 ):
     if auth.role != Role.LOAN_MANAGER:
         raise HTTPException(403)
 
-    return await service.list_loans(system_decision)
+    try:
+        return await service.list_loans(system_decision, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/applications/{loan_id}/decision")
 async def decide_loan(
     loan_id: str,
     payload: LoanDecisionRequest,
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: LoanManagerService = Depends(get_loan_manager_service)
 ):
     if auth.role != Role.LOAN_MANAGER:
         raise HTTPException(status_code=403, detail="Access denied")
@@ -51,7 +60,8 @@ async def decide_loan(
 async def auto_decision(
     loan_id: str,
     payload: LoanAutoDecisionRequest,
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: LoanManagerService = Depends(get_loan_manager_service)
 ):
     if auth.role != Role.LOAN_MANAGER:
         raise HTTPException(status_code=403, detail="Access denied")
@@ -74,7 +84,8 @@ async def auto_decision(
 async def escalate_loan(
     loan_id: str,
     payload: LoanEscalationRequest,
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: LoanManagerService = Depends(get_loan_manager_service)
 ):
     if auth.role != Role.LOAN_MANAGER:
         raise HTTPException(status_code=403, detail="Access denied")
@@ -91,18 +102,25 @@ async def escalate_loan(
 
 @router.get("/applications/escalated")
 async def get_escalated_loans(
-    auth: AuthContext = Depends(get_current_user)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    auth: AuthContext = Depends(get_current_user),
+    service: LoanManagerService = Depends(get_loan_manager_service)
 ):
     if auth.role != Role.LOAN_MANAGER:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    return await service.list_escalated_loans()
+    try:
+        return await service.list_escalated_loans(limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/applications/{loan_id}/finalize")
 async def finalize_loan(
     loan_id: str,
     payload: LoanFinalizeRequest,
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: LoanManagerService = Depends(get_loan_manager_service)
 ):
     if auth.role != Role.LOAN_MANAGER:
         raise HTTPException(status_code=403, detail="Access denied")
@@ -121,12 +139,20 @@ async def finalize_loan(
 
 @router.get("/loan/applications/finalizable")
 async def get_finalizable_loans(
-    auth: AuthContext = Depends(get_current_user)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    auth: AuthContext = Depends(get_current_user),
+    service: LoanManagerService = Depends(get_loan_manager_service)
 ):
     if auth.role != Role.LOAN_MANAGER:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    return await service.list_loans_ready_for_finalization()
+    try:
+        return await service.list_loans_ready_for_finalization(
+            limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 # @router.get("/applications/finalizable")
 # async def get_finalizable_loans(
@@ -0,0 +1,86 @@
+import hmac
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from app.auth.dependencies import get_current_user, verify_token, AuthContext
+from app.enums.role import Role
+from app.core.container import Container, get_container
+from app.core.config import settings
+from app.auth.password import password_hasher
+from app.auth.revocation import revocation_list
+from app.db.pool_metrics import pool_metrics
+from app.core.metrics import REGISTRY
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _authorize_scrape(authorization: str):
+    """The configured scrape token, or an admin's bearer token."""
+    if settings.METRICS_SCRAPE_TOKEN:
+        expected = f"Bearer {settings.METRICS_SCRAPE_TOKEN}".encode()
+        if hmac.compare_digest(authorization.encode(), expected):
+            return
+
+    scheme, _, token = authorization.partition(" ")
+    auth = verify_token(token) if scheme.lower() == "bearer" and token else None
+    if auth is None:
+        raise HTTPException(401, headers={"WWW-Authenticate": "Bearer"})
+    if auth.role != Role.ADMIN:
+        raise HTTPException(403)
+
+
+@router.get("", response_class=PlainTextResponse)
+async def prometheus_metrics(request: Request):
+    # Closed unless explicitly opened
+    if not settings.METRICS_PUBLIC:
+        _authorize_scrape(request.headers.get("authorization", ""))
+
+    return PlainTextResponse(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get("/credit-rules")
+async def credit_rule_cache_metrics(
+    auth: AuthContext = Depends(get_current_user),
+    container: Container = Depends(get_container)
+):
+    if auth.role != Role.ADMIN:
+        raise HTTPException(403)
+
+    return container.credit_rule_cache.stats()
+
+
+@router.get("/db-pool")
+async def db_pool_metrics(
+    auth: AuthContext = Depends(get_current_user)
+):
+    if auth.role != Role.ADMIN:
+        raise HTTPException(403)
+
+    return {
+        "max_pool_size": settings.MONGO_MAX_POOL_SIZE,
+        "min_pool_size": settings.MONGO_MIN_POOL_SIZE,
+        "wait_queue_timeout_ms": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "pools": pool_metrics.stats()
+    }
+
+
+@router.get("/password-hashing")
+async def password_hashing_metrics(
+    auth: AuthContext = Depends(get_current_user)
+):
+    if auth.role != Role.ADMIN:
+        raise HTTPException(403)
+
+    return password_hasher.stats()
+
+
+@router.get("/revocations")
+async def revocation_metrics(
+    auth: AuthContext = Depends(get_current_user)
+):
+    if auth.role != Role.ADMIN:
+        raise HTTPException(403)
+
+    return revocation_list.stats()
@@ -3,14 +3,15 @@ from app.auth.dependencies import get_current_user, AuthContext
 from app.enums.role import Role
 from app.services.user_service import UserService
 from app.schemas.user_kyc import UserKYCRequest
+from app.core.container import get_user_service
 
 router = APIRouter(prefix="/users", tags=["Users"])
-service = UserService()
 
 
 @router.get("/me")
 async def get_my_profile(
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: UserService = Depends(get_user_service)
 ):
     # 🔐 Only users can view their own profile
     if auth.role != Role.USER:
@@ -25,7 +26,8 @@ async def get_my_profile(
 @router.post("/me/kyc", status_code=200)
 async def submit_kyc(
     payload: UserKYCRequest,
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: UserService = Depends(get_user_service)
 ):
     if auth.role != Role.USER:
         raise HTTPException(status_code=403, detail="Access denied")
@@ -42,7 +44,8 @@ async def submit_kyc(
 
 @router.get("/me/details")
 async def get_my_full_details(
-    auth: AuthContext = Depends(get_current_user)
+    auth: AuthContext = Depends(get_current_user),
+    service: UserService = Depends(get_user_service)
 ):
     if auth.role != Role.USER:
         raise HTTPException(status_code=403, detail="Access denied")
@@ -0,0 +1,91 @@
+import asyncio
+from datetime import datetime
+import json
+import logging
+import time
+
+from pymongo import UpdateOne
+
+from app.repositories.user_repository import UserRepository
+from app.services.cibil_service import CIBILService
+from app.services.repayment_summary_service import RepaymentSummaryService
+
+logger = logging.getLogger("emi_scheduler")
+
+cibil_service = CIBILService()
+summary_service = RepaymentSummaryService()
+user_repo = UserRepository()
+
+
+async def rescore_portfolio(
+    chunk_size: int = 1000,
+    users: UserRepository | None = None,
+    summaries: RepaymentSummaryService | None = None
+) -> dict:
+    """
+    Full-portfolio CIBIL re-score (e.g. after rule weights change).
+
+    Streams user ids in chunks, loads each chunk's combined repayment
+    summaries in one query, scores the chunk with the vectorized
+    `CIBILService.calculate_batch` and bulk-writes the results.
+    Users without any loan keep their current score.
+
+    The app passes its container's repository and summary service;
+    run as a script, the module-level defaults are used.
+    """
+
+    users = users or user_repo
+    summaries = summaries or summary_service
+
+    now = datetime.utcnow()
+    started = time.perf_counter()
+    report = {"users_scanned": 0, "users_rescored": 0}
+
+    chunk = []
+    cursor = await users.iter_ids(chunk_size)
+    async for user in cursor:
+        chunk.append(user["_id"])
+        if len(chunk) >= chunk_size:
+            await _rescore_chunk(chunk, now, report, users, summaries)
+            chunk = []
+
+    if chunk:
+        await _rescore_chunk(chunk, now, report, users, summaries)
+
+    report["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    logger.info("CIBIL_PORTFOLIO_RESCORED", extra=report)
+    return report
+
+
+async def _rescore_chunk(
+    user_ids: list,
+    now: datetime,
+    report: dict,
+    users: UserRepository,
+    summaries: RepaymentSummaryService
+):
+    report["users_scanned"] += len(user_ids)
+
+    by_user = await summaries.build_user_summaries(user_ids)
+    if not by_user:
+        return
+
+    scored_ids = list(by_user)
+    scores = cibil_service.calculate_batch(
+        [by_user[user_id]["missed_emis"] for user_id in scored_ids],
+        [by_user[user_id]["late_payments"] for user_id in scored_ids],
+        [by_user[user_id]["loan_closed_clean"] for user_id in scored_ids]
+    )
+
+    await users.bulk_write([
+        UpdateOne(
+            {"_id": user_id},
+            {"$set": {"cibil_score": int(score), "cibil_updated_at": now}}
+        )
+        for user_id, score in zip(scored_ids, scores)
+    ])
+    report["users_rescored"] += len(scored_ids)
+
+
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(rescore_portfolio()), indent=2, default=str))
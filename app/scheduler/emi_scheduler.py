@@ -1,148 +1,409 @@
-from datetime import datetime
+import asyncio
+from collections import defaultdict
+from itertools import chain
+from datetime import datetime, timedelta
+import logging
+import time
 import uuid
+import zlib
 
-from app.db.mongodb import db
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.db.mongodb import run_in_transaction
+from app.repositories.account_repository import AccountRepository
+from app.repositories.loan_repository import LoanRepository
+from app.repositories.repayment_repository import CLAIM_FIELDS, RepaymentRepository
+from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.user_repository import UserRepository
 from app.services.cibil_service import CIBILService
 from app.services.repayment_summary_service import RepaymentSummaryService
 
+logger = logging.getLogger("emi_scheduler")
+
+account_repo = AccountRepository()
+loan_repo = LoanRepository()
+repayment_repo = RepaymentRepository()
+transaction_repo = TransactionRepository()
+user_repo = UserRepository()
+
 cibil_service = CIBILService()
-summary_service = RepaymentSummaryService()
+summary_service = RepaymentSummaryService(loan_repo, repayment_repo, transaction_repo)
+
+
+def bind(container):
+    """Use the app container's repositories (called once at startup)."""
+    global account_repo, loan_repo, repayment_repo, transaction_repo, user_repo
+    global summary_service
+    account_repo = container.account_repo
+    loan_repo = container.loan_repo
+    repayment_repo = container.repayment_repo
+    transaction_repo = container.transaction_repo
+    user_repo = container.user_repo
+    summary_service = container.repayment_summary_service
+
 
+class EmiClaimLost(Exception):
+    """Rows of a chunk were re-claimed by another run before settling."""
 
-async def process_due_emis():
+
+async def process_due_emis(
+    batch_size: int | None = None,
+    partitions: int | None = None,
+    max_concurrency: int | None = None,
+    query: dict | None = None,
+    fence: dict | None = None,
+    stop: asyncio.Event | None = None
+) -> dict:
     """
     Auto-debit EMI scheduler
     Runs via APScheduler / cron
-    """
 
-    now = datetime.utcnow()
+    Due EMIs are pulled in pages of `batch_size` (keyset on `_id`) and
+    fanned out to `partitions` workers by a stable hash of `user_id`.
+    Each worker commits its chunks in order with bulk writes, so EMIs of
+    one account are never debited concurrently while different users
+    proceed in parallel; at most `max_concurrency` chunks are in flight
+    and at most `max_concurrency` debits run at once. `query` narrows
+    the due set (e.g. to one shard). Returns a run report with
+    per-partition timings.
 
-    # 🔍 Find all due & unpaid EMIs
-    cursor = db.loan_repayments.find({
-        "due_date": {"$lte": now},
-        "status": {"$in": ["PENDING", "FAILED"]}
-    })
+    A chunk's rows are claimed (PROCESSING) before any money moves and
+    each debit carries the row id, so a run that dies between debiting
+    and writing the statuses is finished by a later run without
+    debiting anyone twice.
 
-    async for emi in cursor:
+    Sharded runs pass their lease as `fence` (claim_lease,
+    claim_generation), stamped on every claimed row, and a `stop` event
+    set when the lease is lost: the run then finishes the chunks in
+    flight and starts no new ones.
+    """
 
-        # 🧱 HARD IDEMPOTENCY GUARD
-        if emi["status"] == "PAID":
-            continue
+    batch_size = batch_size or settings.EMI_BATCH_SIZE
+    partitions = partitions or settings.EMI_PARTITIONS
+    max_concurrency = max_concurrency or settings.EMI_MAX_CONCURRENCY
 
-        # 🔎 Fetch user account
-        account = await db.accounts.find_one({
-            "user_id": emi["user_id"]
-        })
+    now = datetime.utcnow()
+    started = time.perf_counter()
 
-        # =====================================================
-        # ❌ INSUFFICIENT BALANCE
-        # =====================================================
-        if not account or account["balance"] < emi["emi_amount"]:
+    # Rows left PROCESSING by a run that died mid-chunk
+    await repayment_repo.release_stale_claims(
+        now - timedelta(seconds=settings.EMI_CLAIM_TIMEOUT_SECONDS),
+        extra_filter=query,
+        fence=fence
+    )
 
-            await db.loan_repayments.update_one(
-                {"_id": emi["_id"]},
-                {
-                    "$set": {
-                        "status": "FAILED",
-                        "updated_at": now
-                    },
-                    "$inc": {
-                        "attempts": 1
-                    }
-                }
-            )
+    semaphore = asyncio.Semaphore(max_concurrency)
+    debit_slots = asyncio.Semaphore(max_concurrency)
+    queues = [asyncio.Queue(maxsize=2) for _ in range(partitions)]
+    partition_reports = [_new_report(index) for index in range(partitions)]
+    dirty_users = set()
 
-            # 📉 Update loan-level missed EMI count
-            await db.loans.update_one(
-                {"_id": emi["loan_id"]},
-                {
-                    "$inc": {
-                        "missed_emis": 1
-                    }
-                }
+    workers = [
+        asyncio.create_task(
+            _partition_worker(
+                queues[index],
+                semaphore,
+                debit_slots,
+                now,
+                partition_reports[index],
+                dirty_users,
+                fence,
+                stop
             )
+        )
+        for index in range(partitions)
+    ]
 
-            # 📊 Recalculate CIBIL
-            summary = await summary_service.build_summary(
-                emi["loan_id"]
+    pages = 0
+    last_id = None
+    try:
+        while stop is None or not stop.is_set():
+            # 🔍 Next page of due & unpaid EMIs
+            page = await repayment_repo.get_due_emis_page(
+                now,
+                after_id=last_id,
+                limit=batch_size,
+                extra_filter=query
             )
-            new_cibil = cibil_service.calculate(summary)
+            if not page:
+                break
 
-            await db.users.update_one(
-                {"_id": emi["user_id"]},
-                {
-                    "$set": {
-                        "cibil_score": new_cibil,
-                        "cibil_updated_at": now
-                    }
-                }
-            )
+            pages += 1
+            last_id = page[-1]["_id"]
+
+            chunks = defaultdict(list)
+            for emi in page:
+                chunks[partition_of(emi["user_id"], partitions)].append(emi)
+
+            for index, chunk in chunks.items():
+                await queues[index].put(chunk)
+    except BaseException:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        raise
+
+    for queue in queues:
+        await queue.put(None)
+    await asyncio.gather(*workers)
+
+    # 📈 One CIBIL recalculation per affected user, after all debits
+    cibil_updates = await _flush_cibil(dirty_users, now, batch_size)
+
+    elapsed = time.perf_counter() - started
 
+    report = {
+        "processed": sum(part["processed"] for part in partition_reports),
+        "paid": sum(part["paid"] for part in partition_reports),
+        "failed": sum(part["failed"] for part in partition_reports),
+        "batches": sum(part["batches"] for part in partition_reports),
+        "failed_partitions": sum(1 for part in partition_reports if part["error"]),
+        "cibil_updates": cibil_updates,
+        "pages": pages,
+        "partitions": partitions,
+        "max_concurrency": max_concurrency,
+        "stopped": stop is not None and stop.is_set(),
+        "elapsed_seconds": round(elapsed, 3),
+        "emis_per_sec": 0.0,
+        "partition_reports": partition_reports
+    }
+    if elapsed > 0:
+        report["emis_per_sec"] = round(report["processed"] / elapsed, 2)
+
+    logger.info(
+        "EMI_RUN_COMPLETED",
+        extra={key: value for key, value in report.items() if key != "partition_reports"}
+    )
+    for part in partition_reports:
+        logger.info("EMI_PARTITION_COMPLETED", extra=part)
+
+    return report
+
+
+def partition_of(user_id, partitions: int) -> int:
+    """Stable partition index for a user (same on every process/node)."""
+    return zlib.crc32(str(user_id).encode()) % partitions
+
+
+def _new_report(partition: int) -> dict:
+    return {
+        "partition": partition,
+        "processed": 0,
+        "paid": 0,
+        "failed": 0,
+        "batches": 0,
+        "busy_seconds": 0.0,
+        "wait_seconds": 0.0,
+        "error": None
+    }
+
+
+async def _partition_worker(
+    queue: asyncio.Queue,
+    semaphore: asyncio.Semaphore,
+    debit_slots: asyncio.Semaphore,
+    now: datetime,
+    report: dict,
+    dirty_users: set,
+    fence: dict | None,
+    stop: asyncio.Event | None
+):
+    while True:
+        chunk = await queue.get()
+        if chunk is None:
+            break
+
+        # A failed chunk leaves this partition's ordering unknown, so the
+        # rest of its chunks are drained and retried on the next run.
+        # Likewise once told to stop (only at chunk boundaries: a chunk
+        # that has started debiting always settles).
+        if report["error"] or (stop is not None and stop.is_set()):
             continue
 
+        waited = time.perf_counter()
+        async with semaphore:
+            began = time.perf_counter()
+            report["wait_seconds"] += began - waited
+            try:
+                await _process_batch(chunk, now, report, dirty_users, debit_slots, fence)
+            except Exception as exc:
+                logger.exception(
+                    "EMI_PARTITION_FAILED",
+                    extra={"partition": report["partition"]}
+                )
+                report["error"] = repr(exc)
+            report["busy_seconds"] += time.perf_counter() - began
+
+        report["batches"] += 1
+
+    report["busy_seconds"] = round(report["busy_seconds"], 3)
+    report["wait_seconds"] = round(report["wait_seconds"], 3)
+
+
+async def _process_batch(
+    page: list[dict],
+    now: datetime,
+    report: dict,
+    dirty_users: set,
+    debit_slots: asyncio.Semaphore,
+    fence: dict | None = None
+):
+    # 🧱 HARD IDEMPOTENCY GUARD: only rows this chunk claimed are debited
+    claim_id = uuid.uuid4().hex
+    claimed = await repayment_repo.claim(
+        [emi for emi in page if emi["status"] != "PAID"],
+        {"claim_id": claim_id, "claimed_at": datetime.utcnow(), **(fence or {})}
+    )
+
+    emis_by_user = defaultdict(list)
+    for emi in sorted(claimed, key=lambda emi: emi["_id"]):
+        emis_by_user[emi["user_id"]].append(emi)
+
+    # 💳 One conditional debit per EMI: a user's EMIs go in order,
+    # different users in the chunk go concurrently (up to debit_slots)
+    outcomes = await asyncio.gather(*(
+        _debit_in_order(emis, debit_slots) for emis in emis_by_user.values()
+    ))
+
+    repayment_ops = []
+    transactions = []
+    loan_deltas = defaultdict(lambda: defaultdict(int))
+
+    for emi, balance_after in chain.from_iterable(outcomes):
+        report["processed"] += 1
+
         # =====================================================
-        # ✅ SUFFICIENT BALANCE → DEBIT EMI
+        # ❌ INSUFFICIENT BALANCE (or no account)
         # =====================================================
-        new_balance = account["balance"] - emi["emi_amount"]
-
-        # 💳 Debit account
-        await db.accounts.update_one(
-            {"_id": account["_id"]},
-            {
-                "$set": {
-                    "balance": new_balance,
-                    "updated_at": now
+        if balance_after is None:
+            repayment_ops.append(UpdateOne(
+                {"_id": emi["_id"], "claim_id": claim_id},
+                {
+                    "$set": {"status": "FAILED", "updated_at": now},
+                    "$inc": {"attempts": 1},
+                    "$unset": dict.fromkeys(CLAIM_FIELDS, "")
                 }
-            }
-        )
+            ))
+            if emi["claimed_from"] != "FAILED":
+                loan_deltas[emi["loan_id"]]["missed_emis"] += 1
+            report["failed"] += 1
+            continue
 
-        # ✅ Mark EMI as paid
-        await db.loan_repayments.update_one(
-            {"_id": emi["_id"]},
+        # =====================================================
+        # ✅ DEBITED
+        # =====================================================
+        repayment_ops.append(UpdateOne(
+            {"_id": emi["_id"], "claim_id": claim_id},
             {
                 "$set": {
                     "status": "PAID",
                     "paid_at": now,
                     "updated_at": now
-                }
+                },
+                "$unset": dict.fromkeys(CLAIM_FIELDS, "")
             }
-        )
+        ))
 
-        # 🧾 Transaction history
-        await db.loan_transactions.insert_one({
-            "transaction_id": f"TXN-{uuid.uuid4()}",
+        transactions.append({
+            # One per repayment row: a retried settle cannot duplicate it
+            "transaction_id": f"TXN-EMI-{emi['_id']}",
             "loan_id": emi["loan_id"],
             "user_id": emi["user_id"],
             "emi_number": emi["emi_number"],
             "amount": emi["emi_amount"],
             "transaction_type": "EMI",
             "status": "PAID",
-            "balance_after": new_balance,
+            "balance_after": balance_after,
             "created_at": now
         })
 
-        # 📊 Update loan stats
-        await db.loans.update_one(
-            {"_id": emi["loan_id"]},
-            {
-                "$inc": {
-                    "paid_emis": 1
-                }
-            }
-        )
+        loan_deltas[emi["loan_id"]]["paid_emis"] += 1
+        if "principal_component" in emi:
+            loan_deltas[emi["loan_id"]]["outstanding_principal"] -= emi["principal_component"]
+        if emi["claimed_from"] == "FAILED":
+            loan_deltas[emi["loan_id"]]["missed_emis"] -= 1
+        report["paid"] += 1
 
-        # 📈 Recalculate CIBIL after successful EMI
-        summary = await summary_service.build_summary(
-            emi["loan_id"]
+    counter_ops = [
+        UpdateOne({"_id": loan_id}, {"$inc": dict(deltas)})
+        for loan_id, deltas in loan_deltas.items()
+        if any(deltas.values())
+    ]
+    loan_ids = list(loan_deltas)
+
+    async def settle(session):
+        if session is None:
+            # No transactions (standalone mongod): until the counters
+            # below are in, summaries count these loans' rows instead
+            await loan_repo.mark_counters_dirty(loan_ids, claim_id)
+
+        # 🧾 Transaction history (deterministic ids: without a
+        # transaction, a settle retried after a crash skips existing ones)
+        await transaction_repo.create_many(
+            transactions,
+            session=session,
+            skip_existing=session is None
         )
-        new_cibil = cibil_service.calculate(summary)
 
-        await db.users.update_one(
-            {"_id": emi["user_id"]},
-            {
-                "$set": {
-                    "cibil_score": new_cibil,
-                    "cibil_updated_at": now
+        # ✅ Repayment status changes, only while the claim is still ours
+        result = await repayment_repo.bulk_write(repayment_ops, session=session)
+        if result is not None and result.matched_count != len(repayment_ops):
+            # Aborts the transaction; standalone, the loans stay dirty
+            raise EmiClaimLost(
+                f"{len(repayment_ops) - result.matched_count} rows of claim {claim_id} "
+                "were re-claimed before settling"
+            )
+
+        # 📊 Loan repayment counters (state counts, see RepaymentSummaryService)
+        await loan_repo.bulk_write(counter_ops, session=session)
+
+        if session is None:
+            await loan_repo.clear_counters_dirty(loan_ids, [claim_id])
+
+    # Statuses, transactions and counters commit together
+    await run_in_transaction(settle)
+
+    # 📈 CIBIL is recalculated once per user at the end of the run (only
+    # for rows settled here; the rest of the page is another run's)
+    dirty_users.update(
+        emi["user_id"] for emi in claimed if emi["loan_id"] in loan_deltas
+    )
+
+
+async def _flush_cibil(user_ids: set, now: datetime, batch_size: int) -> int:
+    users = list(user_ids)
+    for offset in range(0, len(users), batch_size):
+        chunk = users[offset:offset + batch_size]
+        summaries = await summary_service.build_user_summaries(chunk)
+
+        await user_repo.bulk_write([
+            UpdateOne(
+                {"_id": user_id},
+                {
+                    "$set": {
+                        "cibil_score": cibil_service.calculate(summary),
+                        "cibil_updated_at": now
+                    }
                 }
-            }
-        )
+            )
+            for user_id, summary in summaries.items()
+        ])
+
+    return len(users)
+
+
+async def _debit_in_order(
+    emis: list[dict],
+    debit_slots: asyncio.Semaphore
+) -> list[tuple[dict, float | None]]:
+    results = []
+    for emi in emis:
+        async with debit_slots:
+            balance_after = await account_repo.debit_if_sufficient(
+                emi["user_id"],
+                emi["emi_amount"],
+                reference=emi["_id"]
+            )
+        results.append((emi, balance_after))
+    return results
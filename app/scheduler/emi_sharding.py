@@ -0,0 +1,172 @@
+import asyncio
+from datetime import datetime
+import logging
+import os
+import socket
+
+from app.core.config import settings
+from app.repositories.emi_lease_repository import EmiLeaseRepository
+from app.repositories.repayment_repository import RepaymentRepository
+from app.scheduler.emi_scheduler import process_due_emis
+from app.utils.sharding import shard_filter
+
+logger = logging.getLogger("emi_scheduler")
+
+lease_repo = EmiLeaseRepository()
+repayment_repo = RepaymentRepository()
+
+# Per-run task in `emi_run_leases` ("<run_id>:shard_keys"); shards of
+# the run are only claimed once it is DONE
+SHARD_KEY_BACKFILL = "shard_keys"
+BACKFILL_POLL_SECONDS = 1.0
+
+
+def bind(container):
+    """Use the app container's repositories (called once at startup)."""
+    global lease_repo, repayment_repo
+    lease_repo = container.emi_lease_repo
+    repayment_repo = container.repayment_repo
+
+
+def default_node_id() -> str:
+    return settings.NODE_ID or f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def run_sharded_emis(
+    node_id: str | None = None,
+    shard_count: int | None = None,
+    lease_seconds: int | None = None
+) -> list[dict]:
+    """
+    Sharded EMI run for multi-replica deployments.
+
+    Every node fires this at the same time; each one claims shards of
+    today's run from `emi_run_leases` until none are left, so the due set
+    is split across nodes instead of being processed by all of them.
+    A shard whose owner stops renewing its lease is taken over by the
+    next node that asks for work.
+    """
+
+    node_id = node_id or default_node_id()
+    shard_count = shard_count or settings.EMI_SHARD_COUNT
+    lease_seconds = lease_seconds or settings.EMI_LEASE_SECONDS
+
+    now = datetime.utcnow()
+    run_id = now.strftime("%Y-%m-%d")
+
+    await lease_repo.ensure_shards(run_id, shard_count)
+    await _backfill_shard_keys(run_id, node_id, lease_seconds)
+
+    reports = []
+    while True:
+        lease = await lease_repo.claim_next(run_id, node_id, lease_seconds)
+        if not lease:
+            break
+
+        report = await _run_shard(lease, node_id, lease_seconds)
+        if report is not None:
+            reports.append(report)
+
+    logger.info(
+        "EMI_SHARDED_RUN_COMPLETED",
+        extra={
+            "run_id": run_id,
+            "node_id": node_id,
+            "shards": [report["shard"] for report in reports]
+        }
+    )
+    return reports
+
+
+async def _backfill_shard_keys(run_id: str, node_id: str, lease_seconds: int):
+    """
+    Rows without a `shard_key` (written before sharding, or by anything
+    that still inserts without one) match no shard. Before claiming any
+    shard, every run makes sure they are stamped: one node does it, the
+    others wait for its task to be DONE. If that node dies, its lease
+    expires and a waiting node takes the backfill over.
+    """
+    if not await repayment_repo.has_missing_shard_keys():
+        return
+
+    task_id = f"{run_id}:{SHARD_KEY_BACKFILL}"
+    while True:
+        task = await lease_repo.claim_once(task_id, node_id, lease_seconds)
+        if task:
+            break
+        if await lease_repo.is_done(task_id):
+            return
+        await asyncio.sleep(BACKFILL_POLL_SECONDS)
+
+    # Stamping is idempotent, so a lost lease only means a peer may
+    # redo part of it; there is nothing to stop early for
+    heartbeat = asyncio.create_task(
+        _keep_lease(task_id, node_id, lease_seconds, task["attempts"], asyncio.Event())
+    )
+    try:
+        updated = await repayment_repo.backfill_shard_keys()
+    except Exception:
+        await lease_repo.release(task_id, node_id, task["attempts"])
+        raise
+    finally:
+        heartbeat.cancel()
+
+    await lease_repo.complete(task_id, node_id, task["attempts"], {"updated": updated})
+    logger.info(
+        "EMI_SHARD_KEYS_BACKFILLED",
+        extra={"run_id": run_id, "node_id": node_id, "updated": updated}
+    )
+
+
+async def _run_shard(lease: dict, node_id: str, lease_seconds: int):
+    lease_id = lease["_id"]
+    generation = lease["attempts"]
+    query = shard_filter(lease["shard"], lease["shard_count"])
+
+    lease_lost = asyncio.Event()
+    heartbeat = asyncio.create_task(
+        _keep_lease(lease_id, node_id, lease_seconds, generation, lease_lost)
+    )
+
+    try:
+        report = await process_due_emis(
+            query=query,
+            # Stamped on every row this run claims; a later holder of the
+            # shard releases rows of older generations and they stop
+            # matching this run's status writes
+            fence={"claim_lease": lease_id, "claim_generation": generation},
+            stop=lease_lost
+        )
+    except Exception:
+        await lease_repo.release(lease_id, node_id, generation)
+        raise
+    finally:
+        heartbeat.cancel()
+
+    if lease_lost.is_set():
+        logger.warning(
+            "EMI_SHARD_LEASE_LOST",
+            extra={"lease_id": lease_id, "node_id": node_id}
+        )
+        return None
+
+    report = {"shard": lease["shard"], "attempt": generation, **report}
+    await lease_repo.complete(lease_id, node_id, generation, report)
+    return report
+
+
+async def _keep_lease(
+    lease_id: str,
+    node_id: str,
+    lease_seconds: int,
+    generation: int,
+    lease_lost: asyncio.Event
+):
+    # Renew well before expiry. If another node has taken the shard over,
+    # tell the run to stop at the next chunk boundary; cancelling it
+    # could interrupt a chunk between its debits and its status writes.
+    while True:
+        await asyncio.sleep(lease_seconds / 3)
+        if not await lease_repo.renew(lease_id, node_id, lease_seconds, generation):
+            lease_lost.set()
+            return
@@ -0,0 +1,106 @@
+from datetime import datetime
+import logging
+
+from pymongo import UpdateOne
+
+from app.repositories.loan_repository import COUNTERS_DIRTY, LoanRepository, REPAYMENT_COUNTERS
+from app.repositories.repayment_repository import RepaymentRepository
+from app.repositories.transaction_repository import TransactionRepository
+
+logger = logging.getLogger("emi_scheduler")
+
+loan_repo = LoanRepository()
+repayment_repo = RepaymentRepository()
+transaction_repo = TransactionRepository()
+
+MAX_DRIFT_SAMPLES = 20
+
+
+def bind(container):
+    """Use the app container's repositories (called once at startup)."""
+    global loan_repo, repayment_repo, transaction_repo
+    loan_repo = container.loan_repo
+    repayment_repo = container.repayment_repo
+    transaction_repo = container.transaction_repo
+
+
+async def reconcile_repayment_counters(fix: bool = True, batch_size: int = 500) -> dict:
+    """
+    Recompute every loan's repayment counters from `loan_repayments` and
+    `loan_transactions` via aggregation, report drift against the stored
+    counters and (when `fix`) overwrite the drifted ones.
+    Loans are walked in batches so memory stays flat.
+    """
+
+    report = {
+        "loans_checked": 0,
+        "drifted": 0,
+        "fixed": 0,
+        "samples": []
+    }
+
+    batch = []
+    cursor = await loan_repo.iter_repayment_counters(batch_size)
+    async for loan in cursor:
+        batch.append(loan)
+        if len(batch) >= batch_size:
+            await _reconcile_batch(batch, fix, report)
+            batch = []
+
+    if batch:
+        await _reconcile_batch(batch, fix, report)
+
+    logger.info(
+        "REPAYMENT_COUNTERS_RECONCILED",
+        extra={key: value for key, value in report.items() if key != "samples"}
+    )
+    return report
+
+
+async def _reconcile_batch(loans: list[dict], fix: bool, report: dict):
+    loan_ids = [loan["_id"] for loan in loans]
+    repayment_counts = await repayment_repo.count_by_status(loan_ids)
+    penalty_counts = await transaction_repo.count_paid_penalties(loan_ids)
+
+    operations = []
+    drifted = 0
+    for loan in loans:
+        counts = repayment_counts.get(loan["_id"], {})
+        expected = {
+            "total_emis": counts.get("total_emis", 0),
+            "paid_emis": counts.get("paid_emis", 0),
+            "missed_emis": counts.get("missed_emis", 0),
+            "late_payments": penalty_counts.get(loan["_id"], 0)
+        }
+        stored = {field: loan.get(field) for field in REPAYMENT_COUNTERS}
+        dirty = loan.get(COUNTERS_DIRTY) or []
+
+        report["loans_checked"] += 1
+        if stored == expected:
+            if dirty and fix:
+                # Counters are right after all; trust them again
+                operations.append(UpdateOne(
+                    {"_id": loan["_id"]},
+                    {"$pull": {COUNTERS_DIRTY: {"$in": dirty}}}
+                ))
+            continue
+
+        report["drifted"] += 1
+        if len(report["samples"]) < MAX_DRIFT_SAMPLES:
+            report["samples"].append({
+                "loan_id": str(loan["_id"]),
+                "stored": stored,
+                "expected": expected
+            })
+
+        update = {"$set": {**expected, "counters_reconciled_at": datetime.utcnow()}}
+        if dirty:
+            # Only the markers seen here: a writer that started since
+            # keeps its own until it finishes
+            update["$pull"] = {COUNTERS_DIRTY: {"$in": dirty}}
+        operations.append(UpdateOne({"_id": loan["_id"]}, update))
+        drifted += 1
+
+    if fix and operations:
+        await loan_repo.bulk_write(operations)
+        report["fixed"] += drifted
@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+
+
+class ProfileArmRequest(BaseModel):
+    path_prefix: str = Field(..., min_length=1, examples=["/manager/loan/applications"])
+    count: int = Field(1, ge=1, le=100)
@@ -18,9 +18,14 @@ class UserLoginRequest(BaseModel):
 
 class TokenResponse(BaseModel):
     access_token: str
+    refresh_token: str
     token_type: str = "bearer"
 
 
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
+
 class UserLoginRequest(BaseModel):
     aadhaar: str
     password: Optional[str] = None
@@ -3,8 +3,11 @@ from bson import ObjectId
 from app.repositories.account_repository import AccountRepository
 
 class AccountService:
-    def __init__(self):
-        self.repo = AccountRepository()
+    def __init__(
+        self,
+        repo: AccountRepository | None = None
+    ):
+        self.repo = repo or AccountRepository()
 
     async def deposit(self, user_id: str, amount: float):
         if amount <= 0:
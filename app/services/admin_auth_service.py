@@ -1,11 +1,16 @@
 from app.repositories.admin_repository import AdminRepository
-from app.auth.password import verify_password
-from app.auth.security import create_access_token
+from app.auth.password import verify_password_async
 from app.enums.role import Role
+from app.services.session_service import SessionService
 
 class AdminAuthService:
-    def __init__(self):
-        self.repo = AdminRepository()
+    def __init__(
+        self,
+        repo: AdminRepository | None = None,
+        sessions: SessionService | None = None
+    ):
+        self.repo = repo or AdminRepository()
+        self.sessions = sessions or SessionService()
 
     async def login_admin(self, username: str, password: str):
         # 🔍 DEBUG: incoming username
@@ -24,7 +29,7 @@ class AdminAuthService:
         print("Admin _id:", admin.get("_id"))
         print("Admin status:", admin.get("status"))
 
-        password_match = verify_password(password, admin["password_hash"])
+        password_match = await verify_password_async(password, admin["password_hash"])
         print("Password match result:", password_match)
 
         if admin.get("status") != "ACTIVE":
@@ -40,7 +45,4 @@ class AdminAuthService:
         print("✅ Admin authenticated successfully")
         print("===== ADMIN LOGIN DEBUG END =====\n")
 
-        return create_access_token(
-            subject=str(admin["_id"]),
-            role=Role.ADMIN
-        )
+        return await self.sessions.start(str(admin["_id"]), Role.ADMIN)
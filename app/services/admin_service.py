@@ -1,21 +1,52 @@
 from datetime import datetime
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 from app.utils.mongo_serializers import serialize_mongo_value
-from app.auth.password import hash_password
+from app.auth.password import hash_password_async
 from app.enums.role import Role
 from app.repositories.manager_repository import ManagerRepository
 from app.repositories.user_repository import UserRepository
 from app.repositories.loan_application_repository import LoanApplicationRepository
 from app.repositories.audit_log_repository import AuditLogRepository
+from app.services.session_service import SessionService
 from app.enums.loan import LoanApplicationStatus
+from app.repositories.pagination import DEFAULT_PAGE_SIZE
+from app.repositories.projection import fields
 from app.utils.mongo_serializers import serialize_mongo_value
 
 class AdminService:
-    def __init__(self):
-        self.manager_repo = ManagerRepository()
-        self.user_repo = UserRepository()
-        self.loan_repo = LoanApplicationRepository()
-        self.audit_repo = AuditLogRepository()
+
+    # Fields each oversight list actually renders
+    MANAGER_LIST_FIELDS = fields(
+        "manager_id", "name", "phone", "role", "status", "created_at"
+    )
+    USER_LIST_FIELDS = fields(
+        "name", "phone", "kyc_status", "approval_status", "created_at"
+    )
+    LOAN_LIST_FIELDS = fields(
+        "user_id", "loan_amount", "interest_rate", "emi_amount", "status"
+    )
+    ESCALATED_LIST_FIELDS = fields(
+        "user_id", "loan_amount", "interest_rate", "emi_amount", "status",
+        "system_decision", "escalated_reason", "created_at"
+    )
+
+    # Manager fields that decide what their tokens may do
+    ACCESS_FIELDS = frozenset({"status", "approved_by_admin", "role"})
+
+    def __init__(
+        self,
+        manager_repo: ManagerRepository | None = None,
+        user_repo: UserRepository | None = None,
+        loan_repo: LoanApplicationRepository | None = None,
+        audit_repo: AuditLogRepository | None = None,
+        sessions: SessionService | None = None
+    ):
+        self.manager_repo = manager_repo or ManagerRepository()
+        self.user_repo = user_repo or UserRepository()
+        self.loan_repo = loan_repo or LoanApplicationRepository()
+        self.audit_repo = audit_repo or AuditLogRepository()
+        self.sessions = sessions or SessionService()
 
     # ========================
     # MANAGER MANAGEMENT
@@ -33,19 +64,30 @@ class AdminService:
             "name": payload.name,
             "phone": payload.phone,
             "role": payload.role,
-            "password_hash": hash_password(payload.password),
+            "password_hash": await hash_password_async(payload.password),
             "status": "ACTIVE",
             "approved_by_admin": True,
             "created_at": datetime.utcnow()
         }
 
-        await self.manager_repo.create(manager_doc)
+        try:
+            await self.manager_repo.create(manager_doc)
+        except DuplicateKeyError:
+            raise ValueError("Manager ID already exists")
 
-    async def list_managers(self):
-        cursor = self.manager_repo.collection.find()
+    async def list_managers(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None
+    ):
+        page, next_cursor = await self.manager_repo.list_page(
+            limit=limit,
+            cursor=cursor,
+            projection=self.MANAGER_LIST_FIELDS
+        )
         managers = []
 
-        async for manager in cursor:
+        for manager in page:
             managers.append({
                 "manager_id": manager.get("manager_id"),
                 "name": manager.get("name"),
@@ -55,39 +97,60 @@ class AdminService:
                 "created_at": manager.get("created_at")
             })
 
-        return managers
+        return {"items": managers, "next_cursor": next_cursor}
 
     async def update_manager(self, manager_id: str, payload: dict):
-        result = await self.manager_repo.collection.update_one(
+        manager = await self.manager_repo.collection.find_one_and_update(
             {"manager_id": manager_id},
-            {"$set": payload}
+            {"$set": payload},
+            projection={"_id": 1}
         )
-        if result.matched_count == 0:
+        if not manager:
             raise ValueError("Manager not found")
 
+        # Access is granted per status, approval and role: changing any
+        # of them signs the manager out, as disable_manager does
+        if self.ACCESS_FIELDS.intersection(payload):
+            await self.sessions.revoke_subject(str(manager["_id"]), "manager_updated")
+
     async def disable_manager(self, manager_id: str):
-        result = await self.manager_repo.collection.update_one(
+        manager = await self.manager_repo.collection.find_one_and_update(
             {"manager_id": manager_id},
-            {"$set": {"status": "DISABLED", "updated_at": datetime.utcnow()}}
+            {"$set": {"status": "DISABLED", "updated_at": datetime.utcnow()}},
+            projection={"_id": 1}
         )
-        if result.matched_count == 0:
+        if not manager:
             raise ValueError("Manager not found")
 
+        # Tokens and sessions already issued stay valid otherwise
+        await self.sessions.revoke_subject(str(manager["_id"]), "manager_disabled")
+
     async def delete_manager(self, manager_id: str):
-        result = await self.manager_repo.collection.delete_one(
-            {"manager_id": manager_id}
+        manager = await self.manager_repo.collection.find_one_and_delete(
+            {"manager_id": manager_id},
+            projection={"_id": 1}
         )
-        if result.deleted_count == 0:
+        if not manager:
             raise ValueError("Manager not found")
 
+        await self.sessions.revoke_subject(str(manager["_id"]), "manager_deleted")
+
     # ========================
     # USER OVERSIGHT
     # ========================
-    async def list_users(self):
-        cursor = self.user_repo.collection.find()
+    async def list_users(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None
+    ):
+        page, next_cursor = await self.user_repo.list_page(
+            limit=limit,
+            cursor=cursor,
+            projection=self.USER_LIST_FIELDS
+        )
         users = []
 
-        async for user in cursor:
+        for user in page:
             users.append({
                 "user_id": str(user["_id"]),
                 "name": user.get("name"),
@@ -97,7 +160,7 @@ class AdminService:
                 "created_at": user.get("created_at")
             })
 
-        return users
+        return {"items": users, "next_cursor": next_cursor}
 
     async def request_user_deletion(self, user_id: str, admin_id: str):
         result = await self.user_repo.collection.update_one(
@@ -120,11 +183,20 @@ class AdminService:
     # ========================
     # LOAN OVERSIGHT
     # ========================
-    async def list_all_loans(self):
-        cursor = self.loan_repo.collection.find({})
+    async def list_all_loans(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None
+    ):
+        page, next_cursor = await self.loan_repo.list_page(
+            {},
+            limit=limit,
+            cursor=cursor,
+            projection=self.LOAN_LIST_FIELDS
+        )
         result = []
 
-        async for loan in cursor:
+        for loan in page:
             result.append({
                 "loan_id": str(loan["_id"]),
                 "user_id": str(loan["user_id"]),
@@ -134,7 +206,7 @@ class AdminService:
                 "status": loan.get("status")
             })
 
-        return result
+        return {"items": result, "next_cursor": next_cursor}
 
 
     async def get_escalated_loans(self):
@@ -225,14 +297,21 @@ class AdminService:
 
         return {"message": f"Loan {decision.lower()}ed by admin"}
 
-    async def list_escalated_loans(self):
-        cursor = self.loan_repo.collection.find({
-            "status": "ESCALATED"
-        })
+    async def list_escalated_loans(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None
+    ):
+        page, next_cursor = await self.loan_repo.list_page(
+            {"status": "ESCALATED"},
+            limit=limit,
+            cursor=cursor,
+            projection=self.ESCALATED_LIST_FIELDS
+        )
 
         response = []
 
-        async for loan in cursor:
+        for loan in page:
             response.append({
                 "loan_id": str(loan["_id"]),
                 "user_id": str(loan["user_id"]),
@@ -260,4 +339,4 @@ class AdminService:
                 )
             })
 
-        return response
\ No newline at end of file
+        return {"items": response, "next_cursor": next_cursor}
\ No newline at end of file
@@ -0,0 +1,91 @@
+from functools import lru_cache
+
+import numpy as np
+
+from app.services.loan_application_service import calculate_emi
+
+
+class AmortizationSchedule:
+    """
+    Full repayment schedule of a fixed-rate loan.
+
+    Every array has one entry per installment; amounts are rounded to
+    paise and chained, so `closing[i] == opening[i + 1]`. The last
+    installment absorbs the rounding residue and closes at exactly zero.
+    Instances are shared through the memo, so the arrays are read-only.
+    """
+
+    __slots__ = (
+        "principal",
+        "annual_rate",
+        "tenure_months",
+        "emi",
+        "emi_amounts",
+        "opening",
+        "interest",
+        "principal_paid",
+        "closing"
+    )
+
+    def __init__(self, principal: float, annual_rate: float, tenure_months: int):
+        if tenure_months <= 0:
+            raise ValueError("Tenure must be at least one month")
+
+        self.principal = principal
+        self.annual_rate = annual_rate
+        self.tenure_months = tenure_months
+
+        r = annual_rate / (12 * 100)
+        self.emi = (
+            calculate_emi(principal, annual_rate, tenure_months)
+            if r > 0
+            else round(principal / tenure_months, 2)
+        )
+
+        # Exact opening balance of every installment (closed form)
+        k = np.arange(tenure_months, dtype=np.float64)
+        if r > 0:
+            growth = (1 + r) ** k
+            exact_opening = principal * growth - self.emi * (growth - 1) / r
+        else:
+            exact_opening = principal - self.emi * k
+
+        interest = np.round(exact_opening * r, 2)
+        principal_paid = np.round(self.emi - interest, 2)
+
+        closing = np.round(principal - np.cumsum(principal_paid), 2)
+        opening = np.concatenate(([round(principal, 2)], closing[:-1]))
+
+        # Final installment settles whatever is left
+        principal_paid[-1] = opening[-1]
+        closing[-1] = 0.0
+        emi_amounts = np.full(tenure_months, self.emi)
+        emi_amounts[-1] = round(interest[-1] + principal_paid[-1], 2)
+
+        for array in (emi_amounts, opening, interest, principal_paid, closing):
+            array.flags.writeable = False
+
+        self.emi_amounts = emi_amounts
+        self.opening = opening
+        self.interest = interest
+        self.principal_paid = principal_paid
+        self.closing = closing
+
+    def installment(self, index: int) -> dict:
+        """Split of installment `index` (0-based) as repayment row fields."""
+        return {
+            "emi_amount": float(self.emi_amounts[index]),
+            "opening_balance": float(self.opening[index]),
+            "interest_component": float(self.interest[index]),
+            "principal_component": float(self.principal_paid[index]),
+            "closing_balance": float(self.closing[index])
+        }
+
+
+@lru_cache(maxsize=512)
+def amortization_schedule(
+    principal: float,
+    annual_rate: float,
+    tenure_months: int
+) -> AmortizationSchedule:
+    return AmortizationSchedule(float(principal), float(annual_rate), int(tenure_months))
@@ -5,15 +5,37 @@ from app.enums.user import KYCStatus, UserApprovalStatus
 from app.schemas.user_decision import UserDecision
 from app.repositories.loan_application_repository import LoanApplicationRepository
 from app.schemas.user_delete import DeleteDecision
+from app.repositories.pagination import DEFAULT_PAGE_SIZE
+from app.repositories.projection import fields
+from app.services.session_service import SessionService
 
 
 
 
 class BankManagerService:
-    def __init__(self):
-        self.user_repo = UserRepository()
-        self.loan_repo = LoanApplicationRepository()
-        self.audit_repo = AuditLogRepository()
+
+    # Fields the review screens render (never password / PIN hashes)
+    LIST_FIELDS = fields(
+        "name", "phone", "kyc_status", "approval_status", "is_minor",
+        "aadhaar", "created_at"
+    )
+    DETAIL_FIELDS = fields(
+        "name", "phone", "kyc_status", "approval_status", "is_minor",
+        "aadhaar", "pan", "dob", "gender", "occupation", "address",
+        "approved_by_manager_id", "created_at", "updated_at"
+    )
+
+    def __init__(
+        self,
+        user_repo: UserRepository | None = None,
+        loan_repo: LoanApplicationRepository | None = None,
+        audit_repo: AuditLogRepository | None = None,
+        sessions: SessionService | None = None
+    ):
+        self.user_repo = user_repo or UserRepository()
+        self.loan_repo = loan_repo or LoanApplicationRepository()
+        self.audit_repo = audit_repo or AuditLogRepository()
+        self.sessions = sessions or SessionService()
 
     async def decide_user(
         self,
@@ -57,14 +79,23 @@ class BankManagerService:
             "remarks": reason,
             "timestamp": datetime.utcnow()
         })
-    async def list_users(self, approval_status=None, kyc_status=None):
-        users_cursor = await self.user_repo.list_users(
+    async def list_users(
+        self,
+        approval_status=None,
+        kyc_status=None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None
+    ):
+        page, next_cursor = await self.user_repo.list_page(
             approval_status=approval_status,
-            kyc_status=kyc_status
+            kyc_status=kyc_status,
+            limit=limit,
+            cursor=cursor,
+            projection=self.LIST_FIELDS
         )
 
         users = []
-        async for user in users_cursor:
+        for user in page:
             users.append({
                 "user_id": str(user["_id"]),
                 "name": user["name"],
@@ -77,10 +108,10 @@ class BankManagerService:
                 "created_at": user["created_at"].isoformat()
             })
 
-        return users
+        return {"items": users, "next_cursor": next_cursor}
     
     async def get_user_details(self, user_id: str):
-        user = await self.user_repo.find_by_id(user_id)
+        user = await self.user_repo.find_by_id(user_id, self.DETAIL_FIELDS)
         if not user:
             raise ValueError("User not found")
 
@@ -124,6 +155,7 @@ class BankManagerService:
             user_id=user_id,
             deleted_by=manager_id
         )
+        await self.sessions.revoke_subject(user_id, "user_deleted")
 
         await self.audit_repo.create({
             "actor_id": manager_id,
@@ -134,7 +166,7 @@ class BankManagerService:
             "remarks": reason
         })
     async def get_user_kyc_details(self, user_id: str):
-        user = await self.user_repo.find_by_id(user_id)
+        user = await self.user_repo.find_by_id(user_id, self.DETAIL_FIELDS)
 
         if not user:
             raise ValueError("User not found")
@@ -189,6 +221,7 @@ class BankManagerService:
                 user_id=user_id,
                 deleted_by=manager_id
             )
+            await self.sessions.revoke_subject(user_id, "user_deleted")
 
             await self.user_repo.collection.update_one(
                 {"_id": user["_id"]},
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class CIBILService:
 
     def calculate(self, repayment_summary: dict) -> int:
@@ -15,3 +18,25 @@ class CIBILService:
             score += 30
 
         return max(300, min(score, 900))
+
+    def calculate_batch(
+        self,
+        missed_emis,
+        late_payments,
+        loan_closed_clean
+    ) -> np.ndarray:
+        """
+        Columnar version of `calculate`: one score per row of the input
+        arrays, computed in a single vectorized pass. Results are
+        identical to calling `calculate` per summary.
+        """
+        missed = np.asarray(missed_emis, dtype=np.int64)
+        late = np.asarray(late_payments, dtype=np.int64)
+        clean = np.asarray(loan_closed_clean, dtype=bool)
+
+        score = np.full(missed.shape, 700, dtype=np.int64)
+        score += np.where(missed == 0, 50, -30 * missed)
+        score -= np.where(late > 2, 40, 0)
+        score += np.where(clean, 30, 0)
+
+        return np.clip(score, 300, 900)
@@ -1,18 +1,163 @@
+import asyncio
+from bisect import bisect_right
+import logging
+import time
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.core.config import settings
 from app.enums.loan import SystemDecision
 from app.repositories.rule_configuration_repository import (
     RuleConfigurationRepository
 )
 
+logger = logging.getLogger("credit_rules")
+
+
+class CompiledRuleTable:
+    """
+    Active CIBIL rules flattened into disjoint score intervals.
+
+    Rules may overlap; the winner for every interval is resolved once at
+    compile time with the same precedence as the rule list (highest
+    `min_score` first), so a lookup is a single bisect.
+    """
+
+    def __init__(self, rules: list[dict]):
+        points = sorted(
+            {rule["min_score"] for rule in rules}
+            | {rule["max_score"] + 1 for rule in rules}
+        )
+
+        self.starts = []
+        self.decisions = []
+        for point in points:
+            decision = None
+            for rule in rules:
+                if rule["min_score"] <= point <= rule["max_score"]:
+                    decision = SystemDecision(rule["decision"])
+                    break
+            self.starts.append(point)
+            self.decisions.append(decision)
+
+        self.rule_count = len(rules)
+
+    def lookup(self, cibil_score: int) -> SystemDecision | None:
+        index = bisect_right(self.starts, cibil_score) - 1
+        if index < 0:
+            return None
+        return self.decisions[index]
+
+
+class CreditRuleCache:
+    """
+    In-process cache of the compiled rule table.
+
+    While a change stream on `rule_configurations` is open the table is
+    only reloaded after a change; otherwise (standalone mongod, stream
+    error) it expires after `CREDIT_RULE_CACHE_TTL_SECONDS`.
+    """
+
+    def __init__(self, repo: RuleConfigurationRepository | None = None):
+        self.repo = repo or RuleConfigurationRepository()
+        self.ttl_seconds = settings.CREDIT_RULE_CACHE_TTL_SECONDS
+
+        self._table: CompiledRuleTable | None = None
+        self._loaded_at = 0.0
+        # Bumped by invalidate(); a load only stores its table if no
+        # invalidation happened while it was reading
+        self._generation = 0
+        self._lock = asyncio.Lock()
+        self.watching = False
+
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.invalidations = 0
+
+    def _is_fresh(self) -> bool:
+        if self._table is None:
+            return False
+        if self.watching:
+            return True
+        return time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    async def get_table(self) -> CompiledRuleTable:
+        if self._is_fresh():
+            self.hits += 1
+            return self._table
+
+        self.misses += 1
+        async with self._lock:
+            while not self._is_fresh():
+                generation = self._generation
+                rules = await self.repo.get_active_cibil_rules()
+                table = CompiledRuleTable(rules)
+                self.reloads += 1
+                if generation != self._generation:
+                    # Invalidated mid-load: these rules may predate the
+                    # change, so load again
+                    continue
+                self._table = table
+                self._loaded_at = time.monotonic()
+            return self._table
+
+    def invalidate(self):
+        self._table = None
+        self._generation += 1
+        self.invalidations += 1
+
+    async def watch(self):
+        """Invalidate on every change to `rule_configurations`."""
+        while True:
+            try:
+                async with self.repo.collection.watch() as stream:
+                    self.watching = True
+                    # Changes made before the stream opened
+                    self.invalidate()
+                    async for _ in stream:
+                        self.invalidate()
+            except OperationFailure as exc:
+                self.watching = False
+                logger.info(
+                    "CREDIT_RULE_CHANGE_STREAM_UNAVAILABLE",
+                    extra={"error": str(exc)}
+                )
+                return
+            except PyMongoError as exc:
+                self.watching = False
+                logger.warning(
+                    "CREDIT_RULE_CHANGE_STREAM_ERROR",
+                    extra={"error": str(exc)}
+                )
+                await asyncio.sleep(5)
+            finally:
+                self.watching = False
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "reloads": self.reloads,
+            "invalidations": self.invalidations,
+            "watching": self.watching,
+            "rules": self._table.rule_count if self._table else 0
+        }
+
+
 class CreditRuleService:
-    def __init__(self):
-        self.repo = RuleConfigurationRepository()
+    def __init__(self, cache: CreditRuleCache | None = None):
+        # The container passes its shared cache (the one watch() keeps
+        # fresh); a standalone service gets its own
+        self.cache = cache or CreditRuleCache()
 
     async def evaluate_cibil(self, cibil_score: int) -> SystemDecision:
-        rules = await self.repo.get_active_cibil_rules()
-
-        for rule in rules:
-            if rule["min_score"] <= cibil_score <= rule["max_score"]:
-                return SystemDecision(rule["decision"])
+        table = await self.cache.get_table()
+        decision = table.lookup(cibil_score)
+        if decision is not None:
+            return decision
 
         # Safety fallback (should never happen)
         return SystemDecision.AUTO_REJECTED
@@ -0,0 +1,197 @@
+import csv
+from datetime import datetime
+import io
+import json
+import logging
+
+from app.core.config import settings
+from app.enums.export import ExportDataset, ExportFormat
+from app.repositories.audit_log_repository import AuditLogRepository
+from app.repositories.loan_application_repository import LoanApplicationRepository
+from app.repositories.projection import fields
+from app.repositories.streaming import stream
+from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.user_repository import UserRepository
+from app.utils.mongo_serializers import serialize_mongo_value
+
+logger = logging.getLogger("exports")
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv"
+}
+
+
+class ExportSpec:
+    """
+    What one dataset exports: the collection, the date field the range
+    filter applies to (and the export is ordered and resumed on), and the
+    output columns (stored field per column).
+    Only these fields are fetched, so hashes and raw KYC never leave the
+    database. Exports read from the reporting (secondary) handle.
+    """
+
+    def __init__(self, collection, date_field: str, columns: dict[str, str]):
+        self.collection = collection
+        self.date_field = date_field
+        self.columns = columns
+        self.projection = fields(*columns.values())
+
+
+class ExportService:
+
+    def __init__(
+        self,
+        loan_app_repo: LoanApplicationRepository | None = None,
+        user_repo: UserRepository | None = None,
+        transaction_repo: TransactionRepository | None = None,
+        audit_repo: AuditLogRepository | None = None
+    ):
+        loan_app_repo = loan_app_repo or LoanApplicationRepository()
+        user_repo = user_repo or UserRepository()
+        transaction_repo = transaction_repo or TransactionRepository()
+        audit_repo = audit_repo or AuditLogRepository()
+
+        self.specs = {
+            ExportDataset.LOAN_APPLICATIONS: ExportSpec(
+                loan_app_repo.reporting,
+                "applied_at",
+                {
+                    "loan_id": "_id",
+                    "user_id": "user_id",
+                    "loan_type": "loan_type",
+                    "loan_amount": "loan_amount",
+                    "tenure_months": "tenure_months",
+                    "interest_rate": "interest_rate",
+                    "emi_preview": "emi_preview",
+                    "cibil_score": "cibil_score",
+                    "system_decision": "system_decision",
+                    "status": "status",
+                    "escalated": "escalated",
+                    "applied_at": "applied_at",
+                    "finalized_at": "finalized_at"
+                }
+            ),
+            ExportDataset.USERS: ExportSpec(
+                user_repo.reporting,
+                "created_at",
+                {
+                    "user_id": "_id",
+                    "name": "name",
+                    "phone": "phone",
+                    "kyc_status": "kyc_status",
+                    "approval_status": "approval_status",
+                    "is_minor": "is_minor",
+                    "cibil_score": "cibil_score",
+                    "created_at": "created_at",
+                    "updated_at": "updated_at"
+                }
+            ),
+            ExportDataset.TRANSACTIONS: ExportSpec(
+                transaction_repo.reporting,
+                "created_at",
+                {
+                    "transaction_id": "transaction_id",
+                    "loan_id": "loan_id",
+                    "user_id": "user_id",
+                    "emi_number": "emi_number",
+                    "transaction_type": "transaction_type",
+                    "amount": "amount",
+                    "status": "status",
+                    "balance_after": "balance_after",
+                    "created_at": "created_at"
+                }
+            ),
+            ExportDataset.AUDIT_LOGS: ExportSpec(
+                audit_repo.reporting,
+                "timestamp",
+                {
+                    "log_id": "_id",
+                    "actor_id": "actor_id",
+                    "actor_role": "actor_role",
+                    "action": "action",
+                    "entity_type": "entity_type",
+                    "entity_id": "entity_id",
+                    "remarks": "remarks",
+                    "timestamp": "timestamp"
+                }
+            )
+        }
+
+    def export(
+        self,
+        dataset: ExportDataset,
+        export_format: ExportFormat,
+        start: datetime | None = None,
+        end: datetime | None = None
+    ):
+        """
+        Text chunks of one export, as an async generator.
+
+        Validation happens here, before the response starts, so a bad
+        range is still a 400; after that the generator holds at most one
+        cursor batch in memory whatever the size of the result.
+        """
+        if start and end and start >= end:
+            raise ValueError("'from' must be earlier than 'to'")
+
+        spec = self.specs[dataset]
+
+        query = {}
+        if start or end:
+            query[spec.date_field] = {}
+            if start:
+                query[spec.date_field]["$gte"] = start
+            if end:
+                query[spec.date_field]["$lt"] = end
+
+        logger.info(
+            "EXPORT_STARTED",
+            extra={
+                "dataset": dataset.value,
+                "format": export_format.value,
+                "from": start.isoformat() if start else None,
+                "to": end.isoformat() if end else None
+            }
+        )
+
+        if export_format == ExportFormat.CSV:
+            return self._csv_chunks(spec, query)
+        return self._ndjson_chunks(spec, query)
+
+    def _row(self, spec: ExportSpec, doc: dict) -> dict:
+        return {
+            column: serialize_mongo_value(doc.get(field))
+            for column, field in spec.columns.items()
+        }
+
+    async def _ndjson_chunks(self, spec: ExportSpec, query: dict):
+        batch_size = settings.EXPORT_BATCH_SIZE
+        lines = []
+
+        async for doc in stream(spec.collection, query, spec.date_field, spec.projection, batch_size):
+            lines.append(json.dumps(self._row(spec, doc), default=str))
+            if len(lines) >= batch_size:
+                yield "\n".join(lines) + "\n"
+                lines = []
+
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    async def _csv_chunks(self, spec: ExportSpec, query: dict):
+        batch_size = settings.EXPORT_BATCH_SIZE
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(spec.columns))
+        writer.writeheader()
+        rows = 0
+
+        async for doc in stream(spec.collection, query, spec.date_field, spec.projection, batch_size):
+            writer.writerow(self._row(spec, doc))
+            rows += 1
+            if rows >= batch_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                rows = 0
+
+        yield buffer.getvalue()
@@ -1,9 +1,11 @@
 from datetime import datetime
 from bson import Decimal128
+from pymongo.errors import DuplicateKeyError
 import logging
 
 from app.repositories.loan_application_repository import LoanApplicationRepository
 from app.repositories.user_repository import UserRepository
+from app.repositories.projection import fields
 from app.enums.loan import LoanApplicationStatus
 from app.enums.user import KYCStatus, UserApprovalStatus
 from app.services.credit_rule_service import CreditRuleService
@@ -50,10 +52,27 @@ def calculate_emi(amount: float, rate: float, tenure: int) -> float:
 # LOAN APPLICATION SERVICE
 # ===============================
 class LoanApplicationService:
-    def __init__(self):
-        self.repo = LoanApplicationRepository()
-        self.user_repo = UserRepository()
-        self.rule_service = CreditRuleService()
+
+    # Fields the applicant-facing reads return
+    APPLICATION_FIELDS = fields(
+        "user_id", "loan_type", "loan_amount", "tenure_months", "reason",
+        "income_slip_url", "cibil_score", "system_decision", "status",
+        "interest_rate", "emi_preview", "applied_at"
+    )
+    DECISION_FIELDS = fields(
+        "user_id", "system_decision", "status", "decision_reason",
+        "decided_at"
+    )
+
+    def __init__(
+        self,
+        repo: LoanApplicationRepository | None = None,
+        user_repo: UserRepository | None = None,
+        rule_service: CreditRuleService | None = None
+    ):
+        self.repo = repo or LoanApplicationRepository()
+        self.user_repo = user_repo or UserRepository()
+        self.rule_service = rule_service or CreditRuleService()
 
     # ----------------------------------
     # CREATE LOAN APPLICATION
@@ -113,7 +132,12 @@ class LoanApplicationService:
             "idempotency_key": idempotency_key
         }
 
-        loan_id = await self.repo.create(loan_doc)
+        try:
+            loan_id = await self.repo.create(loan_doc)
+        except DuplicateKeyError:
+            # Concurrent retry with the same key won the insert
+            existing = await self.repo.find_by_idempotency_key(idempotency_key)
+            return str(existing["_id"]), True
 
         logger.info(
             "LOAN_APPLICATION_CREATED",
@@ -130,7 +154,7 @@ class LoanApplicationService:
     # GET LOAN APPLICATION (JSON SAFE)
     # ----------------------------------
     async def get_loan_application(self, loan_id: str):
-        loan = await self.repo.find_by_id(loan_id)
+        loan = await self.repo.find_by_id(loan_id, self.APPLICATION_FIELDS)
         if not loan:
             raise ValueError("Loan application not found")
 
@@ -170,7 +194,7 @@ class LoanApplicationService:
     # GET LOAN DECISION (READ ONLY)
     # ----------------------------------
     async def get_loan_decision(self, loan_id: str):
-        loan = await self.repo.find_by_id(loan_id)
+        loan = await self.repo.find_by_id(loan_id, self.DECISION_FIELDS)
         if not loan:
             raise ValueError("Loan application not found")
 
@@ -1,24 +1,58 @@
 from datetime import datetime, timedelta
+import logging
+import time
 from bson import ObjectId
-from app.db.mongodb import db
+from app.db.mongodb import run_in_transaction
 from app.repositories.loan_application_repository import LoanApplicationRepository
 from app.repositories.loan_repository import LoanRepository
+from app.repositories.repayment_repository import RepaymentRepository
 from app.repositories.audit_log_repository import AuditLogRepository
 from app.repositories.user_repository import UserRepository
+from app.repositories.pagination import DEFAULT_PAGE_SIZE
+from app.repositories.projection import fields
 from app.services.cibil_service import CIBILService
-from app.services.loan_application_service import calculate_emi
+from app.services.amortization import amortization_schedule
 from app.enums.loan import LoanApplicationStatus, SystemDecision
 from app.schemas.loan_decision import LoanDecision
+from app.utils.sharding import shard_key
+
+logger = logging.getLogger("loan_servicing")
 
 
 class LoanManagerService:
 
-    def __init__(self):
-        self.loan_app_repo = LoanApplicationRepository()
-        self.loan_repo = LoanRepository()  # ACTIVE LOANS
-        self.audit_repo = AuditLogRepository()
-        self.user_repo = UserRepository()
-        self.cibil_service = CIBILService()
+    # Fields each dashboard list actually renders
+    LIST_FIELDS = fields(
+        "user_id", "loan_amount", "system_decision", "status",
+        "escalated", "created_at"
+    )
+    FINALIZATION_LIST_FIELDS = fields(
+        "user_id", "loan_amount", "system_decision", "admin_decision",
+        "admin_decision_reason", "status"
+    )
+    ESCALATED_LIST_FIELDS = fields(
+        "user_id", "loan_amount", "system_decision", "escalated_reason",
+        "escalated_at", "status"
+    )
+    FINALIZED_LIST_FIELDS = fields(
+        "user_id", "loan_amount", "finalized_at", "finalized_by"
+    )
+
+    def __init__(
+        self,
+        loan_app_repo: LoanApplicationRepository | None = None,
+        loan_repo: LoanRepository | None = None,
+        repayment_repo: RepaymentRepository | None = None,
+        audit_repo: AuditLogRepository | None = None,
+        user_repo: UserRepository | None = None,
+        cibil_service: CIBILService | None = None
+    ):
+        self.loan_app_repo = loan_app_repo or LoanApplicationRepository()
+        self.loan_repo = loan_repo or LoanRepository()  # ACTIVE LOANS
+        self.repayment_repo = repayment_repo or RepaymentRepository()
+        self.audit_repo = audit_repo or AuditLogRepository()
+        self.user_repo = user_repo or UserRepository()
+        self.cibil_service = cibil_service or CIBILService()
     
     
     async def decide_loan(
@@ -133,15 +167,25 @@ class LoanManagerService:
         # =====================================================
     # LIST ALL LOAN APPLICATIONS (LOAN MANAGER DASHBOARD)
     # =====================================================
-    async def list_loans(self, system_decision=None):
+    async def list_loans(
+        self,
+        system_decision=None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None
+    ):
         query = {}
         if system_decision:
             query["system_decision"] = system_decision
 
-        cursor = self.loan_app_repo.collection.find(query)
+        loans, next_cursor = await self.loan_app_repo.list_page(
+            query,
+            limit=limit,
+            cursor=cursor,
+            projection=self.LIST_FIELDS
+        )
 
         result = []
-        async for loan in cursor:
+        for loan in loans:
             result.append({
                 "loan_id": str(loan["_id"]),
                 "user_id": str(loan["user_id"]),
@@ -152,19 +196,26 @@ class LoanManagerService:
                 "created_at": loan.get("created_at")
             })
 
-        return result
+        return {"items": result, "next_cursor": next_cursor}
 
 
     # =====================================================
     # LIST LOANS READY FOR FINALIZATION (ADMIN_APPROVED)
     # =====================================================
-    async def list_loans_ready_for_finalization(self):
-        cursor = self.loan_app_repo.collection.find({
-            "status": LoanApplicationStatus.ADMIN_APPROVED
-        })
+    async def list_loans_ready_for_finalization(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None
+    ):
+        loans, next_cursor = await self.loan_app_repo.list_page(
+            {"status": LoanApplicationStatus.ADMIN_APPROVED},
+            limit=limit,
+            cursor=cursor,
+            projection=self.FINALIZATION_LIST_FIELDS
+        )
 
         result = []
-        async for loan in cursor:
+        for loan in loans:
             result.append({
                 "loan_id": str(loan["_id"]),
                 "user_id": str(loan["user_id"]),
@@ -175,7 +226,7 @@ class LoanManagerService:
                 "status": loan["status"]
             })
 
-        return result
+        return {"items": result, "next_cursor": next_cursor}
 
     # =====================================================
     # FINALIZE LOAN (AFTER ADMIN APPROVAL)
@@ -187,6 +238,7 @@ class LoanManagerService:
         tenure_months: int,
         manager_id: str
     ):
+        started = time.perf_counter()
         loan_app = await self.loan_app_repo.find_by_id(loan_id)
 
         if not loan_app:
@@ -198,14 +250,20 @@ class LoanManagerService:
         # Convert Decimal128 → float
         principal = float(loan_app["loan_amount"].to_decimal())
 
-        emi_amount = calculate_emi(
+        # Full principal / interest split (memoized per loan terms)
+        amortization = amortization_schedule(
             principal,
-            tenure_months,
-            interest_rate
+            interest_rate,
+            tenure_months
         )
+        emi_amount = amortization.emi
 
-        # 1️⃣ Create ACTIVE LOAN
-        active_loan_id = await self.loan_repo.create({
+        now = datetime.utcnow()
+        active_loan_id = ObjectId()
+
+        # 1️⃣ ACTIVE LOAN
+        loan_doc = {
+            "_id": active_loan_id,
             "loan_application_id": loan_app["_id"],
             "user_id": loan_app["user_id"],
             "loan_amount": loan_app["loan_amount"],
@@ -213,39 +271,68 @@ class LoanManagerService:
             "tenure_months": tenure_months,
             "emi_amount": emi_amount,
             "status": "ACTIVE",
-            "created_at": datetime.utcnow()
-        })
 
-        # 2️⃣ Generate EMI schedule
-        # ===============================
-# EMI SCHEDULE GENERATION
-# ===============================
-        due_date = datetime.utcnow()   # ✅ datetime, not date
+            # Repayment counters (maintained by the EMI scheduler)
+            "total_emis": tenure_months,
+            "paid_emis": 0,
+            "missed_emis": 0,
+            "late_payments": 0,
+            "outstanding_principal": principal,
 
+            "created_at": now
+        }
+
+        # 2️⃣ EMI SCHEDULE (built in memory, written with insert_many)
+        schedule = []
+        due_date = now   # ✅ datetime, not date
+        user_shard_key = shard_key(loan_app["user_id"])
         for i in range(1, tenure_months + 1):
             due_date += timedelta(days=30)
-
-            await db.loan_repayments.insert_one({
+            schedule.append({
                 "loan_id": active_loan_id,
                 "user_id": loan_app["user_id"],
                 "emi_number": i,
-                "emi_amount": emi_amount,
+                **amortization.installment(i - 1),
                 "due_date": due_date,            # ✅ datetime.datetime
                 "status": "PENDING",
                 "attempts": 0,
-                "created_at": datetime.utcnow()
+                "shard_key": user_shard_key,
+                "created_at": now
             })
 
+        # 3️⃣ LOAN APPLICATION (LOCK IT)
+        application_update = {
+            "status": LoanApplicationStatus.FINALIZED,
+            "finalized_by": manager_id,
+            "finalized_at": now
+        }
 
-        # 3️⃣ Update LOAN APPLICATION (LOCK IT)
-        await self.loan_app_repo.update_by_id(
-            loan_id,
-            {
-                "status": LoanApplicationStatus.FINALIZED,
-                "finalized_by": manager_id,
-                "finalized_at": datetime.utcnow()
-            }
-        )
+        async def persist(session):
+            try:
+                await self.loan_repo.create(loan_doc, session=session)
+                await self.repayment_repo.create_many(schedule, session=session)
+                # The status check above ran outside the transaction (and
+                # is not repeated on a retry): only one finalize may flip it
+                result = await self.loan_app_repo.update_by_id(
+                    loan_id,
+                    application_update,
+                    session=session,
+                    expected_status=LoanApplicationStatus.ADMIN_APPROVED
+                )
+                if result.matched_count == 0:
+                    raise ValueError("Loan not approved by admin")
+            except Exception:
+                # Standalone mongod: no transaction to abort, so undo by hand.
+                # Inside a transaction the driver aborts or retries; deleting
+                # here could remove a loan whose commit actually went through.
+                if session is None:
+                    await self.repayment_repo.delete_by_loan(active_loan_id)
+                    await self.loan_repo.delete_by_id(active_loan_id)
+                raise
+
+        # All-or-nothing: never leave a loan with a partial schedule, and
+        # never a second loan for an application finalized concurrently
+        await run_in_transaction(persist)
 
         # 4️⃣ Audit log
         await self.audit_repo.create({
@@ -258,6 +345,15 @@ class LoanManagerService:
             "timestamp": datetime.utcnow()
         })
 
+        logger.info(
+            "LOAN_FINALIZED",
+            extra={
+                "loan_id": loan_id,
+                "tenure_months": tenure_months,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+            }
+        )
+
         return {
             "message": "Loan finalized successfully",
             "emi_amount": emi_amount
@@ -266,13 +362,20 @@ class LoanManagerService:
 # =====================================================
 # LIST ESCALATED LOAN APPLICATIONS (FOR LOAN MANAGER)
 # =====================================================
-    async def list_escalated_loans(self):
-        cursor = self.loan_app_repo.collection.find({
-            "escalated": True
-        })
+    async def list_escalated_loans(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None
+    ):
+        loans, next_cursor = await self.loan_app_repo.list_page(
+            {"escalated": True},
+            limit=limit,
+            cursor=cursor,
+            projection=self.ESCALATED_LIST_FIELDS
+        )
 
         result = []
-        async for loan in cursor:
+        for loan in loans:
             result.append({
                 "loan_id": str(loan["_id"]),
                 "user_id": str(loan["user_id"]),
@@ -283,14 +386,21 @@ class LoanManagerService:
                 "status": loan.get("status")
             })
 
-        return result
-    async def list_finalized_loans(self):
-        cursor = self.loan_app_repo.collection.find({
-            "status": LoanApplicationStatus.FINALIZED
-        })
+        return {"items": result, "next_cursor": next_cursor}
+    async def list_finalized_loans(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None
+    ):
+        loans, next_cursor = await self.loan_app_repo.list_page(
+            {"status": LoanApplicationStatus.FINALIZED},
+            limit=limit,
+            cursor=cursor,
+            projection=self.FINALIZED_LIST_FIELDS
+        )
 
         result = []
-        async for loan in cursor:
+        for loan in loans:
             result.append({
                 "loan_id": str(loan["_id"]),
                 "user_id": str(loan["user_id"]),
@@ -299,4 +409,4 @@ class LoanManagerService:
                 "finalized_by": loan.get("finalized_by")
             })
 
-        return result
+        return {"items": result, "next_cursor": next_cursor}
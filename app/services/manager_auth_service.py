@@ -1,11 +1,15 @@
 from app.repositories.manager_repository import ManagerRepository
-from app.auth.password import verify_password
-from app.auth.security import create_access_token
-from app.enums.role import Role
+from app.auth.password import verify_password_async
+from app.services.session_service import SessionService
 
 class ManagerAuthService:
-    def __init__(self):
-        self.repo = ManagerRepository()
+    def __init__(
+        self,
+        repo: ManagerRepository | None = None,
+        sessions: SessionService | None = None
+    ):
+        self.repo = repo or ManagerRepository()
+        self.sessions = sessions or SessionService()
 
     async def login_manager(self, manager_id: str, password: str):
         manager = await self.repo.find_by_manager_id(manager_id)
@@ -18,10 +22,10 @@ class ManagerAuthService:
         if not manager.get("approved_by_admin", False):
             raise ValueError("Manager not approved by admin")
 
-        if not verify_password(password, manager["password_hash"]):
+        if not await verify_password_async(password, manager["password_hash"]):
             raise ValueError("Invalid credentials")
 
-        return create_access_token(
-            subject=str(manager["_id"]),
-            role=manager["role"]  # BANK_MANAGER or LOAN_MANAGER
+        return await self.sessions.start(
+            str(manager["_id"]),
+            manager["role"]  # BANK_MANAGER or LOAN_MANAGER
         )
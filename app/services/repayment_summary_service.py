@@ -1,31 +1,83 @@
-from app.db.mongodb import db
+from app.repositories.loan_repository import COUNTERS_DIRTY, LoanRepository
+from app.repositories.repayment_repository import RepaymentRepository
+from app.repositories.transaction_repository import TransactionRepository
 from bson import ObjectId
 
 class RepaymentSummaryService:
+    """
+    Loans carry maintained counters (`total_emis`, `paid_emis`,
+    `missed_emis`, `late_payments`) that mirror the current number of
+    PAID / FAILED repayment rows and PAID penalties. The EMI scheduler
+    keeps them in step with every repayment state change and
+    `reconcile_repayment_counters` repairs any drift. Loans flagged
+    `counters_dirty` (an update that may be half-applied) are counted
+    from the rows instead until the reconciler clears the flag.
+    """
+
+    def __init__(
+        self,
+        loan_repo: LoanRepository | None = None,
+        repayment_repo: RepaymentRepository | None = None,
+        transaction_repo: TransactionRepository | None = None
+    ):
+        self.loan_repo = loan_repo or LoanRepository()
+        self.repayment_repo = repayment_repo or RepaymentRepository()
+        self.transaction_repo = transaction_repo or TransactionRepository()
 
     async def build_summary(self, loan_id: ObjectId):
-        total_emis = await db.loan_repayments.count_documents(
-            {"loan_id": loan_id}
-        )
+        loan = await self.loan_repo.get_repayment_counters(loan_id)
+        if loan and self.counters_trusted(loan):
+            return self.summary_from_counters(loan)
+
+        # Loans finalized before counters existed, or with counters a
+        # crash may have left out of step (until reconciled)
+        return await self.count_summary(loan_id)
+
+    async def build_user_summaries(self, user_ids: list) -> dict:
+        """
+        One combined summary per user across all of their loans,
+        read with a single query on `loans`.
+        """
+        totals = {}
+        for loan in await self.loan_repo.get_repayment_counters_for_users(user_ids):
+            if self.counters_trusted(loan):
+                summary = self.summary_from_counters(loan)
+            else:
+                summary = await self.count_summary(loan["_id"])
+
+            combined = totals.setdefault(loan["user_id"], dict.fromkeys(
+                ("total_emis", "paid_emis", "missed_emis", "late_payments"), 0
+            ))
+            for field in combined:
+                combined[field] += summary[field]
+
+        for combined in totals.values():
+            combined["loan_closed_clean"] = combined["missed_emis"] == 0
 
-        paid_emis = await db.loan_repayments.count_documents(
-            {"loan_id": loan_id, "status": "PAID"}
-        )
+        return totals
 
-        missed_emis = await db.loan_repayments.count_documents(
-            {"loan_id": loan_id, "status": "FAILED"}
-        )
+    def counters_trusted(self, loan: dict) -> bool:
+        return "total_emis" in loan and not loan.get(COUNTERS_DIRTY)
+
+    def summary_from_counters(self, counters: dict):
+        missed_emis = counters.get("missed_emis", 0)
+        return {
+            "total_emis": counters.get("total_emis", 0),
+            "paid_emis": counters.get("paid_emis", 0),
+            "missed_emis": missed_emis,
+            "late_payments": counters.get("late_payments", 0),
+            "loan_closed_clean": missed_emis == 0
+        }
 
-        late_payments = await db.loan_transactions.count_documents({
-            "loan_id": loan_id,
-            "transaction_type": "PENALTY",
-            "status": "PAID"
-        })
+    async def count_summary(self, loan_id: ObjectId):
+        counts = (await self.repayment_repo.count_by_status([loan_id])).get(loan_id, {})
+        penalties = await self.transaction_repo.count_paid_penalties([loan_id])
 
+        missed_emis = counts.get("missed_emis", 0)
         return {
-            "total_emis": total_emis,
-            "paid_emis": paid_emis,
+            "total_emis": counts.get("total_emis", 0),
+            "paid_emis": counts.get("paid_emis", 0),
             "missed_emis": missed_emis,
-            "late_payments": late_payments,
+            "late_payments": penalties.get(loan_id, 0),
             "loan_closed_clean": missed_emis == 0
         }
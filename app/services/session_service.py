@@ -0,0 +1,230 @@
+"""
+Refresh tokens: renewing an access token without the password.
+
+Login starts a session and hands out an opaque refresh token next to the
+access token. POST /auth/refresh trades it for a new pair; the old
+refresh token stops working (rotation). Only a SHA-256 of each refresh
+token is stored: the tokens are 256 random bits, so a fast hash is
+enough and renewal costs one indexed update instead of a bcrypt verify.
+
+Successor tokens are random too. So that two refreshes racing with the
+same token (two tabs, a retried request) both receive the same new
+token, the rotation stores the successor sealed under the token it
+replaces: only a holder of that token can open it, and only while it is
+the newest rotated-out one. Presenting it within
+REFRESH_REUSE_GRACE_SECONDS is such a race; presenting any rotated-out
+token later means it was copied: the session is ended, so neither the
+thief nor the owner can keep refreshing with it.
+
+Every refresh also re-checks the subject against the rules of the login
+that started the session, so a deleted (or, after Aadhaar login,
+no-longer-approved) user or a disabled, unapproved or re-roled manager
+cannot refresh their way past the change.
+"""
+import base64
+from datetime import datetime, timedelta
+import hashlib
+import hmac
+import logging
+import secrets
+
+from app.auth.revocation import RevocationList, revocation_list
+from app.auth.security import create_access_token
+from app.core.config import settings
+from app.core.metrics import REGISTRY
+from app.enums.role import Role
+from app.enums.user import UserApprovalStatus
+from app.repositories.admin_repository import AdminRepository
+from app.repositories.manager_repository import ManagerRepository
+from app.repositories.session_repository import SessionRepository
+from app.repositories.user_repository import UserRepository
+
+logger = logging.getLogger("auth")
+
+session_refreshes = REGISTRY.counter(
+    "auth_session_refreshes_total",
+    "Refresh-token exchanges by outcome",
+    ("outcome",)
+)
+
+
+def refresh_token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _successor_pad(token: str) -> bytes:
+    # One pad per token: a refresh token is rotated out only once
+    return hmac.new(token.encode(), b"refresh-successor", hashlib.sha256).digest()
+
+
+def seal_successor(token: str, successor: bytes) -> bytes:
+    """`successor` (32 random bytes) readable only with `token`."""
+    return bytes(a ^ b for a, b in zip(successor, _successor_pad(token)))
+
+
+def open_successor(token: str, sealed: bytes) -> str:
+    successor = bytes(a ^ b for a, b in zip(sealed, _successor_pad(token)))
+    return base64.urlsafe_b64encode(successor).rstrip(b"=").decode()
+
+
+class SessionService:
+
+    def __init__(
+        self,
+        repo: SessionRepository | None = None,
+        revocations: RevocationList | None = None,
+        user_repo: UserRepository | None = None,
+        manager_repo: ManagerRepository | None = None,
+        admin_repo: AdminRepository | None = None
+    ):
+        self.repo = repo or SessionRepository()
+        self.revocations = revocations or revocation_list
+        self.user_repo = user_repo or UserRepository()
+        self.manager_repo = manager_repo or ManagerRepository()
+        self.admin_repo = admin_repo or AdminRepository()
+        self.idle = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        self.max_age = timedelta(days=settings.SESSION_MAX_AGE_DAYS)
+        self.reuse_grace = timedelta(seconds=settings.REFRESH_REUSE_GRACE_SECONDS)
+
+    async def start(
+        self,
+        subject: str,
+        role: Role,
+        approval_required: bool = False
+    ) -> tuple[str, str]:
+        """
+        New session for a freshly authenticated subject -> (access, refresh).
+        `approval_required`: the login only admits APPROVED users, and
+        refresh must keep checking that.
+        """
+        refresh_token = secrets.token_urlsafe(32)
+        now = datetime.utcnow()
+
+        await self.repo.create({
+            "token_hash": refresh_token_hash(refresh_token),
+            "previous_hashes": [],
+            "subject": subject,
+            "role": role,
+            "approval_required": approval_required,
+            "created_at": now,
+            "last_used_at": now,
+            "expires_at": now + self.idle,
+            "max_expires_at": now + self.max_age,
+            "revoked_at": None
+        })
+
+        return create_access_token(subject=subject, role=role), refresh_token
+
+    async def refresh(self, refresh_token: str) -> tuple[str, str]:
+        token_hash = refresh_token_hash(refresh_token)
+        successor = secrets.token_bytes(32)
+        new_token = base64.urlsafe_b64encode(successor).rstrip(b"=").decode()
+        now = datetime.utcnow()
+
+        session = await self.repo.rotate(
+            token_hash,
+            refresh_token_hash(new_token),
+            seal_successor(refresh_token, successor),
+            now,
+            now + self.idle
+        )
+        outcome = "rotated"
+
+        if not session:
+            previous = await self.repo.find_by_previous_hash(token_hash)
+            if previous is None or previous.get("revoked_at") is not None:
+                session_refreshes.inc(("invalid",))
+                raise ValueError("Invalid or expired refresh token")
+
+            # Lost a race with a refresh of the same token: the sealed
+            # successor opens to the session's current token only for
+            # the token it replaced (older ones open to garbage)
+            rotated_at = previous.get("rotated_at")
+            sealed = previous.get("successor_sealed")
+            current = open_successor(refresh_token, sealed) if sealed else None
+            if (
+                current is not None
+                and refresh_token_hash(current) == previous["token_hash"]
+                and rotated_at is not None
+                and rotated_at >= now - self.reuse_grace
+            ):
+                session = previous
+                new_token = current
+                outcome = "concurrent"
+            else:
+                await self.repo.revoke(previous["_id"], now, "reuse")
+                session_refreshes.inc(("reused",))
+                logger.warning(
+                    "REFRESH_TOKEN_REUSED",
+                    extra={"subject": previous["subject"], "session_id": str(previous["_id"])}
+                )
+                raise ValueError("Invalid or expired refresh token")
+
+        if not await self._subject_active(session):
+            await self.repo.revoke(session["_id"], now, "subject_inactive")
+            session_refreshes.inc(("subject_inactive",))
+            logger.warning(
+                "REFRESH_SUBJECT_INACTIVE",
+                extra={"subject": session["subject"], "session_id": str(session["_id"])}
+            )
+            raise ValueError("Invalid or expired refresh token")
+
+        session_refreshes.inc((outcome,))
+        access_token = create_access_token(
+            subject=session["subject"],
+            role=session["role"]
+        )
+        return access_token, new_token
+
+    async def _subject_active(self, session: dict) -> bool:
+        """The conditions of the session's login, for the subject as stored now."""
+        subject, role = session["subject"], session["role"]
+
+        if role == Role.USER:
+            user = await self.user_repo.find_by_id(subject, {"approval_status": 1})
+            if user is None:
+                return False
+            # Phone login admits PENDING users (they log in to submit
+            # KYC); Aadhaar login only APPROVED ones. Deleted never.
+            if session.get("approval_required"):
+                return user.get("approval_status") == UserApprovalStatus.APPROVED
+            return user.get("approval_status") != UserApprovalStatus.DELETED
+
+        if role == Role.ADMIN:
+            admin = await self.admin_repo.find_by_id(subject, {"status": 1})
+            return admin is not None and admin.get("status") == "ACTIVE"
+
+        manager = await self.manager_repo.find_by_id(
+            subject,
+            {"status": 1, "approved_by_admin": 1, "role": 1}
+        )
+        return (
+            manager is not None
+            and manager.get("status") == "ACTIVE"
+            and manager.get("approved_by_admin", False)
+            and manager.get("role") == role
+        )
+
+    async def logout(self, refresh_token: str, auth=None):
+        """
+        End the session behind `refresh_token`; with the caller's
+        AuthContext, also revoke the access token they hold.
+        """
+        now = datetime.utcnow()
+        await self.repo.revoke_by_token_hash(refresh_token_hash(refresh_token), now)
+
+        if auth is not None and auth.jti is not None and auth.expires_at is not None:
+            await self.revocations.revoke_token(
+                auth.jti,
+                auth.user_id,
+                datetime.utcfromtimestamp(auth.expires_at)
+            )
+
+    async def revoke_subject(self, subject: str, reason: str):
+        """Sign `subject` out everywhere: sessions and live access tokens."""
+        ended = await self.repo.revoke_subject(subject, datetime.utcnow(), reason)
+        await self.revocations.revoke_subject(subject)
+        logger.info(
+            "SESSIONS_REVOKED",
+            extra={"subject": subject, "sessions": ended, "reason": reason}
+        )
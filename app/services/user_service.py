@@ -1,14 +1,33 @@
 from datetime import datetime,time,date
+from pymongo.errors import DuplicateKeyError
 from app.repositories.user_repository import UserRepository
-from app.auth.password import hash_password
+from app.auth.password import hash_password_async
 from app.enums.user import KYCStatus, UserApprovalStatus
-from app.auth.password import verify_password
-from app.auth.security import create_access_token
+from app.auth.password import verify_password_async
+from app.services.session_service import SessionService
 from app.enums.role import Role
+from app.repositories.projection import fields
 
 class UserService:
-    def __init__(self):
-        self.repo = UserRepository()
+
+    # Profile reads never need the password / PIN hashes
+    PROFILE_FIELDS = fields(
+        "name", "phone", "kyc_status", "approval_status", "is_minor",
+        "created_at"
+    )
+    FULL_DETAIL_FIELDS = fields(
+        "name", "phone", "kyc_status", "approval_status", "is_minor",
+        "created_at", "aadhaar", "pan", "dob", "gender", "occupation",
+        "address"
+    )
+
+    def __init__(
+        self,
+        repo: UserRepository | None = None,
+        sessions: SessionService | None = None
+    ):
+        self.repo = repo or UserRepository()
+        self.sessions = sessions or SessionService()
 
     async def register_user(self, payload):
         existing = await self.repo.find_by_phone(payload.phone)
@@ -18,7 +37,7 @@ class UserService:
         user_doc = {
             "name": payload.name,
             "phone": payload.phone,
-            "password_hash": hash_password(payload.password),
+            "password_hash": await hash_password_async(payload.password),
 
             # KYC & approval lifecycle
             "kyc_status": KYCStatus.PENDING,
@@ -29,7 +48,11 @@ class UserService:
             "updated_at": datetime.utcnow()
         }
 
-        user_id = await self.repo.create(user_doc)
+        try:
+            user_id = await self.repo.create(user_doc)
+        except DuplicateKeyError:
+            # Lost a race with a concurrent registration (unique phone)
+            raise ValueError("User already exists with this phone number")
         return str(user_id)
     
     async def login_user(self, phone: str, password: str):
@@ -37,18 +60,13 @@ class UserService:
         if not user:
             raise ValueError("Invalid phone or password")
 
-        if not verify_password(password, user["password_hash"]):
+        if not await verify_password_async(password, user["password_hash"]):
             raise ValueError("Invalid phone or password")
 
-        token = create_access_token(
-            subject=str(user["_id"]),
-            role=Role.USER
-        )
-
-        return token
+        return await self.sessions.start(str(user["_id"]), Role.USER)
     
     async def get_user_by_id(self, user_id: str):
-        user = await self.repo.find_by_id(user_id)
+        user = await self.repo.find_by_id(user_id, self.PROFILE_FIELDS)
         if not user:
             return None
 
@@ -91,7 +109,10 @@ class UserService:
             "updated_at": datetime.utcnow()
         }
 
-        await self.repo.update_kyc(user_id, update_data)
+        try:
+            await self.repo.update_kyc(user_id, update_data)
+        except DuplicateKeyError:
+            raise ValueError("Aadhaar already registered")
 
 
     async def set_digi_pin(self, user_id: str, digi_pin: str):
@@ -109,7 +130,7 @@ class UserService:
             {"_id": user["_id"]},
             {
                 "$set": {
-                    "digi_pin_hash": hash_password(digi_pin),
+                    "digi_pin_hash": await hash_password_async(digi_pin),
                     "digi_pin_set_at": datetime.utcnow()
                 }
             }
@@ -133,7 +154,7 @@ class UserService:
 
         # 🔐 Password login
         if password:
-            if not verify_password(password, user["password_hash"]):
+            if not await verify_password_async(password, user["password_hash"]):
                 raise ValueError("Invalid Aadhaar or password")
 
         # 🔐 Digi PIN login
@@ -141,18 +162,15 @@ class UserService:
             if not user.get("digi_pin_hash"):
                 raise ValueError("Digi PIN not set")
 
-            if not verify_password(digi_pin, user["digi_pin_hash"]):
+            if not await verify_password_async(digi_pin, user["digi_pin_hash"]):
                 raise ValueError("Invalid Digi PIN")
 
         else:
             raise ValueError("Password or Digi PIN required")
 
-        return create_access_token(
-            subject=str(user["_id"]),
-            role=Role.USER
-        )
+        return await self.sessions.start(str(user["_id"]), Role.USER, approval_required=True)
     async def get_user_full_details(self, user_id: str):
-        user = await self.repo.find_by_id(user_id)
+        user = await self.repo.find_by_id(user_id, self.FULL_DETAIL_FIELDS)
         if not user:
             raise ValueError("User not found")
 
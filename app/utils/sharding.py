@@ -0,0 +1,16 @@
+import zlib
+
+# Fixed key space for EMI run sharding. Rows carry `shard_key` in
+# [0, SHARD_SPACE) so any shard count can select its slice of keys.
+SHARD_SPACE = 1024
+
+
+def shard_key(user_id) -> int:
+    """Stable per-user shard key (identical on every process/node)."""
+    return zlib.crc32(str(user_id).encode()) % SHARD_SPACE
+
+
+def shard_filter(shard: int, shard_count: int) -> dict:
+    """Query fragment selecting rows owned by `shard` out of `shard_count`."""
+    keys = [key for key in range(SHARD_SPACE) if key % shard_count == shard]
+    return {"shard_key": {"$in": keys}}
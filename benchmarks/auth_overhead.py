@@ -0,0 +1,177 @@
+"""
+Per-request cost of bearer-token authentication, before and after the
+verified-token cache.
+
+    python -m benchmarks.auth_overhead [--tokens 1000] [--rounds 20000]
+
+"legacy" is the previous path, rebuilt here: full HS256 verify on every
+request, a Pydantic AuthContext, and role dependencies layered on
+get_current_user. "uncached" is the current resolver with the cache
+disabled (first sight of a token); "cached" is the steady state. The
+request-level numbers go through a minimal FastAPI app via httpx's
+ASGITransport and subtract an unauthenticated route, so they include
+dependency-injection overhead but not the rest of the app.
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from fastapi import Depends, FastAPI, HTTPException
+import httpx
+from pydantic import BaseModel
+
+from app.auth import dependencies
+from app.auth.dependencies import HTTPAuthorizationCredentials, get_current_admin, security
+from app.auth.security import create_access_token, decode_access_token
+from app.auth.token_cache import TokenCache
+from app.enums.role import Role
+
+
+# =====================
+# Previous implementation
+# =====================
+class LegacyAuthContext(BaseModel):
+    user_id: str
+    role: Role
+
+
+def legacy_resolve(token: str, expected_roles: list[Role]) -> LegacyAuthContext:
+    payload = decode_access_token(token)
+    if not payload:
+        raise HTTPException(401)
+    role = Role(payload["role"])
+    if role not in expected_roles:
+        raise HTTPException(403)
+    return LegacyAuthContext(user_id=payload["sub"], role=role)
+
+
+async def legacy_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> LegacyAuthContext:
+    return legacy_resolve(credentials.credentials, list(Role))
+
+
+async def legacy_current_admin(
+    auth: LegacyAuthContext = Depends(legacy_current_user)
+) -> LegacyAuthContext:
+    if auth.role != Role.ADMIN:
+        raise HTTPException(403)
+    return auth
+
+
+# =====================
+# Function level
+# =====================
+def _per_call_us(func, tokens: list[str], rounds: int) -> float:
+    rng = random.Random(3)
+    picks = [rng.choice(tokens) for _ in range(rounds)]
+    started = time.perf_counter()
+    for token in picks:
+        func(token)
+    return (time.perf_counter() - started) / rounds * 1_000_000
+
+
+def bench_resolver(tokens: list[str], rounds: int) -> dict:
+    all_roles = list(Role)
+    legacy = _per_call_us(lambda token: legacy_resolve(token, all_roles), tokens, rounds)
+
+    original_cache = dependencies.token_cache
+    try:
+        dependencies.token_cache = TokenCache(0)
+        uncached = _per_call_us(dependencies._resolve_user, tokens, rounds)
+
+        dependencies.token_cache = TokenCache(len(tokens))
+        for token in tokens:
+            dependencies._resolve_user(token)
+        cached = _per_call_us(dependencies._resolve_user, tokens, rounds)
+    finally:
+        dependencies.token_cache = original_cache
+
+    return {
+        "legacy_us": round(legacy, 2),
+        "uncached_us": round(uncached, 2),
+        "cached_us": round(cached, 2),
+        "speedup": round(legacy / cached, 1)
+    }
+
+
+# =====================
+# Request level
+# =====================
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/open")
+    async def open_route():
+        return {}
+
+    @app.get("/legacy")
+    async def legacy_route(auth: LegacyAuthContext = Depends(legacy_current_admin)):
+        return {}
+
+    @app.get("/current")
+    async def current_route(auth=Depends(get_current_admin)):
+        return {}
+
+    return app
+
+
+async def bench_requests(tokens: list[str], rounds: int) -> dict:
+    transport = httpx.ASGITransport(app=_app())
+    rng = random.Random(5)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def per_request_us(path: str) -> float:
+            started = time.perf_counter()
+            for _ in range(rounds):
+                token = rng.choice(tokens)
+                response = await client.get(path, headers={"Authorization": f"Bearer {token}"})
+                response.raise_for_status()
+            return (time.perf_counter() - started) / rounds * 1_000_000
+
+        # Warm-up also fills the token cache
+        for path in ("/open", "/legacy", "/current"):
+            for token in tokens:
+                await client.get(path, headers={"Authorization": f"Bearer {token}"})
+
+        baseline = await per_request_us("/open")
+        legacy = await per_request_us("/legacy")
+        current = await per_request_us("/current")
+
+    return {
+        "baseline_us": round(baseline, 1),
+        "legacy_auth_us": round(legacy - baseline, 1),
+        "current_auth_us": round(current - baseline, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=1000, help="distinct live tokens")
+    parser.add_argument("--rounds", type=int, default=20000, help="resolver calls")
+    parser.add_argument("--requests", type=int, default=2000, help="HTTP requests per route")
+    args = parser.parse_args()
+
+    tokens = [
+        create_access_token(subject=f"admin-{index}", role=Role.ADMIN)
+        for index in range(args.tokens)
+    ]
+
+    resolver = bench_resolver(tokens, args.rounds)
+    print(
+        f"resolver   legacy {resolver['legacy_us']:.2f}us  "
+        f"uncached {resolver['uncached_us']:.2f}us  "
+        f"cached {resolver['cached_us']:.2f}us  (x{resolver['speedup']})"
+    )
+
+    requests = asyncio.run(bench_requests(tokens, args.requests))
+    print(
+        f"request    baseline {requests['baseline_us']:.1f}us  "
+        f"auth overhead legacy {requests['legacy_auth_us']:.1f}us -> "
+        f"current {requests['current_auth_us']:.1f}us"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Write cost of finalize_loan's EMI schedule, before and after insert_many.
+
+    python -m benchmarks.finalize_schedule [--tenures 12,60,120,360] [--samples 30]
+
+"legacy" is the previous write path, rebuilt here: the active loan, one
+insert_one per installment, then the application update, all without a
+session. "current" is what finalize_loan does now: the same documents
+through LoanRepository.create, RepaymentRepository.create_many and
+LoanApplicationRepository.update_by_id inside run_in_transaction. Both
+paths get freshly built documents, samples alternate between them, and
+only the writes are timed.
+
+Round trips are the MongoDB commands seen by the app's command listener
+(transaction commits included). Needs a reachable MONGO_URI; the
+database named by BENCH_MONGO_DB_NAME (default "loan_benchmark") is
+dropped first. Pass --output to keep the JSON for comparison.
+"""
+import os
+
+# The app binds its database at import time; never point it at real data
+os.environ["MONGO_DB_NAME"] = os.environ.get("BENCH_MONGO_DB_NAME", "loan_benchmark")
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+from datetime import datetime, timedelta  # noqa: E402
+import json  # noqa: E402
+import platform  # noqa: E402
+import time  # noqa: E402
+
+from bson import Decimal128, ObjectId  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.metrics import RequestTimings, request_timings  # noqa: E402
+from app.db import mongodb  # noqa: E402
+from app.db.indexes import ensure_indexes  # noqa: E402
+from app.enums.loan import LoanApplicationStatus  # noqa: E402
+from app.repositories.loan_application_repository import LoanApplicationRepository  # noqa: E402
+from app.repositories.loan_repository import LoanRepository  # noqa: E402
+from app.repositories.repayment_repository import RepaymentRepository  # noqa: E402
+from app.services.amortization import amortization_schedule  # noqa: E402
+from app.utils.sharding import shard_key  # noqa: E402
+from benchmarks.lifecycle_bench import _git_commit, _int_list, latency_summary  # noqa: E402
+
+PRINCIPAL = 250000.0
+INTEREST_RATE = 11.5
+
+
+def _documents(application_id: ObjectId, user_id: ObjectId, tenure: int):
+    """Loan, schedule and application update as finalize_loan builds them."""
+    amortization = amortization_schedule(PRINCIPAL, INTEREST_RATE, tenure)
+    now = datetime.utcnow()
+    loan_id = ObjectId()
+    loan_doc = {
+        "_id": loan_id,
+        "loan_application_id": application_id,
+        "user_id": user_id,
+        "loan_amount": Decimal128(str(PRINCIPAL)),
+        "interest_rate": INTEREST_RATE,
+        "tenure_months": tenure,
+        "emi_amount": amortization.emi,
+        "status": "ACTIVE",
+        "total_emis": tenure,
+        "paid_emis": 0,
+        "missed_emis": 0,
+        "late_payments": 0,
+        "outstanding_principal": PRINCIPAL,
+        "created_at": now
+    }
+    schedule = []
+    due_date = now
+    for i in range(1, tenure + 1):
+        due_date += timedelta(days=30)
+        schedule.append({
+            "loan_id": loan_id,
+            "user_id": user_id,
+            "emi_number": i,
+            **amortization.installment(i - 1),
+            "due_date": due_date,
+            "status": "PENDING",
+            "attempts": 0,
+            "shard_key": shard_key(user_id),
+            "created_at": now
+        })
+    update = {
+        "status": LoanApplicationStatus.FINALIZED,
+        "finalized_by": "bench-loan-manager",
+        "finalized_at": now
+    }
+    return loan_doc, schedule, update
+
+
+# =====================
+# Previous implementation
+# =====================
+async def legacy_persist(database, application_id, loan_doc, schedule, update):
+    await database.loans.insert_one(loan_doc)
+    for row in schedule:
+        await database.loan_repayments.insert_one(row)
+    await database.loan_applications.update_one({"_id": application_id}, {"$set": update})
+
+
+# =====================
+# Current implementation
+# =====================
+async def current_persist(repos, application_id, loan_doc, schedule, update):
+    loan_repo, repayment_repo, loan_app_repo = repos
+
+    async def persist(session):
+        await loan_repo.create(loan_doc, session=session)
+        await repayment_repo.create_many(schedule, session=session)
+        await loan_app_repo.update_by_id(
+            str(application_id),
+            update,
+            session=session,
+            expected_status=LoanApplicationStatus.ADMIN_APPROVED
+        )
+
+    await mongodb.run_in_transaction(persist)
+
+
+async def _write(write, application: dict, tenure: int) -> tuple[float, int]:
+    documents = _documents(application["_id"], application["user_id"], tenure)
+    timings = RequestTimings()
+    token = request_timings.set(timings)
+    try:
+        started = time.perf_counter()
+        await write(application["_id"], *documents)
+        return time.perf_counter() - started, timings.mongo_commands
+    finally:
+        request_timings.reset(token)
+
+
+async def _measure(writes: dict, database, tenure: int, samples: int) -> dict:
+    """
+    Alternates the paths sample by sample, so both see the same
+    collection sizes and server state.
+    """
+    applications = [
+        {
+            "_id": ObjectId(),
+            "user_id": ObjectId(),
+            "status": LoanApplicationStatus.ADMIN_APPROVED,
+            "idempotency_key": f"bench-{ObjectId()}"
+        }
+        for _ in range(samples * len(writes))
+    ]
+    await database.loan_applications.insert_many(applications)
+
+    latencies = {name: [] for name in writes}
+    round_trips = {name: 0 for name in writes}
+    pending = iter(applications)
+    for _ in range(samples):
+        for name, write in writes.items():
+            elapsed, commands = await _write(write, next(pending), tenure)
+            latencies[name].append(elapsed)
+            round_trips[name] = max(round_trips[name], commands)
+
+    return {
+        name: {**latency_summary(latencies[name]), "round_trips": round_trips[name]}
+        for name in writes
+    }
+
+
+async def run(args) -> dict:
+    started_at = datetime.utcnow()
+    await mongodb.connect()
+    await mongodb.client.drop_database(settings.MONGO_DB_NAME)
+    await ensure_indexes(mongodb.db)
+
+    database = mongodb.db
+    repos = (
+        LoanRepository(database),
+        RepaymentRepository(database),
+        LoanApplicationRepository(database)
+    )
+
+    async def legacy(application_id, *documents):
+        await legacy_persist(database, application_id, *documents)
+
+    async def current(application_id, *documents):
+        await current_persist(repos, application_id, *documents)
+
+    results = []
+    for tenure in args.tenures:
+        writes = {"legacy": legacy, "current": current}
+        # One untimed round so connections and indexes are warm
+        await _measure(writes, database, tenure, 1)
+
+        measured = await _measure(writes, database, tenure, args.samples)
+        results.append({
+            "tenure_months": tenure,
+            **measured,
+            "p50_speedup": round(measured["legacy"]["p50_ms"] / measured["current"]["p50_ms"], 1)
+        })
+
+    mongodb.close()
+
+    return {
+        "benchmark": "finalize_schedule",
+        "commit": _git_commit(),
+        "started_at": started_at.isoformat(),
+        "python": platform.python_version(),
+        "settings": {
+            "mongo_db_name": settings.MONGO_DB_NAME,
+            "samples": args.samples
+        },
+        "results": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tenures", type=_int_list, default=[12, 60, 120, 360])
+    parser.add_argument("--samples", type=int, default=30, help="finalizations per tenure and path")
+    parser.add_argument("--output", help="also write the JSON here")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    for row in result["results"]:
+        legacy, current = row["legacy"], row["current"]
+        print(
+            f"tenure {row['tenure_months']:>4}  "
+            f"p50 {legacy['p50_ms']:.2f}ms -> {current['p50_ms']:.2f}ms (x{row['p50_speedup']})  "
+            f"p99 {legacy['p99_ms']:.2f}ms -> {current['p99_ms']:.2f}ms  "
+            f"round trips {legacy['round_trips']} -> {current['round_trips']}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(json.dumps(result, indent=2, default=str) + "\n")
+
+
+if __name__ == "__main__":
+    main()
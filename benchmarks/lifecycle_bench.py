@@ -0,0 +1,315 @@
+"""
+Loan lifecycle benchmarks against a local MongoDB.
+
+Seeds a dedicated database with configurable volumes, then measures
+
+  * loan application throughput through POST /loans
+  * dashboard list latency (p50/p99) of the manager and admin lists
+  * POST .../finalize (finalize_loan) latency per tenure
+  * process_due_emis throughput (EMIs/sec)
+
+and writes one JSON document with the results, the commit and the
+settings that shape them, so runs can be compared across commits:
+
+    python -m benchmarks.lifecycle_bench --output bench.json
+    python -m benchmarks.lifecycle_bench --users 20000 --loans 5000 --due-emis 6
+
+HTTP requests go through httpx's ASGITransport: the full app stack
+(middleware, auth, validation, serialization) without a server or
+sockets. Needs `httpx` and a reachable MONGO_URI. The database named
+by BENCH_MONGO_DB_NAME (default "loan_benchmark") is dropped first.
+"""
+import os
+
+# The app binds its database at import time; never point it at real data
+os.environ["MONGO_DB_NAME"] = os.environ.get("BENCH_MONGO_DB_NAME", "loan_benchmark")
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+from datetime import datetime  # noqa: E402
+import json  # noqa: E402
+import platform  # noqa: E402
+import random  # noqa: E402
+import subprocess  # noqa: E402
+import time  # noqa: E402
+
+import httpx  # noqa: E402
+
+from app.auth.security import create_access_token  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.db import mongodb  # noqa: E402
+from app.db.indexes import ensure_indexes  # noqa: E402
+from app.enums.role import Role  # noqa: E402
+from app.main import app  # noqa: E402
+from app.scheduler.emi_scheduler import process_due_emis  # noqa: E402
+from benchmarks import seed  # noqa: E402
+
+# (name, path, role) of the list endpoints behind the dashboards
+DASHBOARDS = [
+    ("loan_manager.applications", "/manager/loan/applications", Role.LOAN_MANAGER),
+    ("loan_manager.escalated", "/manager/loan/applications/escalated", Role.LOAN_MANAGER),
+    ("bank_manager.users", "/manager/bank/users", Role.BANK_MANAGER),
+    ("admin.loans", "/admin/loans", Role.ADMIN),
+    ("admin.users", "/admin/users", Role.ADMIN),
+]
+
+LOAN_PAYLOAD = {
+    "loan_type": "PERSONAL",
+    "loan_amount": 250000,
+    "tenure_months": 24,
+    "reason": "Benchmark application",
+    "income_slip_url": "https://files.example.com/slips/bench.pdf",
+    "monthly_income": 85000,
+    "occupation": "Employee"
+}
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def latency_summary(samples: list[float]) -> dict:
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3)
+    }
+
+
+def _bearer(subject, role: Role) -> dict:
+    token = create_access_token(subject=str(subject), role=role)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def _timed(client: httpx.AsyncClient, method: str, url: str, **kwargs) -> float:
+    started = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    elapsed = time.perf_counter() - started
+    if response.status_code >= 400:
+        raise RuntimeError(f"{method} {url} -> {response.status_code}: {response.text[:200]}")
+    return elapsed
+
+
+# =====================
+# Scenarios
+# =====================
+async def bench_apply(client, user_ids: list, requests: int, concurrency: int) -> dict:
+    rng = random.Random(11)
+    headers = [_bearer(user_id, Role.USER) for user_id in user_ids]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def apply(index: int) -> float:
+        async with semaphore:
+            return await _timed(
+                client,
+                "POST",
+                "/loans",
+                json=LOAN_PAYLOAD,
+                headers={
+                    **rng.choice(headers),
+                    "Idempotency-Key": f"bench-apply-{index}-{time.time_ns()}"
+                }
+            )
+
+    started = time.perf_counter()
+    samples = await asyncio.gather(*(apply(index) for index in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "elapsed_seconds": round(elapsed, 3),
+        "requests_per_sec": round(requests / elapsed, 2),
+        **latency_summary(samples)
+    }
+
+
+async def bench_dashboards(client, requests: int, pages: int, limit: int) -> list[dict]:
+    """
+    `requests` walks per endpoint, each following the cursor for up to
+    `pages` pages, so deep pages are part of the distribution too.
+    """
+    results = []
+    for name, path, role in DASHBOARDS:
+        headers = _bearer("bench-" + role.value.lower(), role)
+        first_page = []
+        deeper_pages = []
+
+        for _ in range(requests):
+            cursor = None
+            for page in range(pages):
+                params = {"limit": limit}
+                if cursor:
+                    params["cursor"] = cursor
+
+                started = time.perf_counter()
+                response = await client.get(path, params=params, headers=headers)
+                elapsed = time.perf_counter() - started
+                if response.status_code >= 400:
+                    raise RuntimeError(f"GET {path} -> {response.status_code}")
+
+                (first_page if page == 0 else deeper_pages).append(elapsed)
+                cursor = response.json().get("next_cursor")
+                if not cursor:
+                    break
+
+        results.append({
+            "endpoint": name,
+            "path": path,
+            "limit": limit,
+            "first_page": latency_summary(first_page),
+            "next_pages": latency_summary(deeper_pages),
+            "all": latency_summary(first_page + deeper_pages)
+        })
+    return results
+
+
+async def bench_finalize(client, targets: dict[int, list[str]]) -> list[dict]:
+    headers = _bearer("bench-loan-manager", Role.LOAN_MANAGER)
+    results = []
+    for tenure, loan_ids in targets.items():
+        samples = [
+            await _timed(
+                client,
+                "POST",
+                f"/manager/loan/applications/{loan_id}/finalize",
+                json={"interest_rate": 11.5, "tenure_months": tenure},
+                headers=headers
+            )
+            for loan_id in loan_ids
+        ]
+        results.append({"tenure_months": tenure, **latency_summary(samples)})
+    return results
+
+
+async def bench_emis(due: int) -> dict:
+    report = await process_due_emis()
+    return {
+        "due_seeded": due,
+        **{key: value for key, value in report.items() if key != "partition_reports"}
+    }
+
+
+# =====================
+# Runner
+# =====================
+async def run(args) -> dict:
+    started_at = datetime.utcnow()
+    await mongodb.connect()
+    await mongodb.client.drop_database(settings.MONGO_DB_NAME)
+    await ensure_indexes(mongodb.db)
+
+    seeding_started = time.perf_counter()
+    user_ids = await seed.seed_users(
+        mongodb.db, args.users, balance=args.balance, short_ratio=args.short_ratio
+    )
+    applications = await seed.seed_applications(mongodb.db, user_ids, args.applications)
+    due = await seed.seed_active_loans(
+        mongodb.db, user_ids, args.loans, args.loan_tenure, args.due_emis
+    )
+    finalize_targets = await seed.seed_finalizable(
+        mongodb.db, user_ids, args.tenures, args.finalize_samples
+    )
+    seeding_seconds = time.perf_counter() - seeding_started
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        apply = await bench_apply(client, user_ids, args.apply_requests, args.concurrency)
+        dashboards = await bench_dashboards(
+            client, args.dashboard_requests, args.dashboard_pages, args.page_size
+        )
+        # EMIs before finalize: new schedules are not due and would only
+        # dilute the run
+        emis = await bench_emis(due)
+        finalize = await bench_finalize(client, finalize_targets)
+
+    mongodb.close()
+
+    return {
+        "benchmark": "loan_lifecycle",
+        "commit": _git_commit(),
+        "started_at": started_at.isoformat(),
+        "python": platform.python_version(),
+        "settings": {
+            "mongo_db_name": settings.MONGO_DB_NAME,
+            "mongo_max_pool_size": settings.MONGO_MAX_POOL_SIZE,
+            "mongo_read_preference": settings.MONGO_READ_PREFERENCE,
+            "emi_batch_size": settings.EMI_BATCH_SIZE,
+            "emi_partitions": settings.EMI_PARTITIONS,
+            "emi_max_concurrency": settings.EMI_MAX_CONCURRENCY
+        },
+        "volumes": {
+            "users": args.users,
+            "applications": applications,
+            "active_loans": args.loans,
+            "repayment_rows": args.loans * args.loan_tenure,
+            "due_emis": due,
+            "seeding_seconds": round(seeding_seconds, 3)
+        },
+        "results": {
+            "apply": apply,
+            "dashboards": dashboards,
+            "finalize": finalize,
+            "process_due_emis": emis
+        }
+    }
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(part) for part in value.split(",") if part]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    volumes = parser.add_argument_group("volumes")
+    volumes.add_argument("--users", type=int, default=2000)
+    volumes.add_argument("--applications", type=int, default=20000)
+    volumes.add_argument("--loans", type=int, default=2000, help="active loans")
+    volumes.add_argument("--loan-tenure", type=int, default=24, help="months per active loan")
+    volumes.add_argument("--due-emis", type=int, default=3, help="due installments per loan")
+    volumes.add_argument("--balance", type=float, default=1_000_000.0)
+    volumes.add_argument("--short-ratio", type=float, default=0.1, help="share of empty accounts")
+
+    load = parser.add_argument_group("load")
+    load.add_argument("--apply-requests", type=int, default=500)
+    load.add_argument("--concurrency", type=int, default=20)
+    load.add_argument("--dashboard-requests", type=int, default=50, help="cursor walks per list")
+    load.add_argument("--dashboard-pages", type=int, default=4)
+    load.add_argument("--page-size", type=int, default=50)
+    load.add_argument("--tenures", type=_int_list, default=[12, 60, 120, 240])
+    load.add_argument("--finalize-samples", type=int, default=20, help="finalizations per tenure")
+
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    document = json.dumps(result, indent=2, default=str)
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(document + "\n")
+    else:
+        print(document)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Bytes-on-wire and decode cost of full vs projected documents.
+
+Builds a page of synthetic documents shaped like the stored
+`loan_applications` and `users` rows and compares the BSON each list
+endpoint receives with and without its service projection:
+
+    python -m benchmarks.projection_bench [--rows 200] [--rounds 200]
+
+No database is needed; the server's projection is applied in Python,
+so the numbers are what the driver has to transfer and decode.
+"""
+import argparse
+from datetime import datetime, timedelta
+import random
+import time
+
+import bson
+from bson import Decimal128, ObjectId
+
+from app.services.bank_manager_service import BankManagerService
+from app.services.loan_manager_service import LoanManagerService
+from app.repositories.loan_application_repository import LoanApplicationRepository
+from app.repositories.user_repository import UserRepository
+
+
+def _loan_application(rng: random.Random, now: datetime) -> dict:
+    return {
+        "_id": ObjectId(),
+        "user_id": ObjectId(),
+        "loan_type": rng.choice(["PERSONAL", "HOME", "EDUCATION", "VEHICLE"]),
+        "loan_amount": Decimal128(str(rng.randrange(50_000, 2_000_000))),
+        "tenure_months": rng.choice([12, 24, 36, 60, 120]),
+        "reason": "Home renovation and consolidation of existing debt " * 3,
+        "income_slip_url": f"https://files.example.com/slips/{ObjectId()}.pdf",
+        "cibil_score": rng.randrange(300, 900),
+        "system_decision": rng.choice(["AUTO_APPROVED", "MANUAL_REVIEW", "AUTO_REJECTED"]),
+        "interest_rate": Decimal128("11.5"),
+        "emi_preview": Decimal128(str(rng.randrange(2_000, 60_000))),
+        "status": "PENDING",
+        "applied_at": now,
+        "created_at": now,
+        "idempotency_key": str(ObjectId()) * 2,
+        "escalated": False,
+        "escalated_reason": None,
+        "decision_reason": "Income verified against the last three salary slips",
+        "decided_at": now,
+        "decided_by": ObjectId()
+    }
+
+
+def _user(rng: random.Random, now: datetime) -> dict:
+    return {
+        "_id": ObjectId(),
+        "name": "Applicant " + str(rng.randrange(10**6)),
+        "phone": str(rng.randrange(6_000_000_000, 9_999_999_999)),
+        "password_hash": "$2b$12$" + "x" * 53,
+        "digi_pin_hash": "$2b$12$" + "y" * 53,
+        "kyc_status": "COMPLETED",
+        "approval_status": "PENDING",
+        "is_minor": False,
+        "aadhaar": str(rng.randrange(10**11, 10**12)),
+        "pan": "ABCDE1234F",
+        "dob": now - timedelta(days=rng.randrange(7_000, 20_000)),
+        "gender": rng.choice(["MALE", "FEMALE", "OTHER"]),
+        "occupation": "Software engineer",
+        "address": {
+            "line1": "Flat 402, Sunrise Apartments, 12th Cross Road",
+            "line2": "Near the metro station, Indiranagar",
+            "city": "Bengaluru",
+            "state": "Karnataka",
+            "pincode": "560038"
+        },
+        "cibil_score": rng.randrange(300, 900),
+        "cibil_updated_at": now,
+        "approved_by_manager_id": ObjectId(),
+        "created_at": now,
+        "updated_at": now
+    }
+
+
+def _project(doc: dict, projection: dict, sort: list) -> dict:
+    # Same shape the server returns for an inclusion projection
+    keep = {"_id", *projection, *(field for field, _ in sort)}
+    return {key: value for key, value in doc.items() if key in keep}
+
+
+def _measure(docs: list[dict], rounds: int) -> tuple[int, float]:
+    # Wire-level payload as the driver sees it: one BSON blob per document
+    payload = b"".join(bson.encode(doc) for doc in docs)
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        bson.decode_all(payload)
+    per_page = (time.perf_counter() - started) / rounds
+    return len(payload), per_page
+
+
+def run(rows: int = 200, rounds: int = 200, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    cases = [
+        (
+            "LoanManagerService.list_loans",
+            [_loan_application(rng, now) for _ in range(rows)],
+            LoanManagerService.LIST_FIELDS,
+            LoanApplicationRepository.LIST_SORT
+        ),
+        (
+            "BankManagerService.list_users",
+            [_user(rng, now) for _ in range(rows)],
+            BankManagerService.LIST_FIELDS,
+            UserRepository.LIST_SORT
+        )
+    ]
+
+    results = []
+    for name, docs, projection, sort in cases:
+        full_bytes, full_seconds = _measure(docs, rounds)
+        projected_bytes, projected_seconds = _measure(
+            [_project(doc, projection, sort) for doc in docs],
+            rounds
+        )
+        results.append({
+            "case": name,
+            "rows": rows,
+            "full_bytes": full_bytes,
+            "projected_bytes": projected_bytes,
+            "bytes_ratio": round(projected_bytes / full_bytes, 3),
+            "full_decode_ms": round(full_seconds * 1000, 3),
+            "projected_decode_ms": round(projected_seconds * 1000, 3),
+            "decode_speedup": round(full_seconds / projected_seconds, 2)
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200, help="documents per page")
+    parser.add_argument("--rounds", type=int, default=200, help="decode repetitions")
+    args = parser.parse_args()
+
+    for result in run(rows=args.rows, rounds=args.rounds):
+        print(
+            f"{result['case']:<32} "
+            f"bytes {result['full_bytes']:>8} -> {result['projected_bytes']:>7} "
+            f"({result['bytes_ratio']:.0%})  "
+            f"decode {result['full_decode_ms']:.3f}ms -> "
+            f"{result['projected_decode_ms']:.3f}ms "
+            f"(x{result['decode_speedup']})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Synthetic data for the lifecycle benchmarks.
+
+Documents are shaped like the ones the services write (same fields,
+Decimal128 amounts, shard keys, amortized repayment rows) and are bulk
+inserted straight into the collections, so seeding 100k rows takes
+seconds rather than going through the API.
+"""
+from datetime import datetime, timedelta
+import random
+
+from bson import Decimal128, ObjectId
+
+from app.enums.loan import LoanApplicationStatus, LoanType, SystemDecision
+from app.enums.user import KYCStatus, UserApprovalStatus
+from app.services.amortization import amortization_schedule
+from app.utils.sharding import shard_key
+
+INSERT_CHUNK = 5000
+
+# Application mix of a busy queue (status, system decision, weight)
+APPLICATION_MIX = [
+    (LoanApplicationStatus.PENDING, SystemDecision.MANUAL_REVIEW, 35),
+    (LoanApplicationStatus.PENDING, SystemDecision.AUTO_APPROVED, 15),
+    (LoanApplicationStatus.PENDING, SystemDecision.AUTO_REJECTED, 10),
+    (LoanApplicationStatus.APPROVED, SystemDecision.MANUAL_REVIEW, 15),
+    (LoanApplicationStatus.REJECTED, SystemDecision.MANUAL_REVIEW, 10),
+    (LoanApplicationStatus.ESCALATED, SystemDecision.MANUAL_REVIEW, 5),
+    (LoanApplicationStatus.FINALIZED, SystemDecision.AUTO_APPROVED, 10),
+]
+
+
+async def _insert(collection, docs: list[dict]):
+    for offset in range(0, len(docs), INSERT_CHUNK):
+        await collection.insert_many(docs[offset:offset + INSERT_CHUNK], ordered=False)
+
+
+def _user(index: int, now: datetime, rng: random.Random) -> dict:
+    created_at = now - timedelta(minutes=index)
+    return {
+        "name": f"Bench User {index}",
+        "phone": str(6_000_000_000 + index),
+        "password_hash": "$2b$12$" + "x" * 53,
+        "aadhaar": str(100_000_000_000 + index),
+        "dob": now - timedelta(days=rng.randrange(7_000, 20_000)),
+        "occupation": "Employee",
+        "kyc_status": KYCStatus.COMPLETED,
+        "approval_status": UserApprovalStatus.APPROVED,
+        "is_minor": False,
+        "cibil_score": rng.randrange(550, 850),
+        "created_at": created_at,
+        "updated_at": created_at
+    }
+
+
+def _application(
+    user_id: ObjectId,
+    status: LoanApplicationStatus,
+    decision: SystemDecision,
+    applied_at: datetime,
+    rng: random.Random,
+    tenure_months: int | None = None
+) -> dict:
+    amount = rng.randrange(50_000, 2_000_000, 1_000)
+    return {
+        "user_id": user_id,
+        "loan_type": rng.choice(list(LoanType)),
+        "loan_amount": Decimal128(str(amount)),
+        "tenure_months": tenure_months or rng.choice([12, 24, 36, 60]),
+        "reason": "Benchmark application",
+        "income_slip_url": "https://files.example.com/slips/bench.pdf",
+        "cibil_score": rng.randrange(300, 900),
+        "system_decision": decision,
+        "interest_rate": Decimal128("11.5"),
+        "emi_preview": Decimal128(str(round(amount / 24, 2))),
+        "status": status,
+        "escalated": status == LoanApplicationStatus.ESCALATED,
+        "applied_at": applied_at,
+        "created_at": applied_at,
+        "idempotency_key": f"bench-{ObjectId()}"
+    }
+
+
+async def seed_users(database, count: int, balance: float, short_ratio: float, seed: int = 7):
+    """
+    Approved, KYC-complete users with a savings account each.
+    `short_ratio` of the accounts start empty so EMI runs also take the
+    insufficient-balance path. Returns the user ids.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    users = [_user(index, now, rng) for index in range(count)]
+    await _insert(database.users, users)
+
+    await _insert(database.accounts, [
+        {
+            "user_id": user["_id"],
+            "balance": 0.0 if rng.random() < short_ratio else balance,
+            "created_at": now
+        }
+        for user in users
+    ])
+    return [user["_id"] for user in users]
+
+
+async def seed_applications(database, user_ids: list, count: int, seed: int = 7) -> int:
+    """Dashboard volume: applications spread over the last `count` minutes."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    population = [(status, decision) for status, decision, _ in APPLICATION_MIX]
+    weights = [weight for _, _, weight in APPLICATION_MIX]
+
+    docs = []
+    for index in range(count):
+        status, decision = rng.choices(population, weights)[0]
+        docs.append(_application(
+            rng.choice(user_ids),
+            status,
+            decision,
+            now - timedelta(minutes=index),
+            rng
+        ))
+    await _insert(database.loan_applications, docs)
+    return len(docs)
+
+
+async def seed_finalizable(
+    database,
+    user_ids: list,
+    tenures: list[int],
+    per_tenure: int,
+    seed: int = 7
+) -> dict[int, list[str]]:
+    """ADMIN_APPROVED applications ready for finalize_loan, per tenure."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    targets = {}
+    docs = []
+    for tenure in tenures:
+        batch = [
+            _application(
+                rng.choice(user_ids),
+                LoanApplicationStatus.ADMIN_APPROVED,
+                SystemDecision.MANUAL_REVIEW,
+                now,
+                rng,
+                tenure_months=tenure
+            )
+            for _ in range(per_tenure)
+        ]
+        docs.extend(batch)
+        targets[tenure] = batch
+    await _insert(database.loan_applications, docs)
+
+    return {
+        tenure: [str(doc["_id"]) for doc in batch]
+        for tenure, batch in targets.items()
+    }
+
+
+async def seed_active_loans(
+    database,
+    user_ids: list,
+    count: int,
+    tenure_months: int,
+    due_emis: int,
+    seed: int = 7
+) -> int:
+    """
+    Active loans with their full repayment schedule; the first
+    `due_emis` installments of each loan are already due, so the next
+    EMI run has `count * due_emis` rows to debit. Returns the due count.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    due_emis = min(due_emis, tenure_months)
+    # Installment `due_emis` fell due yesterday, the next one is a month out
+    first_due = now - timedelta(days=30 * (due_emis - 1) + 1)
+
+    loans = []
+    repayments = []
+    for index in range(count):
+        user_id = user_ids[index % len(user_ids)]
+        principal = float(rng.randrange(50_000, 500_000, 1_000))
+        schedule = amortization_schedule(principal, 11.5, tenure_months)
+        loan_id = ObjectId()
+
+        loans.append({
+            "_id": loan_id,
+            "loan_application_id": ObjectId(),
+            "user_id": user_id,
+            "loan_amount": Decimal128(str(principal)),
+            "interest_rate": 11.5,
+            "tenure_months": tenure_months,
+            "emi_amount": schedule.emi,
+            "status": "ACTIVE",
+            "total_emis": tenure_months,
+            "paid_emis": 0,
+            "missed_emis": 0,
+            "late_payments": 0,
+            "outstanding_principal": principal,
+            "created_at": first_due - timedelta(days=30)
+        })
+
+        user_shard_key = shard_key(user_id)
+        for number in range(1, tenure_months + 1):
+            repayments.append({
+                "loan_id": loan_id,
+                "user_id": user_id,
+                "emi_number": number,
+                **schedule.installment(number - 1),
+                "due_date": first_due + timedelta(days=30 * (number - 1)),
+                "status": "PENDING",
+                "attempts": 0,
+                "shard_key": user_shard_key,
+                "created_at": now
+            })
+
+    await _insert(database.loans, loans)
+    await _insert(database.loan_repayments, repayments)
+    return count * due_emis
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+import uuid
+
+from bson import ObjectId
+import pytest
+import pytest_asyncio
+from mongomock_motor import AsyncMongoMockClient
+
+from app.db.indexes import ensure_indexes
+from app.repositories.account_repository import AccountRepository
+from app.repositories.loan_repository import LoanRepository
+from app.repositories.repayment_repository import RepaymentRepository
+from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.user_repository import UserRepository
+from app.scheduler import emi_scheduler
+from app.services.repayment_summary_service import RepaymentSummaryService
+
+
+async def _without_transaction(callback):
+    return await callback(None)
+
+
+@pytest.fixture
+def database():
+    """Fresh in-memory database per test (no mongod needed)."""
+    # mongomock clients share one store, so isolate by name
+    return AsyncMongoMockClient()[f"loan_tests_{uuid.uuid4().hex}"]
+
+
+@pytest_asyncio.fixture
+async def scheduler(database, monkeypatch):
+    """The EMI scheduler module, with its repositories on `database`."""
+    await ensure_indexes(database)
+    for name, repository_class in (
+        ("account_repo", AccountRepository),
+        ("loan_repo", LoanRepository),
+        ("repayment_repo", RepaymentRepository),
+        ("transaction_repo", TransactionRepository),
+        ("user_repo", UserRepository),
+    ):
+        monkeypatch.setattr(emi_scheduler, name, repository_class(database))
+    monkeypatch.setattr(emi_scheduler, "summary_service", RepaymentSummaryService(
+        emi_scheduler.loan_repo,
+        emi_scheduler.repayment_repo,
+        emi_scheduler.transaction_repo
+    ))
+    # mongomock has no sessions: settle as on a standalone mongod
+    monkeypatch.setattr(emi_scheduler, "run_in_transaction", _without_transaction)
+    return emi_scheduler
+
+
+@pytest.fixture
+def seed_due_emis(database):
+    """Users with an account, one loan and `emis` PENDING rows due now."""
+
+    async def seed(users: int = 1, emis: int = 3, balance: float = 1000.0):
+        now = datetime.utcnow()
+        for index in range(users):
+            user_id, loan_id = ObjectId(), ObjectId()
+            await database.users.insert_one({
+                "_id": user_id,
+                "phone": f"90000{index:05d}",
+                "aadhaar": f"1000000{index:05d}"
+            })
+            await database.accounts.insert_one({"user_id": user_id, "balance": balance})
+            await database.loans.insert_one({
+                "_id": loan_id,
+                "user_id": user_id,
+                "total_emis": emis,
+                "paid_emis": 0,
+                "missed_emis": 0,
+                "late_payments": 0
+            })
+            await database.loan_repayments.insert_many([
+                {
+                    "loan_id": loan_id,
+                    "user_id": user_id,
+                    "emi_number": number,
+                    "emi_amount": 100.0,
+                    "due_date": now - timedelta(days=emis - number + 1),
+                    "status": "PENDING",
+                    "attempts": 0
+                }
+                for number in range(1, emis + 1)
+            ])
+
+    return seed
@@ -0,0 +1,33 @@
+import itertools
+
+from app.services.cibil_service import CIBILService
+
+
+def test_calculate_batch_matches_scalar_calculate():
+    service = CIBILService()
+    # Around every threshold: no misses, late > 2, and both clamps
+    cases = list(itertools.product(
+        [0, 1, 2, 5, 13, 40],
+        [0, 2, 3, 10],
+        [True, False]
+    ))
+
+    batch = service.calculate_batch(
+        [missed for missed, _, _ in cases],
+        [late for _, late, _ in cases],
+        [clean for _, _, clean in cases]
+    )
+
+    assert [int(score) for score in batch] == [
+        service.calculate({
+            "missed_emis": missed,
+            "late_payments": late,
+            "loan_closed_clean": clean
+        })
+        for missed, late, clean in cases
+    ]
+    assert min(batch) == 300
+
+
+def test_calculate_batch_empty():
+    assert CIBILService().calculate_batch([], [], []).shape == (0,)
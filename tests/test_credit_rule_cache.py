@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from app.enums.loan import SystemDecision
+from app.services.credit_rule_service import CreditRuleCache
+
+
+class StubRuleRepository:
+    """Rules served from a list; the first read waits for `release`."""
+
+    def __init__(self, rules: list[dict]):
+        self.rules = rules
+        self.release = asyncio.Event()
+        self.reads = 0
+
+    async def get_active_cibil_rules(self):
+        rules = list(self.rules)
+        self.reads += 1
+        if self.reads == 1:
+            await self.release.wait()
+        return rules
+
+
+def _rules(decision: SystemDecision) -> list[dict]:
+    return [{"min_score": 300, "max_score": 900, "decision": decision.value}]
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_reload_is_not_lost():
+    repo = StubRuleRepository(_rules(SystemDecision.AUTO_APPROVED))
+    cache = CreditRuleCache(repo)
+    cache.watching = True    # no TTL: only invalidations refresh
+
+    load = asyncio.create_task(cache.get_table())
+    await asyncio.sleep(0)
+
+    # Rules change while the first read is in flight
+    repo.rules = _rules(SystemDecision.AUTO_REJECTED)
+    cache.invalidate()
+    repo.release.set()
+
+    table = await load
+    assert table.lookup(750) == SystemDecision.AUTO_REJECTED
+    assert repo.reads == 2
+
+    # And the fresh table is what stays cached
+    assert (await cache.get_table()).lookup(750) == SystemDecision.AUTO_REJECTED
+    assert repo.reads == 2
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.container import Container
+
+
+async def _balances(database) -> list[float]:
+    return [account["balance"] async for account in database.accounts.find()]
+
+
+@pytest.mark.asyncio
+async def test_run_killed_between_debit_and_status_write_does_not_debit_twice(
+    scheduler, database, seed_due_emis, monkeypatch
+):
+    await seed_due_emis()
+
+    settle_reached = asyncio.Event()
+    original_bulk_write = scheduler.repayment_repo.bulk_write
+
+    async def hang(operations, session=None):
+        settle_reached.set()
+        await asyncio.Future()
+
+    monkeypatch.setattr(scheduler.repayment_repo, "bulk_write", hang)
+    run = asyncio.create_task(scheduler.process_due_emis())
+    await settle_reached.wait()
+    run.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await run
+
+    # Money moved, statuses not written: rows stay claimed
+    assert await _balances(database) == [700.0]
+    statuses = {row["status"] async for row in database.loan_repayments.find()}
+    assert statuses == {"PROCESSING"}
+
+    monkeypatch.setattr(scheduler.repayment_repo, "bulk_write", original_bulk_write)
+
+    # A run within the claim timeout leaves the claimed rows alone
+    report = await scheduler.process_due_emis()
+    assert report["processed"] == 0
+    assert await _balances(database) == [700.0]
+
+    # Once the claim is stale the rows are settled without a new debit
+    monkeypatch.setattr(settings, "EMI_CLAIM_TIMEOUT_SECONDS", 0)
+    report = await scheduler.process_due_emis()
+    assert report["paid"] == 3
+    assert await _balances(database) == [700.0]
+
+    rows = await database.loan_repayments.find().to_list(length=None)
+    assert {row["status"] for row in rows} == {"PAID"}
+    assert not any("claim_id" in row for row in rows)
+    assert await database.loan_transactions.count_documents({}) == 3
+    loan = await database.loans.find_one()
+    assert loan["paid_emis"] == 3
+
+
+@pytest.mark.asyncio
+async def test_settled_rows_are_not_claimed_again(scheduler, database, seed_due_emis):
+    await seed_due_emis()
+
+    first = await scheduler.process_due_emis()
+    second = await scheduler.process_due_emis()
+
+    assert first["paid"] == 3
+    assert second["processed"] == 0
+    assert await _balances(database) == [700.0]
+
+
+@pytest.mark.asyncio
+async def test_debits_in_flight_never_exceed_max_concurrency(
+    scheduler, database, seed_due_emis, monkeypatch
+):
+    await seed_due_emis(users=20, emis=1)
+
+    in_flight = peak = 0
+    original_debit = scheduler.account_repo.debit_if_sufficient
+
+    async def tracked_debit(*args, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        try:
+            return await original_debit(*args, **kwargs)
+        finally:
+            in_flight -= 1
+
+    monkeypatch.setattr(scheduler.account_repo, "debit_if_sufficient", tracked_debit)
+    report = await scheduler.process_due_emis(batch_size=50, partitions=1, max_concurrency=3)
+
+    assert report["paid"] == 20
+    assert 1 < peak <= 3
+
+
+@pytest.mark.asyncio
+async def test_bound_scheduler_runs_on_the_container_repositories(
+    scheduler, database, seed_due_emis
+):
+    await seed_due_emis()
+    container = Container(database)
+    # The fixture's monkeypatching restores the module after the test
+    scheduler.bind(container)
+
+    assert scheduler.repayment_repo is container.repayment_repo
+    report = await scheduler.process_due_emis()
+    assert report["paid"] == 3
+    assert await _balances(database) == [700.0]
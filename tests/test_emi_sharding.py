@@ -0,0 +1,140 @@
+import asyncio
+from datetime import datetime
+
+from bson import ObjectId
+import pytest
+import pytest_asyncio
+
+from app.repositories.emi_lease_repository import EmiLeaseRepository
+from app.scheduler import emi_sharding
+from app.utils.sharding import shard_key
+
+
+@pytest_asyncio.fixture
+async def sharding(scheduler, database, monkeypatch):
+    monkeypatch.setattr(emi_sharding, "lease_repo", EmiLeaseRepository(database))
+    monkeypatch.setattr(emi_sharding, "repayment_repo", scheduler.repayment_repo)
+    return emi_sharding
+
+
+@pytest.mark.asyncio
+async def test_stop_takes_effect_at_chunk_boundary(scheduler, database, seed_due_emis, monkeypatch):
+    await seed_due_emis(users=3, emis=2)
+
+    stop = asyncio.Event()
+    original_bulk_write = scheduler.repayment_repo.bulk_write
+
+    async def settle_then_lose_lease(operations, session=None):
+        result = await original_bulk_write(operations, session=session)
+        stop.set()
+        return result
+
+    monkeypatch.setattr(scheduler.repayment_repo, "bulk_write", settle_then_lose_lease)
+    report = await scheduler.process_due_emis(batch_size=2, partitions=1, stop=stop)
+
+    assert report["stopped"]
+    assert report["paid"] == 2
+    statuses = [row["status"] async for row in database.loan_repayments.find()]
+    # The chunk in flight settled; nothing is left half-done
+    assert sorted(statuses) == ["PAID", "PAID", "PENDING", "PENDING", "PENDING", "PENDING"]
+
+
+@pytest.mark.asyncio
+async def test_stale_lease_holder_cannot_settle_after_takeover(scheduler, database, seed_due_emis):
+    await seed_due_emis(emis=1)
+    row = await database.loan_repayments.find_one()
+
+    # Generation 1 claims and debits, then stalls before its status write
+    stale_claim = {
+        "claim_id": "stale",
+        "claimed_at": datetime.utcnow(),
+        "claim_lease": "run:0",
+        "claim_generation": 1
+    }
+    assert await scheduler.repayment_repo.claim([row], stale_claim)
+    await scheduler.account_repo.debit_if_sufficient(
+        row["user_id"], row["emi_amount"], reference=row["_id"]
+    )
+
+    # Generation 2 takes the shard over and settles the row
+    report = await scheduler.process_due_emis(
+        fence={"claim_lease": "run:0", "claim_generation": 2}
+    )
+    assert report["paid"] == 1
+
+    # The stale holder's write no longer matches anything
+    result = await database.loan_repayments.update_one(
+        {"_id": row["_id"], "claim_id": "stale"},
+        {"$set": {"status": "FAILED"}}
+    )
+    assert result.matched_count == 0
+
+    account = await database.accounts.find_one()
+    assert account["balance"] == 900.0
+    assert (await database.loan_repayments.find_one())["status"] == "PAID"
+
+
+@pytest.mark.asyncio
+async def test_every_run_stamps_rows_without_a_shard_key(
+    sharding, database, seed_due_emis, monkeypatch
+):
+    await seed_due_emis(users=4, emis=1)
+
+    calls = 0
+    original_backfill = sharding.repayment_repo.backfill_shard_keys
+
+    async def counted_backfill(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return await original_backfill(*args, **kwargs)
+
+    monkeypatch.setattr(sharding.repayment_repo, "backfill_shard_keys", counted_backfill)
+
+    first = await sharding.run_sharded_emis(node_id="node-a", shard_count=2)
+    await sharding.run_sharded_emis(node_id="node-b", shard_count=2)
+
+    assert calls == 1
+    assert sum(report["paid"] for report in first) == 4
+    async for row in database.loan_repayments.find():
+        assert row["shard_key"] == shard_key(row["user_id"])
+
+    # Unkeyed rows written after that run are stamped by the next one
+    await database.loan_repayments.insert_one({
+        "loan_id": ObjectId(),
+        "user_id": ObjectId(),
+        "emi_number": 1,
+        "emi_amount": 100.0,
+        "due_date": datetime.utcnow(),
+        "status": "PENDING",
+        "attempts": 0
+    })
+    await sharding._backfill_shard_keys("2000-01-02", "node-a", 30)
+
+    assert calls == 2
+    assert await database.loan_repayments.count_documents(
+        {"shard_key": {"$exists": False}}
+    ) == 0
+
+
+@pytest.mark.asyncio
+async def test_peers_wait_for_the_backfill_before_claiming_shards(
+    sharding, database, seed_due_emis, monkeypatch
+):
+    await seed_due_emis(users=4, emis=1)
+    monkeypatch.setattr(sharding, "BACKFILL_POLL_SECONDS", 0.01)
+
+    run_id = datetime.utcnow().strftime("%Y-%m-%d")
+    task_id = f"{run_id}:{sharding.SHARD_KEY_BACKFILL}"
+    task = await sharding.lease_repo.claim_once(task_id, "node-a", 30)
+
+    peer = asyncio.create_task(sharding.run_sharded_emis(node_id="node-b", shard_count=2))
+    await asyncio.sleep(0.1)
+
+    assert not peer.done()
+    assert await database.emi_run_leases.count_documents({"status": "CLAIMED"}) == 1
+
+    await sharding.repayment_repo.backfill_shard_keys()
+    await sharding.lease_repo.complete(task_id, "node-a", task["attempts"], {})
+    reports = await asyncio.wait_for(peer, timeout=5)
+
+    assert sum(report["paid"] for report in reports) == 4
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo.errors import CursorNotFound
+import pytest
+
+from app.repositories.streaming import stream
+
+
+class LosesCursorOnce:
+    """Collection whose first cursor dies after `after` documents."""
+
+    def __init__(self, collection, after: int):
+        self.collection = collection
+        self.name = collection.name
+        self.after = after
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        cursor = self.collection.find(query, projection)
+        if len(self.queries) > 1:
+            return cursor
+        return DyingCursor(cursor, self.after)
+
+
+class DyingCursor:
+
+    def __init__(self, cursor, after: int):
+        self.cursor = cursor
+        self.after = after
+
+    def sort(self, *args, **kwargs):
+        self.cursor = self.cursor.sort(*args, **kwargs)
+        return self
+
+    def batch_size(self, size: int):
+        self.cursor = self.cursor.batch_size(size)
+        return self
+
+    async def __aiter__(self):
+        served = 0
+        async for doc in self.cursor:
+            if served == self.after:
+                raise CursorNotFound("cursor id not found")
+            served += 1
+            yield doc
+
+
+async def _seed(collection) -> list[dict]:
+    start = datetime(2024, 1, 1)
+    # Dates out of _id order, with ties
+    docs = [
+        {"_id": ObjectId(), "created_at": start + timedelta(days=offset)}
+        for offset in (3, 1, 1, 2, 0, 2, 1)
+    ]
+    await collection.insert_many(docs)
+    return sorted(docs, key=lambda doc: (doc["created_at"], doc["_id"]))
+
+
+@pytest.mark.asyncio
+async def test_export_follows_the_date_range_order(database):
+    expected = await _seed(database.exports)
+
+    query = {"created_at": {"$gte": datetime(2024, 1, 2)}}
+    exported = [doc async for doc in stream(database.exports, query, "created_at")]
+
+    assert exported == [doc for doc in expected if doc["created_at"] >= datetime(2024, 1, 2)]
+
+
+@pytest.mark.asyncio
+async def test_lost_cursor_resumes_after_the_last_document(database):
+    expected = await _seed(database.exports)
+    collection = LosesCursorOnce(database.exports, after=3)
+
+    exported = [doc async for doc in stream(collection, {}, "created_at", {"_id": 1}, batch_size=2)]
+
+    # Nothing repeated, nothing skipped across the tie on the resume date
+    assert [doc["_id"] for doc in exported] == [doc["_id"] for doc in expected]
+    assert len(collection.queries) == 2
@@ -0,0 +1,103 @@
+import asyncio
+
+from bson import Decimal128, ObjectId
+from pymongo.errors import ConnectionFailure
+import pytest
+
+from app.enums.loan import LoanApplicationStatus
+from app.repositories.audit_log_repository import AuditLogRepository
+from app.repositories.loan_application_repository import LoanApplicationRepository
+from app.repositories.loan_repository import LoanRepository
+from app.repositories.repayment_repository import RepaymentRepository
+from app.services import loan_manager_service
+from app.services.loan_manager_service import LoanManagerService
+
+
+@pytest.fixture
+def manager(database):
+    return LoanManagerService(
+        loan_app_repo=LoanApplicationRepository(database),
+        loan_repo=LoanRepository(database),
+        repayment_repo=RepaymentRepository(database),
+        audit_repo=AuditLogRepository(database)
+    )
+
+
+async def _approved_application(database) -> str:
+    result = await database.loan_applications.insert_one({
+        "user_id": ObjectId(),
+        "loan_amount": Decimal128("120000"),
+        "tenure_months": 12,
+        "status": LoanApplicationStatus.ADMIN_APPROVED
+    })
+    return str(result.inserted_id)
+
+
+@pytest.mark.asyncio
+async def test_standalone_failure_removes_the_partial_loan(manager, database, monkeypatch):
+    application_id = await _approved_application(database)
+
+    async def standalone(callback):
+        return await callback(None)
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("application update failed")
+
+    monkeypatch.setattr(loan_manager_service, "run_in_transaction", standalone)
+    monkeypatch.setattr(manager.loan_app_repo, "update_by_id", fail)
+
+    with pytest.raises(RuntimeError):
+        await manager.finalize_loan(application_id, 12.0, 12, str(ObjectId()))
+
+    assert await database.loans.count_documents({}) == 0
+    assert await database.loan_repayments.count_documents({}) == 0
+
+
+@pytest.mark.asyncio
+async def test_transaction_error_does_not_delete_the_loan(manager, database, monkeypatch):
+    application_id = await _approved_application(database)
+
+    async def commit_unknown(callback):
+        # The writes went through, then the commit outcome was lost
+        await callback(None)
+        raise ConnectionFailure("connection closed during commitTransaction")
+
+    monkeypatch.setattr(loan_manager_service, "run_in_transaction", commit_unknown)
+
+    with pytest.raises(ConnectionFailure):
+        await manager.finalize_loan(application_id, 12.0, 12, str(ObjectId()))
+
+    assert await database.loans.count_documents({}) == 1
+    assert await database.loan_repayments.count_documents({}) == 12
+
+
+@pytest.mark.asyncio
+async def test_concurrent_finalize_creates_one_loan(manager, database, monkeypatch):
+    application_id = await _approved_application(database)
+
+    async def standalone(callback):
+        return await callback(None)
+
+    monkeypatch.setattr(loan_manager_service, "run_in_transaction", standalone)
+
+    # Both read the application (and pass the status check) before
+    # either flips it
+    find_by_id = manager.loan_app_repo.find_by_id
+    both_read = asyncio.Barrier(2)
+
+    async def find_then_wait(*args, **kwargs):
+        application = await find_by_id(*args, **kwargs)
+        await both_read.wait()
+        return application
+
+    monkeypatch.setattr(manager.loan_app_repo, "find_by_id", find_then_wait)
+
+    results = await asyncio.gather(
+        manager.finalize_loan(application_id, 12.0, 12, str(ObjectId())),
+        manager.finalize_loan(application_id, 12.0, 12, str(ObjectId())),
+        return_exceptions=True
+    )
+
+    assert sum(isinstance(result, ValueError) for result in results) == 1
+    assert await database.loans.count_documents({}) == 1
+    assert await database.loan_repayments.count_documents({}) == 12
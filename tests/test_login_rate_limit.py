@@ -0,0 +1,70 @@
+import pytest
+from starlette.requests import Request
+
+from app.auth.rate_limit import (
+    LoginRateLimiter,
+    MemoryRateLimitStore,
+    MongoRateLimitStore,
+    RateLimitExceeded
+)
+from app.core.config import settings
+from app.repositories.login_attempt_repository import LoginAttemptRepository
+
+
+def _request(ip: str = "10.0.0.1") -> Request:
+    return Request({"type": "http", "headers": [], "client": (ip, 40000)})
+
+
+@pytest.fixture(params=["memory", "mongo"])
+def limiter(request, database, monkeypatch):
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_PER_ACCOUNT", 3)
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_PER_IP", 100)
+    if request.param == "memory":
+        store = MemoryRateLimitStore(1000)
+    else:
+        store = MongoRateLimitStore(LoginAttemptRepository(database))
+    return LoginRateLimiter(store)
+
+
+@pytest.mark.asyncio
+async def test_successful_logins_do_not_use_up_the_account(limiter):
+    for _ in range(10):
+        await limiter.check("user", "9000000001", _request())
+        await limiter.login_succeeded("user", "9000000001")
+
+
+@pytest.mark.asyncio
+async def test_failed_attempts_lock_the_account(limiter):
+    for _ in range(3):
+        await limiter.check("user", "9000000001", _request())
+
+    with pytest.raises(RateLimitExceeded):
+        await limiter.check("user", "9000000001", _request("10.0.0.2"))
+
+
+@pytest.mark.asyncio
+async def test_ip_limit_is_checked_before_the_account(monkeypatch):
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_PER_ACCOUNT", 3)
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_PER_IP", 2)
+    limiter = LoginRateLimiter(MemoryRateLimitStore(1000))
+
+    for index in range(2):
+        await limiter.check("user", f"900000000{index}", _request())
+    for _ in range(5):
+        with pytest.raises(RateLimitExceeded):
+            await limiter.check("user", "9000000009", _request())
+
+    # The throttled client spent nothing of the account's budget
+    for index in range(3):
+        await limiter.check("user", "9000000009", _request(f"10.0.1.{index}"))
+
+
+def test_keys_are_keyed_by_the_server_secret(monkeypatch):
+    store = MemoryRateLimitStore(10)
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_SECRET", "one")
+    first = LoginRateLimiter(store)._key("user", "9000000001")
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_SECRET", "two")
+    second = LoginRateLimiter(store)._key("user", "9000000001")
+
+    assert first.startswith("user:") and "9000000001" not in first
+    assert first != second
@@ -0,0 +1,45 @@
+from fastapi import FastAPI
+import httpx
+import pytest
+
+from app.auth.security import create_access_token
+from app.core.config import settings
+from app.enums.role import Role
+from app.routers.metrics import router
+
+
+async def _scrape(headers: dict | None = None) -> int:
+    app = FastAPI()
+    app.include_router(router)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/metrics", headers=headers or {})
+    return response.status_code
+
+
+def _bearer(role: Role) -> dict:
+    token = create_access_token(subject=f"metrics-{role.value.lower()}", role=role)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_metrics_are_closed_by_default(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_SCRAPE_TOKEN", "")
+    monkeypatch.setattr(settings, "METRICS_PUBLIC", False)
+
+    assert await _scrape() == 401
+    assert await _scrape({"Authorization": "Bearer "}) == 401
+    assert await _scrape(_bearer(Role.USER)) == 403
+    assert await _scrape(_bearer(Role.ADMIN)) == 200
+
+
+@pytest.mark.asyncio
+async def test_scrape_token_or_explicit_opt_out(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_SCRAPE_TOKEN", "scrape-secret")
+    monkeypatch.setattr(settings, "METRICS_PUBLIC", False)
+
+    assert await _scrape({"Authorization": "Bearer scrape-secret"}) == 200
+    assert await _scrape({"Authorization": "Bearer wrong"}) == 401
+
+    monkeypatch.setattr(settings, "METRICS_PUBLIC", True)
+    assert await _scrape() == 200
@@ -0,0 +1,37 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.auth.password import PasswordHasher, PasswordHasherBusy
+
+
+@pytest.mark.asyncio
+async def test_cancelled_call_keeps_its_slot_until_bcrypt_finishes():
+    hasher = PasswordHasher("thread", workers=1, max_pending=1, retry_after=1)
+    started, finish = threading.Event(), threading.Event()
+
+    def slow_hash(password):
+        started.set()
+        finish.wait(timeout=5)
+        return f"hashed:{password}"
+
+    call = asyncio.create_task(hasher.run("hash", slow_hash, "secret"))
+    await asyncio.to_thread(started.wait, 5)
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+
+    # The worker is still busy with the cancelled call
+    assert hasher.stats()["pending"] == 1
+    with pytest.raises(PasswordHasherBusy):
+        await hasher.run("hash", slow_hash, "other")
+
+    finish.set()
+    for _ in range(100):
+        if hasher.stats()["pending"] == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert hasher.stats()["pending"] == 0
+    assert await hasher.run("hash", slow_hash, "again") == "hashed:again"
+    hasher.shutdown()
@@ -0,0 +1,58 @@
+import pytest
+
+from app.repositories.loan_repository import LoanRepository
+from app.repositories.repayment_repository import RepaymentRepository
+from app.repositories.transaction_repository import TransactionRepository
+from app.scheduler import repayment_reconciler
+
+
+@pytest.mark.asyncio
+async def test_counters_lost_in_a_crash_are_not_trusted_until_reconciled(
+    scheduler, database, seed_due_emis, monkeypatch
+):
+    await seed_due_emis()
+    loan = await database.loans.find_one()
+
+    original_bulk_write = scheduler.loan_repo.bulk_write
+
+    async def crash(operations, session=None):
+        raise RuntimeError("killed before the counter update")
+
+    # Statuses are written, the counter update is not
+    monkeypatch.setattr(scheduler.loan_repo, "bulk_write", crash)
+    report = await scheduler.process_due_emis()
+    assert report["failed_partitions"] == 1
+    monkeypatch.setattr(scheduler.loan_repo, "bulk_write", original_bulk_write)
+
+    stored = await database.loans.find_one({"_id": loan["_id"]})
+    assert stored["paid_emis"] == 0
+    assert stored["counters_dirty"]
+
+    # Summaries count the rows while the counters are suspect
+    summary = await scheduler.summary_service.build_summary(loan["_id"])
+    assert summary["paid_emis"] == 3
+
+    for name, repository_class in (
+        ("loan_repo", LoanRepository),
+        ("repayment_repo", RepaymentRepository),
+        ("transaction_repo", TransactionRepository),
+    ):
+        monkeypatch.setattr(repayment_reconciler, name, repository_class(database))
+    reconciled = await repayment_reconciler.reconcile_repayment_counters()
+    assert reconciled["fixed"] == 1
+
+    stored = await database.loans.find_one({"_id": loan["_id"]})
+    assert stored["paid_emis"] == 3
+    assert not stored["counters_dirty"]
+    assert scheduler.summary_service.counters_trusted(stored)
+
+
+@pytest.mark.asyncio
+async def test_completed_settle_leaves_counters_trusted(scheduler, database, seed_due_emis):
+    await seed_due_emis()
+
+    await scheduler.process_due_emis()
+
+    loan = await database.loans.find_one()
+    assert loan["paid_emis"] == 3
+    assert scheduler.summary_service.counters_trusted(loan)
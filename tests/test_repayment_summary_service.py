@@ -0,0 +1,35 @@
+from bson import ObjectId
+import pytest
+
+from app.repositories.loan_repository import LoanRepository
+from app.repositories.repayment_repository import RepaymentRepository
+from app.repositories.transaction_repository import TransactionRepository
+from app.services.repayment_summary_service import RepaymentSummaryService
+
+
+@pytest.mark.asyncio
+async def test_count_summary_reads_through_injected_repositories(database):
+    service = RepaymentSummaryService(
+        LoanRepository(database),
+        RepaymentRepository(database),
+        TransactionRepository(database)
+    )
+    loan_id = ObjectId()
+    await database.loans.insert_one({"_id": loan_id})
+    await database.loan_repayments.insert_many([
+        {"loan_id": loan_id, "emi_number": 1, "status": "PAID"},
+        {"loan_id": loan_id, "emi_number": 2, "status": "FAILED"},
+        {"loan_id": loan_id, "emi_number": 3, "status": "PENDING"},
+    ])
+    await database.loan_transactions.insert_one({
+        "loan_id": loan_id, "transaction_type": "PENALTY", "status": "PAID"
+    })
+
+    # No counters on the loan: falls back to counting the rows
+    assert await service.build_summary(loan_id) == {
+        "total_emis": 3,
+        "paid_emis": 1,
+        "missed_emis": 1,
+        "late_payments": 1,
+        "loan_closed_clean": False
+    }
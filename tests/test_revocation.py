@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+import math
+
+import pytest
+
+from app.auth.revocation import REFRESH_OVERLAP, BloomFilter, RevocationList, _timestamp
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+
+
+@pytest.fixture
+def revocations(database):
+    return RevocationList(RevokedTokenRepository(database))
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    members = [f"jti-{index}" for index in range(1000)]
+    for member in members:
+        bloom.add(member)
+
+    assert all(member in bloom for member in members)
+    false_positives = sum(f"other-{index}" in bloom for index in range(10000))
+    assert false_positives < 300    # ~1% expected at capacity
+
+
+@pytest.mark.asyncio
+async def test_subject_cutoff_is_whole_seconds(revocations):
+    await revocations.revoke_subject("user-1")
+    revoked_before = revocations._subjects["user-1"][0]
+    assert revoked_before == math.floor(revoked_before)
+
+    # `iat` of a token minted right after the revocation, same second
+    assert not revocations.is_revoked("new", "user-1", revoked_before)
+    assert revocations.is_revoked("old", "user-1", revoked_before - 1)
+    assert revocations.is_revoked("legacy", "user-1", None)
+
+
+@pytest.mark.asyncio
+async def test_refresh_picks_up_writers_with_a_slow_clock(revocations, database):
+    other_node = RevokedTokenRepository(database)
+    now = datetime.utcnow()
+    await other_node.revoke_token("jti-a", "user-1", now, now + timedelta(minutes=30))
+    await revocations.refresh()
+    watermark = revocations.stats()["watermark"]
+
+    # Written after the refresh, stamped before the watermark
+    skewed = watermark - REFRESH_OVERLAP + timedelta(seconds=1)
+    await other_node.revoke_token("jti-b", "user-2", skewed, now + timedelta(minutes=30))
+    await revocations.refresh()
+
+    assert revocations.is_revoked("jti-b", "user-2", None)
+    # Re-reading the overlap window never moves the watermark back
+    assert revocations.stats()["watermark"] == watermark
+
+
+@pytest.mark.asyncio
+async def test_prune_rebuilds_the_bloom_filter_from_live_tokens(revocations):
+    now = datetime.utcnow()
+    await revocations.revoke_token("jti-short", "user-1", now + timedelta(minutes=1))
+    await revocations.revoke_token("jti-long", "user-1", now + timedelta(minutes=30))
+    await revocations.revoke_subject("user-2")
+
+    revocations._prune(_timestamp(now + timedelta(minutes=10)))
+
+    assert "jti-short" not in revocations._bloom
+    assert not revocations.is_revoked("jti-short", "user-1", _timestamp(now))
+    assert revocations.is_revoked("jti-long", "user-1", _timestamp(now))
+    # Subject cut-offs outlive their tokens (ACCESS_TOKEN_EXPIRE_MINUTES)
+    assert revocations.is_revoked(None, "user-2", None)
+    assert revocations.stats()["revoked_tokens"] == 1
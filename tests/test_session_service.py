@@ -0,0 +1,190 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.auth.dependencies import verify_token
+from app.auth.revocation import RevocationList
+from app.enums.role import Role
+from app.repositories.admin_repository import AdminRepository
+from app.repositories.manager_repository import ManagerRepository
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+from app.repositories.session_repository import SessionRepository
+from app.repositories.user_repository import UserRepository
+from app.services.admin_service import AdminService
+from app.services.session_service import SessionService, open_successor, refresh_token_hash
+
+
+@pytest.fixture
+def sessions(database):
+    return SessionService(
+        SessionRepository(database),
+        RevocationList(RevokedTokenRepository(database)),
+        user_repo=UserRepository(database),
+        manager_repo=ManagerRepository(database),
+        admin_repo=AdminRepository(database)
+    )
+
+
+@pytest.fixture
+def user_id(database):
+    async def create(**fields):
+        result = await database.users.insert_one({"approval_status": "APPROVED", **fields})
+        return str(result.inserted_id)
+    return create
+
+
+@pytest.fixture
+def manager(database):
+    async def create(**fields):
+        doc = {
+            "manager_id": "MGR001",
+            "role": Role.LOAN_MANAGER.value,
+            "status": "ACTIVE",
+            "approved_by_admin": True,
+            **fields
+        }
+        await database.managers.insert_one(doc)
+        return str(doc["_id"])
+    return create
+
+
+async def _session_state(database) -> dict:
+    return await database.sessions.find_one()
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_the_token(sessions, user_id):
+    _, first = await sessions.start(await user_id(), Role.USER)
+
+    access, second = await sessions.refresh(first)
+    assert second != first
+    assert verify_token(access).role == Role.USER
+
+    _, third = await sessions.refresh(second)
+    assert third not in (first, second)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_share_the_new_token(sessions, user_id, database):
+    _, token = await sessions.start(await user_id(), Role.USER)
+
+    _, winner = await sessions.refresh(token)
+    _, loser = await sessions.refresh(token)    # same token, moments later
+
+    assert loser == winner
+    assert (await _session_state(database))["revoked_at"] is None
+    await sessions.refresh(winner)
+
+
+@pytest.mark.asyncio
+async def test_successor_is_sealed_under_the_token_it_replaces(sessions, user_id, database):
+    _, token = await sessions.start(await user_id(), Role.USER)
+    _, current = await sessions.refresh(token)
+
+    state = await _session_state(database)
+    assert state["token_hash"] == refresh_token_hash(current)
+    assert refresh_token_hash(open_successor(token, state["successor_sealed"])) == state["token_hash"]
+    # Nothing stored (or any other key) opens it
+    _, other = await sessions.start(await user_id(), Role.USER)
+    assert open_successor(other, state["successor_sealed"]) != current
+
+
+@pytest.mark.asyncio
+async def test_reuse_after_the_grace_window_ends_the_session(sessions, user_id, database):
+    _, token = await sessions.start(await user_id(), Role.USER)
+    _, current = await sessions.refresh(token)
+
+    await database.sessions.update_one(
+        {}, {"$set": {"rotated_at": datetime.utcnow() - timedelta(minutes=1)}}
+    )
+    with pytest.raises(ValueError):
+        await sessions.refresh(token)
+
+    state = await _session_state(database)
+    assert state["revoked_reason"] == "reuse"
+    with pytest.raises(ValueError):
+        await sessions.refresh(current)
+
+
+@pytest.mark.asyncio
+async def test_older_tokens_are_reuse_even_inside_the_grace_window(sessions, user_id, database):
+    _, first = await sessions.start(await user_id(), Role.USER)
+    _, second = await sessions.refresh(first)
+    await sessions.refresh(second)
+
+    with pytest.raises(ValueError):
+        await sessions.refresh(first)
+    assert (await _session_state(database))["revoked_reason"] == "reuse"
+
+
+@pytest.mark.asyncio
+async def test_logout_ends_the_session_and_the_access_token(sessions, user_id):
+    access, token = await sessions.start(await user_id(), Role.USER)
+    auth = verify_token(access)
+
+    await sessions.logout(token, auth)
+
+    with pytest.raises(ValueError):
+        await sessions.refresh(token)
+    assert sessions.revocations.is_revoked(auth.jti, auth.user_id, auth.issued_at)
+
+
+@pytest.mark.asyncio
+async def test_deleted_user_cannot_refresh(sessions, user_id, database):
+    subject = await user_id()
+    _, token = await sessions.start(subject, Role.USER)
+    await database.users.update_one({}, {"$set": {"approval_status": "DELETED"}})
+
+    with pytest.raises(ValueError):
+        await sessions.refresh(token)
+    assert (await _session_state(database))["revoked_reason"] == "subject_inactive"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", ["PENDING", "REJECTED"])
+async def test_aadhaar_session_needs_an_approved_user(sessions, user_id, database, status):
+    _, token = await sessions.start(await user_id(), Role.USER, approval_required=True)
+    await database.users.update_one({}, {"$set": {"approval_status": status}})
+
+    with pytest.raises(ValueError):
+        await sessions.refresh(token)
+    assert (await _session_state(database))["revoked_reason"] == "subject_inactive"
+
+
+@pytest.mark.asyncio
+async def test_phone_session_of_a_pending_user_refreshes(sessions, user_id):
+    # Phone login admits users still waiting for approval (KYC flow)
+    _, token = await sessions.start(await user_id(approval_status="PENDING"), Role.USER)
+
+    access, _ = await sessions.refresh(token)
+    assert verify_token(access).role == Role.USER
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("change", [
+    {"status": "DISABLED"},
+    {"approved_by_admin": False},
+    {"role": Role.BANK_MANAGER.value},
+])
+async def test_manager_changes_stop_refresh(sessions, manager, database, change):
+    subject = await manager()
+    _, token = await sessions.start(subject, Role.LOAN_MANAGER)
+    # Written directly, bypassing AdminService
+    await database.managers.update_one({}, {"$set": change})
+
+    with pytest.raises(ValueError):
+        await sessions.refresh(token)
+
+
+@pytest.mark.asyncio
+async def test_update_manager_status_signs_the_manager_out(sessions, manager, database):
+    subject = await manager()
+    access, _ = await sessions.start(subject, Role.LOAN_MANAGER)
+    admin = AdminService(manager_repo=ManagerRepository(database), sessions=sessions)
+
+    await admin.update_manager("MGR001", {"status": "DISABLED"})
+
+    assert (await _session_state(database))["revoked_reason"] == "manager_updated"
+    # Access tokens issued before the update's second are cut off
+    auth = verify_token(access)
+    assert sessions.revocations.is_revoked(auth.jti, auth.user_id, auth.issued_at - 1)